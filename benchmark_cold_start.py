@@ -0,0 +1,166 @@
+"""
+Benchmark de arranque en frío de la Lambda
+Mide, en un proceso nuevo, el tiempo de importación de lambda/main.py
+desglosado por paquete y la primera invocación con un evento sintético de
+API Gateway
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+
+# Se ejecuta en un intérprete limpio para simular un contenedor nuevo
+COLD_START_SCRIPT = r"""
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+event = json.loads(sys.argv[2])
+
+class Context:
+    function_name = "benchmark"
+    memory_limit_in_mb = 1024
+    aws_request_id = "benchmark"
+    invoked_function_arn = "arn:aws:lambda:us-east-1:000000000000:function:benchmark"
+    def get_remaining_time_in_millis(self):
+        return 30000
+
+start = time.perf_counter()
+import main
+import_ms = (time.perf_counter() - start) * 1000
+
+start = time.perf_counter()
+response = main.handler(event, Context())
+first_ms = (time.perf_counter() - start) * 1000
+
+start = time.perf_counter()
+main.handler(event, Context())
+warm_ms = (time.perf_counter() - start) * 1000
+
+print(json.dumps({
+    "import_ms": import_ms,
+    "first_invocation_ms": first_ms,
+    "warm_invocation_ms": warm_ms,
+    "status_code": response.get("statusCode"),
+    "loaded_modules": sorted({m.split(".")[0] for m in sys.modules})
+}))
+"""
+
+
+def api_gateway_event(path="/", method="GET"):
+    """Evento sintético de API Gateway (REST, formato 1.0)"""
+    return {
+        "resource": path,
+        "path": path,
+        "httpMethod": method,
+        "headers": {"Host": "localhost", "Accept": "application/json"},
+        "multiValueHeaders": {},
+        "queryStringParameters": None,
+        "multiValueQueryStringParameters": None,
+        "pathParameters": None,
+        "stageVariables": None,
+        "requestContext": {
+            "resourcePath": path,
+            "httpMethod": method,
+            "path": path,
+            "stage": "prod",
+            "requestId": "benchmark",
+            "identity": {"sourceIp": "127.0.0.1"}
+        },
+        "body": None,
+        "isBase64Encoded": False
+    }
+
+
+def benchmark_environment():
+    """Entorno mínimo para importar la app sin credenciales reales"""
+    env = dict(os.environ)
+    env.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    env.setdefault("PDF_BUCKET_NAME", "benchmark-bucket")
+    return env
+
+
+def import_time_breakdown(app_dir, top=15):
+    """
+    Ejecuta `python -X importtime` sobre main.py y suma el tiempo propio de
+    cada módulo por paquete de primer nivel
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=app_dir, env=benchmark_environment(), capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"No se pudo importar main.py:\n{result.stderr[-2000:]}")
+
+    # Formato: "import time:  self [us] | cumulative | imported package"
+    pattern = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+    packages = {}
+    for line in result.stderr.splitlines():
+        match = pattern.match(line)
+        if not match:
+            continue
+        self_us, _, _, module = match.groups()
+        package = module.split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_us)
+
+    ranking = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    return ranking[:top]
+
+
+def first_invocation(app_dir, path):
+    """Importa la app y la invoca en un proceso nuevo"""
+    event = api_gateway_event(path)
+    result = subprocess.run(
+        [sys.executable, "-c", COLD_START_SCRIPT, os.path.abspath(app_dir), json.dumps(event)],
+        env=benchmark_environment(), capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"La invocación falló:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def benchmark_cold_start(app_dir, path, runs):
+    """Imprime el desglose de importación y las métricas de invocación"""
+    print("❄️ BENCHMARK DE ARRANQUE EN FRÍO")
+    print("=" * 60)
+    print(f"📁 App: {app_dir}/main.py")
+
+    print(f"\n📦 Tiempo de importación por paquete")
+    print("-" * 60)
+    for package, total_us in import_time_breakdown(app_dir):
+        print(f"{package:<30} {total_us / 1000:>10.1f} ms")
+
+    print(f"\n🚀 Primera invocación: GET {path} ({runs} arranques)")
+    print("-" * 60)
+    samples = [first_invocation(app_dir, path) for _ in range(runs)]
+    for key in ("import_ms", "first_invocation_ms", "warm_invocation_ms"):
+        values = sorted(sample[key] for sample in samples)
+        print(f"{key:<25} mediana {values[len(values) // 2]:>8.1f} ms   máx {values[-1]:>8.1f} ms")
+
+    heavy = {"fitz", "PIL", "boto3", "botocore", "requests"}
+    loaded = heavy.intersection(samples[-1]["loaded_modules"])
+    print(f"\nCódigo HTTP: {samples[-1]['status_code']}")
+    print(f"Paquetes pesados cargados: {', '.join(sorted(loaded)) or 'ninguno'}")
+    return samples
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de arranque en frío de la Lambda")
+    parser.add_argument("--app-dir", default="lambda", help="Directorio con main.py de la Lambda")
+    parser.add_argument("--path", default="/", help="Ruta del evento sintético de API Gateway")
+    parser.add_argument("--runs", type=int, default=5, help="Número de arranques en frío")
+    parser.add_argument("--max-import-ms", type=float, default=None,
+                        help="Falla (código 1) si la mediana de importación supera este valor")
+    args = parser.parse_args()
+
+    samples = benchmark_cold_start(args.app_dir, args.path, args.runs)
+
+    if args.max_import_ms is not None:
+        import_times = sorted(sample["import_ms"] for sample in samples)
+        median = import_times[len(import_times) // 2]
+        if median > args.max_import_ms:
+            print(f"\n❌ Regresión: importación {median:.1f} ms > {args.max_import_ms} ms")
+            sys.exit(1)
+        print(f"\n✅ Importación dentro del límite ({median:.1f} ms <= {args.max_import_ms} ms)")
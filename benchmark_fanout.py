@@ -0,0 +1,121 @@
+"""
+Benchmark de procesamiento por rangos de páginas (fan-out)
+Compara el tiempo total de process_pdf en serie frente a parallel_workers
+procesos y verifica que el documento reensamblado conserva su estructura
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+import fitz  # PyMuPDF
+
+# Los módulos de la aplicación están en lambda/ (al final: lambda/ también trae
+# dependencias empaquetadas para Lambda que no deben tapar las instaladas)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "lambda"))
+
+from fanout import fanout_worker_count
+from processor import PDFProcessor
+
+
+def create_synthetic_pdf(path, page_count):
+    """Genera un PDF de prueba con texto, esquema, enlaces y metadatos"""
+    doc = fitz.open()
+    for page_num in range(page_count):
+        page = doc.new_page(width=595, height=842)
+        page.insert_text((72, 72), f"Página de prueba {page_num + 1}", fontsize=14)
+    for page_num in range(0, page_count, 50):
+        doc[page_num].insert_link({
+            "kind": fitz.LINK_GOTO,
+            "from": fitz.Rect(72, 100, 200, 120),
+            "page": (page_num + page_count // 2) % page_count
+        })
+    doc.set_toc([[1, "Inicio", 1], [1, "Mitad", page_count // 2 + 1], [1, "Final", page_count]])
+    doc.set_metadata({"title": "Documento sintético"})
+    doc.save(path)
+    doc.close()
+
+
+def structure(path):
+    """Resumen de lo que el reensamblado debe conservar"""
+    doc = fitz.open(path)
+    try:
+        return {
+            "pages": len(doc),
+            "toc": doc.get_toc(),
+            "links": sum(len(page.get_links()) for page in doc),
+            "title": doc.metadata.get("title"),
+            "stamps": sum("CONFIDENCIAL" in page.get_text() for page in doc)
+        }
+    finally:
+        doc.close()
+
+
+def benchmark_fanout(page_counts, worker_counts, runs):
+    """Mide el tiempo de cada configuración y el speedup frente a la serie"""
+    insertions = [
+        {"type": "text", "content": "CONFIDENCIAL", "position": [50, 50],
+         "font_size": 10, "color": [1, 0, 0], "pages": "all"},
+        {"type": "image", "source": os.path.join("assets", "rubrica.png"),
+         "position": [400, 60], "width": 100, "height": 50, "pages": "all"},
+    ]
+
+    print("🔀 BENCHMARK DE PROCESAMIENTO POR RANGOS")
+    print("=" * 70)
+    print(f"🖥️ CPUs disponibles: {os.cpu_count()}")
+    print(f"\n{'Páginas':>8} {'Pedidos':>8} {'Efectivos':>10} {'Tiempo s':>10} {'Speedup':>8}  Estructura")
+    print("-" * 70)
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for page_count in page_counts:
+            pdf_path = os.path.join(temp_dir, f"synthetic_{page_count}.pdf")
+            create_synthetic_pdf(pdf_path, page_count)
+            expected = {**structure(pdf_path), "stamps": page_count}
+            baseline = None
+
+            for workers in worker_counts:
+                output_path = os.path.join(temp_dir, f"output_{page_count}_{workers}.pdf")
+                times = []
+                for _ in range(runs):
+                    # Silenciar los logs por página del procesador
+                    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                        start = time.perf_counter()
+                        PDFProcessor().process_pdf({
+                            "pdf_path": pdf_path,
+                            "output_path": output_path,
+                            "insertions": insertions,
+                            "parallel_workers": workers
+                        })
+                        times.append(time.perf_counter() - start)
+
+                elapsed = min(times)
+                baseline = baseline or elapsed
+                preserved = structure(output_path) == expected
+                effective = fanout_worker_count(workers) if workers > 1 else 1
+                print(f"{page_count:>8} {workers:>8} {effective:>10} {elapsed:>10.2f} "
+                      f"{baseline / elapsed:>7.2f}x  {'✅' if preserved else '❌'}")
+                results.append({
+                    "pages": page_count,
+                    "workers": workers,
+                    "effective_workers": effective,
+                    "seconds": elapsed,
+                    "structure_preserved": preserved
+                })
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de fan-out por rangos de páginas")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1000, 3000],
+                        help="Números de páginas a medir")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="Valores de parallel_workers (1 = en serie)")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    benchmark_fanout(args.pages, args.workers, args.runs)
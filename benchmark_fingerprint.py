@@ -0,0 +1,77 @@
+"""
+Benchmark de huellas SHA-256
+Compara el throughput del hash de un archivo local leído por bloques con el
+del archivo mapeado en memoria (file_digest, el de /fingerprint)
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+# Los módulos de la aplicación están en lambda/ (al final: lambda/ también trae
+# dependencias empaquetadas para Lambda que no deben tapar las instaladas)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "lambda"))
+
+from processor import SPOOL_CHUNK_SIZE, file_digest
+
+
+def chunked_digest(path):
+    """SHA-256 leyendo el archivo por bloques de SPOOL_CHUNK_SIZE"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(SPOOL_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def best_of(repeats, function, *args):
+    """Mejor tiempo de repeats ejecuciones (segundos) y el último resultado"""
+    times, result = [], None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def benchmark_files(sizes_mb, repeats):
+    """Throughput del hash por bloques y mapeado en memoria"""
+    print("🔐 BENCHMARK DE HUELLAS SHA-256")
+    print("=" * 60)
+    print(f"{'Tamaño MB':>10} {'Bloques MB/s':>14} {'mmap MB/s':>12} {'Iguales':>8}")
+    print("-" * 60)
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for size_mb in sizes_mb:
+            path = os.path.join(temp_dir, f"file_{size_mb}mb.bin")
+            with open(path, "wb") as f:
+                for _ in range(int(size_mb)):
+                    f.write(os.urandom(1024 * 1024))
+
+            chunked_seconds, chunked = best_of(repeats, chunked_digest, path)
+            mapped_seconds, mapped = best_of(repeats, file_digest, path)
+            same = chunked == mapped["sha256"]
+            print(f"{size_mb:>10} {size_mb / chunked_seconds:>14.1f} {size_mb / mapped_seconds:>12.1f} "
+                  f"{'✅' if same else '❌':>8}")
+            results.append({
+                "size_mb": size_mb,
+                "chunked_mb_per_second": size_mb / chunked_seconds,
+                "mmap_mb_per_second": size_mb / mapped_seconds,
+                "same": same
+            })
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de huellas SHA-256")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 128, 512],
+                        help="Tamaños de archivo en MB")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    benchmark_files(args.sizes, args.repeats)
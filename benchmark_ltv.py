@@ -0,0 +1,301 @@
+"""
+Benchmark de firma LTV (sello de tiempo y /DSS)
+Levanta en local una TSA RFC 3161 y un respondedor OCSP que sustituyen a
+los reales, con una latencia simulada por petición, y compara la firma con
+la caché de revocación vacía en cada documento frente a la caché compartida.
+Cuenta las peticiones que recibe cada servidor y verifica las firmas
+"""
+
+import argparse
+import contextlib
+import datetime
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from asn1crypto import algos, cms, core, ocsp, tsp, x509 as asn1_x509
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from cryptography.x509.oid import ExtendedKeyUsageOID, NameOID
+
+import fitz  # PyMuPDF
+
+# Los módulos de la aplicación están en lambda/ (al final: lambda/ también trae
+# dependencias empaquetadas para Lambda que no deben tapar las instaladas)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "lambda"))
+
+import ltv
+from signing import PDFSigner
+from verification import ChainValidator, verify_pdf
+
+
+def create_synthetic_pdf(path, page_count):
+    """Genera un PDF de prueba con page_count páginas A4 de texto"""
+    doc = fitz.open()
+    for page_num in range(page_count):
+        page = doc.new_page(width=595, height=842)
+        page.insert_text((72, 72), f"Página de prueba {page_num + 1}", fontsize=14)
+    doc.save(path)
+    doc.close()
+
+
+def issue_certificate(common_name, issuer_name, issuer_key, public_key, ca=False, ocsp_url=None,
+                      time_stamping=False):
+    """Certificado de prueba firmado por issuer_key"""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    builder = (
+        x509.CertificateBuilder()
+        .subject_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)]))
+        .issuer_name(issuer_name)
+        .public_key(public_key)
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=5))
+        .not_valid_after(now + datetime.timedelta(days=30))
+        .add_extension(x509.BasicConstraints(ca=ca, path_length=None), critical=True)
+    )
+    if ocsp_url:
+        builder = builder.add_extension(x509.AuthorityInformationAccess([
+            x509.AccessDescription(x509.oid.AuthorityInformationAccessOID.OCSP,
+                                   x509.UniformResourceIdentifier(ocsp_url))
+        ]), critical=False)
+    if time_stamping:
+        builder = builder.add_extension(x509.ExtendedKeyUsage([ExtendedKeyUsageOID.TIME_STAMPING]), critical=True)
+    return builder.sign(issuer_key, hashes.SHA256())
+
+
+class StandInAuthority:
+    """CA de prueba con TSA y respondedor OCSP por HTTP en 127.0.0.1"""
+
+    def __init__(self, latency_seconds=0.0):
+        self.latency_seconds = latency_seconds
+        self.requests = {"tsa": 0, "ocsp": 0}
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+        self.root_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        root_name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "Stand-in Root CA")])
+        self.root = issue_certificate("Stand-in Root CA", root_name, self.root_key,
+                                      self.root_key.public_key(), ca=True)
+        self.intermediate_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.intermediate = issue_certificate("Stand-in Intermediate CA", root_name, self.root_key,
+                                              self.intermediate_key.public_key(), ca=True,
+                                              ocsp_url=f"{self.url}/ocsp")
+        self.tsa_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.tsa = issue_certificate("Stand-in TSA", root_name, self.root_key,
+                                     self.tsa_key.public_key(), time_stamping=True)
+        self._serial = 0
+        self._lock = threading.Lock()
+
+    def issue_signer(self):
+        """Clave y certificado de firmante emitidos por la intermedia"""
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        certificate = issue_certificate("Stand-in Signer", self.intermediate.subject,
+                                        self.intermediate_key, key.public_key(),
+                                        ocsp_url=f"{self.url}/ocsp")
+        return key, certificate
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self):
+        authority = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                time.sleep(authority.latency_seconds)
+                if self.path == "/tsa":
+                    data, content_type = authority.timestamp_response(body), "application/timestamp-reply"
+                elif self.path == "/ocsp":
+                    data, content_type = authority.ocsp_response(body), "application/ocsp-response"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def _sign(self, key, data):
+        return key.sign(data, padding.PKCS1v15(), hashes.SHA256())
+
+    def timestamp_response(self, body):
+        """TimeStampResp con un TSTInfo firmado por la TSA"""
+        request = tsp.TimeStampReq.load(body)
+        with self._lock:
+            self.requests["tsa"] += 1
+            self._serial += 1
+            serial = self._serial
+        tst_info = {
+            "version": 1,
+            "policy": "1.3.6.1.4.1.99999.1",
+            "message_imprint": request["message_imprint"],
+            "serial_number": serial,
+            "gen_time": datetime.datetime.now(datetime.timezone.utc),
+        }
+        if request["nonce"].native is not None:
+            tst_info["nonce"] = request["nonce"]
+        tst_info_der = tsp.TSTInfo(tst_info).dump()
+
+        tsa_cert = asn1_x509.Certificate.load(self.tsa.public_bytes(serialization.Encoding.DER))
+        signed_attrs = cms.CMSAttributes([
+            {"type": "content_type", "values": ["tst_info"]},
+            {"type": "message_digest", "values": [hashlib.sha256(tst_info_der).digest()]},
+            {"type": "signing_certificate_v2", "values": [{
+                "certs": [{"cert_hash": hashlib.sha256(tsa_cert.dump()).digest()}]
+            }]},
+        ])
+        signer_info = {
+            "version": "v1",
+            "sid": {"issuer_and_serial_number": {
+                "issuer": tsa_cert.issuer, "serial_number": tsa_cert.serial_number
+            }},
+            "digest_algorithm": {"algorithm": "sha256"},
+            "signed_attrs": signed_attrs,
+            "signature_algorithm": {"algorithm": "rsassa_pkcs1v15"},
+            "signature": self._sign(self.tsa_key, signed_attrs.dump()),
+        }
+        token = cms.ContentInfo({"content_type": "signed_data", "content": {
+            "version": "v3",
+            "digest_algorithms": [algos.DigestAlgorithm({"algorithm": "sha256"})],
+            "encap_content_info": {"content_type": "tst_info", "content": cms.ParsableOctetString(tst_info_der)},
+            "certificates": [tsa_cert] if request["cert_req"].native else [],
+            "signer_infos": [signer_info],
+        }})
+        return tsp.TimeStampResp({"status": {"status": "granted"}, "time_stamp_token": token}).dump()
+
+    def ocsp_response(self, body):
+        """
+        OCSPResponse "good" para todos los CertID de la petición, firmada por
+        su emisor (la raíz o la intermedia)
+        """
+        request = ocsp.OCSPRequest.load(body)
+        with self._lock:
+            self.requests["ocsp"] += 1
+        now = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+        issuers = {}
+        for key, certificate in ((self.root_key, self.root), (self.intermediate_key, self.intermediate)):
+            issuer = asn1_x509.Certificate.load(certificate.public_bytes(serialization.Encoding.DER))
+            issuers[issuer.public_key.sha1] = (key, issuer)
+        request_list = request["tbs_request"]["request_list"]
+        issuer_key, issuer = issuers[request_list[0]["req_cert"]["issuer_key_hash"].native]
+        response_data = ocsp.ResponseData({
+            "responder_id": {"by_key": issuer.public_key.sha1},
+            "produced_at": now,
+            "responses": [{
+                "cert_id": item["req_cert"],
+                "cert_status": ocsp.CertStatus(name="good", value=core.Null()),
+                "this_update": now,
+                "next_update": now + datetime.timedelta(hours=1),
+            } for item in request_list],
+        })
+        return ocsp.OCSPResponse({
+            "response_status": "successful",
+            "response_bytes": {"response_type": "basic_ocsp_response", "response": {
+                "tbs_response_data": response_data,
+                "signature_algorithm": {"algorithm": "sha256_rsa"},
+                "signature": self._sign(issuer_key, response_data.dump()),
+                "certs": [issuer],
+            }},
+        }).dump()
+
+
+def benchmark_ltv(count, latency_ms, workers):
+    """Firma count documentos con sello de tiempo y /DSS en cada modo"""
+    print("🛡️ BENCHMARK DE FIRMA LTV")
+    print("=" * 78)
+    print(f"⏳ Latencia simulada por petición: {latency_ms} ms")
+    print(f"{'Modo':<28} {'Docs/s':>8} {'TSA':>6} {'OCSP':>6} {'Válidas':>8} {'LTV':>6}")
+    print("-" * 78)
+
+    results = []
+    with StandInAuthority(latency_ms / 1000) as authority, tempfile.TemporaryDirectory() as temp_dir:
+        key, certificate = authority.issue_signer()
+        signer = PDFSigner(key, certificate, [authority.intermediate, authority.root],
+                           timestamp_provider=ltv.HTTPTimestampProvider(f"{authority.url}/tsa"),
+                           revocation_provider=ltv.HTTPRevocationProvider())
+        signer.prepare()
+        validator = ChainValidator([authority.root])
+
+        pdf_path = os.path.join(temp_dir, "synthetic.pdf")
+        create_synthetic_pdf(pdf_path, 5)
+        cache = ltv.get_revocation_cache()
+
+        def copies(mode):
+            paths = []
+            for index in range(count):
+                path = os.path.join(temp_dir, f"{mode}_{index}.pdf")
+                shutil.copyfile(pdf_path, path)
+                paths.append(path)
+            return paths
+
+        def sign_each(paths, clear_cache):
+            for path in paths:
+                if clear_cache:
+                    cache.clear()
+                signer.sign_file(path, timestamp=True, ltv=True)
+
+        def sign_batch(paths):
+            # Silenciar el resumen que imprime sign_files
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                summary = signer.sign_files(paths, workers=workers, timestamp=True, ltv=True)
+            if summary["failed"]:
+                raise RuntimeError(summary["results"])
+
+        modes = [
+            ("Sin caché de revocación", lambda paths: sign_each(paths, clear_cache=True)),
+            ("Caché compartida", lambda paths: sign_each(paths, clear_cache=False)),
+            (f"Lote ({workers} procesos)", sign_batch),
+        ]
+        for mode, (name, run) in enumerate(modes):
+            cache.clear()
+            paths = copies(mode)
+            before = dict(authority.requests)
+            start = time.perf_counter()
+            run(paths)
+            elapsed = time.perf_counter() - start
+            requests_made = {kind: authority.requests[kind] - before[kind] for kind in before}
+
+            reports = [verify_pdf(path, validator)["signatures"][0] for path in paths]
+            valid = sum(1 for report in reports if report["integrity"] and report["trusted"]
+                        and report["timestamped_at"] and not report["errors"])
+            with_ltv = sum(1 for report in reports if report["ltv"])
+            print(f"{name:<28} {count / elapsed:>8.1f} {requests_made['tsa']:>6} "
+                  f"{requests_made['ocsp']:>6} {valid:>8} {with_ltv:>6}")
+            results.append({
+                "mode": name,
+                "documents_per_second": count / elapsed,
+                "requests": requests_made,
+                "valid": valid,
+                "ltv": with_ltv
+            })
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de firma LTV con servidores locales")
+    parser.add_argument("--count", type=int, default=20, help="Documentos por modo")
+    parser.add_argument("--latency-ms", type=float, default=50,
+                        help="Latencia simulada de la TSA y del OCSP por petición")
+    parser.add_argument("--workers", type=int, default=2, help="Procesos del modo en lote")
+    args = parser.parse_args()
+
+    benchmark_ltv(args.count, args.latency_ms, args.workers)
@@ -0,0 +1,116 @@
+"""
+Benchmark de firma en bloque con manifiesto de Merkle
+Compara sign_files (una firma PAdES por documento) con sign_manifest (una
+sola firma sobre la raíz del árbol) y mide la verificación de un documento
+suelto, cuya prueba crece con log2(n). --key-latency-ms simula una clave
+remota (HSM o servicio de firma), donde cada operación de clave privada
+cuesta una petición
+"""
+
+import argparse
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import fitz  # PyMuPDF
+
+# Los módulos de la aplicación están en lambda/ (al final: lambda/ también trae
+# dependencias empaquetadas para Lambda que no deben tapar las instaladas)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "lambda"))
+
+from manifest import sign_manifest, verify_document
+from signing import PDFSigner, create_test_identity
+from verification import ChainValidator
+
+
+def create_synthetic_pdf(path, page_count):
+    """Genera un PDF de prueba con page_count páginas A4 de texto"""
+    doc = fitz.open()
+    for page_num in range(page_count):
+        page = doc.new_page(width=595, height=842)
+        page.insert_text((72, 72), f"Página de prueba {page_num + 1}", fontsize=14)
+    doc.save(path)
+    doc.close()
+
+
+def make_copies(pdf_path, directory, count):
+    """Copias del PDF a firmar (la firma modifica el archivo)"""
+    os.makedirs(directory, exist_ok=True)
+    copies = []
+    for index in range(count):
+        copy_path = os.path.join(directory, f"copy_{index}.pdf")
+        shutil.copyfile(pdf_path, copy_path)
+        copies.append(copy_path)
+    return copies
+
+
+def benchmark_manifest(counts, key_type, pages, key_latency_ms):
+    """Firma count documentos por cada modo y verifica uno del lote"""
+    print("🌳 BENCHMARK DE FIRMA CON MANIFIESTO DE MERKLE")
+    print("=" * 78)
+    print(f"🔑 Latencia simulada por operación de clave: {key_latency_ms} ms")
+    print(f"{'Documentos':>10} {'PAdES docs/s':>13} {'Manifiesto docs/s':>18} "
+          f"{'Speedup':>8} {'Prueba':>7} {'Verificar':>10}")
+    print("-" * 78)
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        identity = create_test_identity(os.path.join(temp_dir, "id"), key_type=key_type)
+        signer = PDFSigner.from_files(identity["key"], identity["cert"])
+        signer.prepare()
+        if key_latency_ms:
+            sign = signer._cms["sign"]
+
+            def remote_sign(data):
+                time.sleep(key_latency_ms / 1000)
+                return sign(data)
+            signer._cms["sign"] = remote_sign
+        validator = ChainValidator([signer.certificate])
+        pdf_path = os.path.join(temp_dir, "synthetic.pdf")
+        create_synthetic_pdf(pdf_path, pages)
+
+        for count in counts:
+            # Silenciar los resúmenes de cada lote
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                copies = make_copies(pdf_path, os.path.join(temp_dir, f"pades_{count}"), count)
+                start = time.perf_counter()
+                signer.sign_files(copies, workers=1)
+                pades_rate = count / (time.perf_counter() - start)
+
+                copies = make_copies(pdf_path, os.path.join(temp_dir, f"manifest_{count}"), count)
+                summary = sign_manifest(copies, signer=signer)
+            manifest_rate = summary["documents_per_second"]
+
+            start = time.perf_counter()
+            report = verify_document(copies[-1], validator=validator)
+            verify_ms = (time.perf_counter() - start) * 1000
+            proof_length = (count - 1).bit_length()
+            print(f"{count:>10} {pades_rate:>13.1f} {manifest_rate:>18.1f} "
+                  f"{manifest_rate / pades_rate:>7.2f}x {proof_length:>7} "
+                  f"{verify_ms:>8.2f}ms {'✅' if report['valid'] else '❌'}")
+            results.append({
+                "documents": count,
+                "pades_documents_per_second": pades_rate,
+                "manifest_documents_per_second": manifest_rate,
+                "proof_length": proof_length,
+                "verify_ms": verify_ms,
+                "valid": report["valid"]
+            })
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de firma en bloque con manifiesto de Merkle")
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000],
+                        help="Tamaños de lote a medir")
+    parser.add_argument("--key-type", default="rsa", choices=["rsa", "ec"])
+    parser.add_argument("--pages", type=int, default=1, help="Páginas de cada PDF")
+    parser.add_argument("--key-latency-ms", type=float, default=0,
+                        help="Latencia simulada de cada operación de clave privada")
+    args = parser.parse_args()
+
+    benchmark_manifest(args.counts, args.key_type, args.pages, args.key_latency_ms)
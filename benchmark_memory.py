@@ -0,0 +1,125 @@
+"""
+Benchmark de memoria para documentos grandes
+Mide el pico de RSS de process_pdf frente al número de páginas, con y sin
+el modo de memoria acotada (large_document)
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import fitz  # PyMuPDF
+
+# Los módulos de la aplicación están en lambda/ (al final: lambda/ también trae
+# dependencias empaquetadas para Lambda que no deben tapar las instaladas)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "lambda"))
+
+from processor import PDFProcessor
+
+
+def create_synthetic_pdf(path, page_count, scanned=False):
+    """
+    Genera un PDF de prueba con page_count páginas A4
+
+    Con scanned=True cada página lleva una imagen de página completa
+    distinta, como un documento escaneado
+    """
+    doc = fitz.open()
+    for page_num in range(page_count):
+        page = doc.new_page(width=595, height=842)
+        if scanned:
+            pixmap = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 600, 850), False)
+            pixmap.clear_with(128 + page_num % 128)
+            page.insert_image(page.rect, pixmap=pixmap)
+        else:
+            page.insert_text((72, 72), f"Página de prueba {page_num + 1}", fontsize=14)
+    doc.save(path, garbage=1, deflate=1)
+    doc.close()
+
+
+def peak_rss_mb():
+    """Pico de RSS del proceso actual en MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_job(pdf_path, output_path, large_document, connection):
+    """Procesa el PDF en un proceso aislado y reporta pico de RSS y tiempo"""
+    insertions = [
+        {"type": "text", "content": "CONFIDENCIAL", "position": [50, 50],
+         "font_size": 10, "color": [1, 0, 0], "pages": "all"},
+        {"type": "image", "source": os.path.join("assets", "rubrica.png"),
+         "position": [400, 60], "width": 100, "height": 50, "pages": "all"},
+    ]
+    processor = PDFProcessor(large_document=large_document, memory_limit_mb=0)
+
+    # Silenciar los logs por página del procesador
+    sys.stdout = open(os.devnull, "w")
+    start = time.perf_counter()
+    try:
+        processor.process_pdf({
+            "pdf_path": pdf_path,
+            "output_path": output_path,
+            "insertions": insertions
+        })
+        connection.send((peak_rss_mb(), time.perf_counter() - start, None))
+    except Exception as e:
+        connection.send((peak_rss_mb(), time.perf_counter() - start, str(e)))
+
+
+def measure(pdf_path, output_path, large_document):
+    """Ejecuta un trabajo en un proceso hijo y devuelve sus métricas"""
+    parent_conn, child_conn = multiprocessing.Pipe()
+    process = multiprocessing.Process(
+        target=run_job, args=(pdf_path, output_path, large_document, child_conn)
+    )
+    process.start()
+    result = parent_conn.recv()
+    process.join()
+    return result
+
+
+def benchmark_memory(page_counts, scanned=False):
+    """Mide pico de RSS y tiempo para cada número de páginas y cada modo"""
+    print("🐘 BENCHMARK DE MEMORIA - DOCUMENTOS GRANDES")
+    print("=" * 70)
+    print(f"📄 Tipo de documento: {'escaneado' if scanned else 'texto'}")
+    print(f"\n{'Páginas':>8} {'Modo':<10} {'Pico RSS MB':>12} {'Tiempo s':>10}  Estado")
+    print("-" * 70)
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for page_count in page_counts:
+            pdf_path = os.path.join(temp_dir, f"synthetic_{page_count}.pdf")
+            create_synthetic_pdf(pdf_path, page_count, scanned)
+
+            for large_document in (False, True):
+                output_path = os.path.join(temp_dir, f"output_{page_count}.pdf")
+                rss_mb, elapsed, error = measure(pdf_path, output_path, large_document)
+                mode = "acotado" if large_document else "normal"
+                status = f"❌ {error}" if error else "✅"
+                print(f"{page_count:>8} {mode:<10} {rss_mb:>12.1f} {elapsed:>10.2f}  {status}")
+                results.append({
+                    "pages": page_count,
+                    "large_document": large_document,
+                    "peak_rss_mb": rss_mb,
+                    "seconds": elapsed,
+                    "error": error
+                })
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de pico de RSS frente a páginas")
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 500, 1000, 2500, 5000],
+                        help="Números de páginas a medir")
+    parser.add_argument("--scanned", action="store_true",
+                        help="Simular un documento escaneado (una imagen por página)")
+    args = parser.parse_args()
+
+    benchmark_memory(args.pages, args.scanned)
@@ -0,0 +1,109 @@
+"""
+Benchmark de perfiles de guardado
+Compara tiempo y tamaño de salida de cada perfil de SAVE_PROFILES sobre un
+corpus de PDFs locales, aplicando las inserciones de un template
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Los módulos de la aplicación están en lambda/ (al final: lambda/ también trae
+# dependencias empaquetadas para Lambda que no deben tapar las instaladas)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "lambda"))
+
+from processor import PDFProcessor, SAVE_PROFILES
+
+
+def load_insertions(template_path):
+    """Carga las inserciones de un template de coordenadas"""
+    with open(template_path, "r", encoding="utf-8") as f:
+        return json.load(f).get("insertions", [])
+
+
+def find_corpus(corpus_dir):
+    """Lista los PDFs del corpus ordenados por nombre"""
+    return sorted(
+        os.path.join(corpus_dir, f)
+        for f in os.listdir(corpus_dir)
+        if f.lower().endswith(".pdf")
+    )
+
+
+def benchmark_save_profiles(corpus_dir, template_path, repeats=3):
+    """Procesa cada PDF del corpus con cada perfil y mide tiempo y tamaño"""
+    insertions = load_insertions(template_path)
+    pdf_files = find_corpus(corpus_dir)
+
+    if not pdf_files:
+        print(f"❌ No se encontraron PDFs en {corpus_dir}")
+        return []
+
+    print("⏱️ BENCHMARK DE PERFILES DE GUARDADO")
+    print("=" * 70)
+    print(f"📁 Corpus: {corpus_dir} ({len(pdf_files)} archivos)")
+    print(f"📋 Template: {template_path} ({len(insertions)} inserciones)")
+    print(f"🔁 Repeticiones: {repeats}")
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for pdf_path in pdf_files:
+            input_size = os.path.getsize(pdf_path)
+            for profile in SAVE_PROFILES:
+                processor = PDFProcessor(save_profile=profile)
+                output_path = os.path.join(temp_dir, f"{profile}_{os.path.basename(pdf_path)}")
+                timings = []
+
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    processor.process_pdf({
+                        "pdf_path": pdf_path,
+                        "output_path": output_path,
+                        "insertions": insertions
+                    })
+                    timings.append(time.perf_counter() - start)
+
+                results.append({
+                    "file": os.path.basename(pdf_path),
+                    "profile": profile,
+                    "input_bytes": input_size,
+                    "output_bytes": os.path.getsize(output_path),
+                    "median_ms": statistics.median(timings) * 1000
+                })
+
+    print_results(results)
+    return results
+
+
+def print_results(results):
+    """Imprime la tabla de resultados y el resumen por perfil"""
+    print(f"\n{'Archivo':<30} {'Perfil':<8} {'Entrada KB':>11} {'Salida KB':>10} {'Mediana ms':>11}")
+    print("-" * 74)
+    for r in results:
+        print(
+            f"{r['file'][:30]:<30} {r['profile']:<8} {r['input_bytes'] / 1024:>11.1f} "
+            f"{r['output_bytes'] / 1024:>10.1f} {r['median_ms']:>11.1f}"
+        )
+
+    print(f"\n📊 RESUMEN POR PERFIL")
+    print("-" * 40)
+    for profile in SAVE_PROFILES:
+        rows = [r for r in results if r["profile"] == profile]
+        total_ms = sum(r["median_ms"] for r in rows)
+        total_kb = sum(r["output_bytes"] for r in rows) / 1024
+        print(f"{profile:<8} {total_ms:>10.1f} ms {total_kb:>12.1f} KB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de perfiles de guardado")
+    parser.add_argument("--corpus", default="input", help="Directorio con los PDFs de prueba")
+    parser.add_argument("--template", default="template_coordinates_simple.json",
+                        help="Template JSON con las inserciones a aplicar")
+    parser.add_argument("--repeats", type=int, default=3, help="Repeticiones por archivo y perfil")
+    args = parser.parse_args()
+
+    benchmark_save_profiles(args.corpus, args.template, args.repeats)
@@ -0,0 +1,220 @@
+"""
+Benchmark de firma criptográfica (PAdES)
+Mide firmas por segundo con una identidad autofirmada generada al vuelo y
+desglosa el tiempo entre la actualización incremental, el hash del
+/ByteRange y la firma CMS. Con --batch-workers mide además sign_files en
+lote y las firmas por segundo de CPU (por núcleo), y con --appearance la
+firma visible con la apariencia compilada en cada documento frente a la
+apariencia en caché
+"""
+
+import argparse
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import fitz  # PyMuPDF
+
+# Los módulos de la aplicación están en lambda/ (al final: lambda/ también trae
+# dependencias empaquetadas para Lambda que no deben tapar las instaladas)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "lambda"))
+
+import appearance
+import signing
+from signing import PDFSigner, create_test_identity
+
+
+def create_synthetic_pdf(path, page_count):
+    """Genera un PDF de prueba con page_count páginas A4 de texto"""
+    doc = fitz.open()
+    for page_num in range(page_count):
+        page = doc.new_page(width=595, height=842)
+        page.insert_text((72, 72), f"Página de prueba {page_num + 1}", fontsize=14)
+    doc.save(path)
+    doc.close()
+
+
+def timed(stages, name, function):
+    """Envuelve function para acumular su tiempo en stages[name]"""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stages[name] += time.perf_counter() - start
+    return wrapper
+
+
+def make_copies(pdf_path, temp_dir, count):
+    """Copias del PDF a firmar (la firma modifica el archivo)"""
+    copies = []
+    for index in range(count):
+        copy_path = os.path.join(temp_dir, f"copy_{index}.pdf")
+        shutil.copyfile(pdf_path, copy_path)
+        copies.append(copy_path)
+    return copies
+
+
+def benchmark_signing(page_counts, key_types, count):
+    """Firma count copias de cada PDF con cada tipo de clave"""
+    print("🔏 BENCHMARK DE FIRMA PAdES")
+    print("=" * 78)
+    print(f"{'Páginas':>8} {'Clave':>6} {'MB':>7} {'Firmas/s':>9} "
+          f"{'Incremental':>12} {'Hash':>8} {'CMS':>8} {'Carga clave':>12}")
+    print("-" * 78)
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for key_type in key_types:
+            identity = create_test_identity(os.path.join(temp_dir, key_type), key_type=key_type)
+            # La carga de la clave se paga una vez por proceso (get_signer)
+            start = time.perf_counter()
+            signer = PDFSigner.from_files(identity["key"], identity["cert"])
+            load_ms = (time.perf_counter() - start) * 1000
+
+            for page_count in page_counts:
+                pdf_path = os.path.join(temp_dir, f"synthetic_{page_count}.pdf")
+                if not os.path.exists(pdf_path):
+                    create_synthetic_pdf(pdf_path, page_count)
+                copies = make_copies(pdf_path, temp_dir, count)
+
+                stages = {"hash": 0.0, "cms": 0.0}
+                digest_byte_range = signing._digest_byte_range
+                signing._digest_byte_range = timed(stages, "hash", digest_byte_range)
+                signer._sign_attributes = timed(stages, "cms", signer._sign_attributes)
+                try:
+                    start = time.perf_counter()
+                    for copy_path in copies:
+                        signer.sign_file(copy_path)
+                    elapsed = time.perf_counter() - start
+                finally:
+                    signing._digest_byte_range = digest_byte_range
+                    del signer._sign_attributes
+
+                # El resto (abrir, reservar el campo, saveIncr, escribir)
+                # cuenta como actualización incremental
+                stages["incremental"] = elapsed - stages["hash"] - stages["cms"]
+                size_mb = os.path.getsize(pdf_path) / (1024 * 1024)
+                per_sign = {name: value / count * 1000 for name, value in stages.items()}
+                print(f"{page_count:>8} {key_type:>6} {size_mb:>7.2f} {count / elapsed:>9.1f} "
+                      f"{per_sign['incremental']:>10.2f}ms {per_sign['hash']:>6.2f}ms "
+                      f"{per_sign['cms']:>6.2f}ms {load_ms:>10.2f}ms")
+                results.append({
+                    "pages": page_count,
+                    "key_type": key_type,
+                    "signatures_per_second": count / elapsed,
+                    "ms_per_stage": per_sign,
+                    "key_load_ms": load_ms
+                })
+
+    return results
+
+
+def benchmark_batch(page_counts, key_types, count, worker_counts):
+    """Firma count copias con sign_files para cada número de procesos"""
+    print("\n📦 FIRMA EN LOTE (sign_files)")
+    print("=" * 70)
+    print(f"🖥️ CPUs disponibles: {os.cpu_count()}")
+    print(f"{'Páginas':>8} {'Clave':>6} {'Procesos':>9} {'Firmas/s':>9} {'Por núcleo':>11} {'Fallidas':>9}")
+    print("-" * 70)
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for key_type in key_types:
+            identity = create_test_identity(os.path.join(temp_dir, key_type), key_type=key_type)
+            signer = PDFSigner.from_files(identity["key"], identity["cert"])
+            signer.prepare()
+
+            for page_count in page_counts:
+                pdf_path = os.path.join(temp_dir, f"synthetic_{page_count}.pdf")
+                if not os.path.exists(pdf_path):
+                    create_synthetic_pdf(pdf_path, page_count)
+                for workers in worker_counts:
+                    copies = make_copies(pdf_path, temp_dir, count)
+                    # Silenciar el resumen que imprime sign_files
+                    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                        summary = signer.sign_files(copies, workers=workers)
+                    print(f"{page_count:>8} {key_type:>6} {summary['workers']:>9} "
+                          f"{summary['signatures_per_second']:>9.1f} "
+                          f"{summary['signatures_per_core_second']:>11.1f} {summary['failed']:>9}")
+                    results.append({
+                        "pages": page_count,
+                        "key_type": key_type,
+                        "workers": summary["workers"],
+                        "signatures_per_second": summary["signatures_per_second"],
+                        "signatures_per_core_second": summary["signatures_per_core_second"]
+                    })
+
+    return results
+
+
+def benchmark_appearance(page_counts, count, image, seal):
+    """Firma count copias invisibles, visibles sin caché y visibles con caché"""
+    print("\n🖋️ FIRMA VISIBLE (apariencia compilada)")
+    print("=" * 70)
+    print(f"{'Páginas':>8} {'Modo':<24} {'Firmas/s':>9} {'ms/firma':>9} {'Compiladas':>11}")
+    print("-" * 70)
+
+    options = {"page": 0, "rect": [320, 720, 570, 800], "image": image, "seal": seal}
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        identity = create_test_identity(os.path.join(temp_dir, "id"), key_type="ec")
+        signer = PDFSigner.from_files(identity["key"], identity["cert"])
+        signer.prepare()
+        cache = appearance.get_appearance_cache()
+
+        modes = [
+            ("Invisible", None, False),
+            ("Visible sin caché", options, True),
+            ("Visible con caché", options, False),
+        ]
+        for page_count in page_counts:
+            pdf_path = os.path.join(temp_dir, f"synthetic_{page_count}.pdf")
+            create_synthetic_pdf(pdf_path, page_count)
+            for name, visible, clear_cache in modes:
+                copies = make_copies(pdf_path, temp_dir, count)
+                cache.clear()
+                misses = cache.stats["misses"]
+                # Silenciar el aviso de cada compilación
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    start = time.perf_counter()
+                    for copy_path in copies:
+                        if clear_cache:
+                            cache.clear()
+                        signer.sign_file(copy_path, appearance=visible)
+                    elapsed = time.perf_counter() - start
+                compiled = cache.stats["misses"] - misses
+                print(f"{page_count:>8} {name:<24} {count / elapsed:>9.1f} "
+                      f"{elapsed / count * 1000:>7.2f}ms {compiled:>11}")
+                results.append({
+                    "pages": page_count,
+                    "mode": name,
+                    "signatures_per_second": count / elapsed,
+                    "compiled": compiled
+                })
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de firma criptográfica PAdES")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 50, 500],
+                        help="Números de páginas de los PDFs a firmar")
+    parser.add_argument("--key-types", nargs="+", default=["rsa", "ec"], choices=["rsa", "ec"])
+    parser.add_argument("--count", type=int, default=50, help="Firmas por configuración")
+    parser.add_argument("--batch-workers", type=int, nargs="*", default=[],
+                        help="Procesos de sign_files a medir (por ejemplo 1 2 4)")
+    parser.add_argument("--appearance", action="store_true",
+                        help="Medir la firma visible con y sin caché de apariencias")
+    parser.add_argument("--image", default="assets/rubrica.png", help="Rúbrica de la firma visible")
+    parser.add_argument("--seal", default="assets/sello_circular_rb.png", help="Sello de la firma visible")
+    args = parser.parse_args()
+
+    benchmark_signing(args.pages, args.key_types, args.count)
+    if args.batch_workers:
+        benchmark_batch(args.pages, args.key_types, args.count, args.batch_workers)
+    if args.appearance:
+        benchmark_appearance(args.pages, args.count, args.image, args.seal)
@@ -0,0 +1,108 @@
+"""
+Benchmark de sellos como anotaciones
+Compara las inserciones en el flujo de contenido de cada página ("mode":
+"content") con los sellos como anotaciones que comparten un XObject de
+apariencia ("mode": "annotation"): tiempo, tamaño del PDF reescrito y
+bytes añadidos por una actualización incremental
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+import fitz  # PyMuPDF
+
+# Los módulos de la aplicación están en lambda/ (al final: lambda/ también trae
+# dependencias empaquetadas para Lambda que no deben tapar las instaladas)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "lambda"))
+
+from processor import PDFProcessor
+from stamps import get_stamp_cache
+
+
+def create_synthetic_pdf(path, page_count):
+    """Genera un PDF de prueba con page_count páginas A4 de texto"""
+    doc = fitz.open()
+    for page_num in range(page_count):
+        page = doc.new_page(width=595, height=842)
+        page.insert_text((72, 72), f"Página de prueba {page_num + 1}", fontsize=14)
+    doc.save(path)
+    doc.close()
+
+
+def stamp_insertions(mode, image):
+    """Sello de texto, imagen y QR en todas las páginas"""
+    insertions = [
+        {"type": "text", "content": "COPIA CONTROLADA", "position": [72, 120], "font_size": 18,
+         "color": [200, 0, 0], "pages": "all", "mode": mode},
+        {"type": "qr", "content": "https://verifica.example.com/doc/{sha256}", "position": [40, 700],
+         "width": 90, "pages": "all", "mode": mode}
+    ]
+    if image:
+        insertions.append({"type": "image", "source": image, "position": [450, 40], "width": 100,
+                           "height": 100, "pages": "all", "mode": mode})
+    return insertions
+
+
+def run(pdf_path, output_path, insertions, incremental):
+    """Procesa el PDF en silencio y devuelve los segundos"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        PDFProcessor().process_pdf({
+            "pdf_path": pdf_path,
+            "output_path": output_path,
+            "insertions": insertions,
+            "incremental": incremental
+        })
+        return time.perf_counter() - start
+
+
+def benchmark_stamps(page_counts, image):
+    """Tiempo y tamaño de cada modo por número de páginas"""
+    print("🏷️ BENCHMARK DE SELLOS COMO ANOTACIONES")
+    print("=" * 78)
+    print(f"{'Páginas':>8} {'Modo':>11} {'Tiempo ms':>10} {'Reescrito KB':>13} {'Incremental KB':>15}")
+    print("-" * 78)
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for page_count in page_counts:
+            pdf_path = os.path.join(temp_dir, f"synthetic_{page_count}.pdf")
+            create_synthetic_pdf(pdf_path, page_count)
+            input_size = os.path.getsize(pdf_path)
+
+            for mode in ("content", "annotation"):
+                insertions = stamp_insertions(mode, image)
+                # Primera pasada para compilar los sellos (caché del proceso)
+                run(pdf_path, os.path.join(temp_dir, "warmup.pdf"), insertions, False)
+                output_path = os.path.join(temp_dir, f"{mode}_{page_count}.pdf")
+                seconds = run(pdf_path, output_path, insertions, False)
+                incremental_path = os.path.join(temp_dir, f"{mode}_{page_count}_incr.pdf")
+                run(pdf_path, incremental_path, insertions, True)
+                added = os.path.getsize(incremental_path) - input_size
+                print(f"{page_count:>8} {mode:>11} {seconds * 1000:>10.1f} "
+                      f"{os.path.getsize(output_path) / 1024:>13.1f} {added / 1024:>15.1f}")
+                results.append({
+                    "pages": page_count,
+                    "mode": mode,
+                    "ms": seconds * 1000,
+                    "output_bytes": os.path.getsize(output_path),
+                    "incremental_bytes": added
+                })
+
+    print(f"📊 Caché de sellos: {get_stamp_cache().stats}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de sellos como anotaciones")
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 500],
+                        help="Páginas de los PDFs a medir")
+    parser.add_argument("--image", default="assets/sello_circular_rb.png",
+                        help="Imagen del sello (vacío para omitirla)")
+    args = parser.parse_args()
+
+    benchmark_stamps(args.pages, args.image or None)
@@ -0,0 +1,93 @@
+"""
+Benchmark de almacenamiento
+Mide el throughput de escritura y lectura en streaming del backend de
+almacenamiento configurado (local por defecto, sin AWS)
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Los módulos de la aplicación están en lambda/ (al final: lambda/ también trae
+# dependencias empaquetadas para Lambda que no deben tapar las instaladas)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "lambda"))
+
+from storage import LocalStorage, S3Storage, STORAGE_CHUNK_SIZE
+
+
+def build_storage(backend, root, bucket):
+    """Crea el backend a medir"""
+    if backend == "s3":
+        return S3Storage(bucket)
+    return LocalStorage(root)
+
+
+def write_object(storage, key, payload, chunk_size):
+    """Escribe payload en bloques y devuelve los segundos empleados"""
+    start = time.perf_counter()
+    with storage.open_write(key) as writer:
+        view = memoryview(payload)
+        for offset in range(0, len(payload), chunk_size):
+            writer.write(view[offset:offset + chunk_size])
+    return time.perf_counter() - start
+
+
+def read_object(storage, key, chunk_size):
+    """Lee el objeto completo en streaming y devuelve segundos y bytes leídos"""
+    start = time.perf_counter()
+    total = 0
+    for chunk in storage.iter_chunks(key, chunk_size):
+        total += len(chunk)
+    return time.perf_counter() - start, total
+
+
+def benchmark_storage(storage, sizes_mb, repeats, chunk_size):
+    """Imprime el throughput de escritura y lectura para cada tamaño"""
+    print("💾 BENCHMARK DE ALMACENAMIENTO")
+    print("=" * 60)
+    print(f"🗄️ Backend: {type(storage).__name__}")
+    print(f"\n{'Tamaño MB':>10} {'Escritura MB/s':>16} {'Lectura MB/s':>14}")
+    print("-" * 60)
+
+    results = []
+    for size_mb in sizes_mb:
+        payload = os.urandom(int(size_mb * 1024 * 1024))
+        key = f"benchmark/object_{size_mb}mb.bin"
+        write_rates, read_rates = [], []
+
+        for _ in range(repeats):
+            write_seconds = write_object(storage, key, payload, chunk_size)
+            read_seconds, total = read_object(storage, key, chunk_size)
+            if total != len(payload):
+                raise RuntimeError(f"Lectura incompleta: {total} de {len(payload)} bytes")
+            write_rates.append(size_mb / write_seconds)
+            read_rates.append(size_mb / read_seconds)
+
+        storage.delete(key)
+        write_rate = statistics.median(write_rates)
+        read_rate = statistics.median(read_rates)
+        print(f"{size_mb:>10} {write_rate:>16.1f} {read_rate:>14.1f}")
+        results.append({"size_mb": size_mb, "write_mb_s": write_rate, "read_mb_s": read_rate})
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de throughput del almacenamiento")
+    parser.add_argument("--backend", choices=["local", "s3"], default="local")
+    parser.add_argument("--root", default=None,
+                        help="Directorio para el backend local (por defecto, uno temporal)")
+    parser.add_argument("--bucket", default=os.environ.get("PDF_BUCKET_NAME"),
+                        help="Bucket para el backend s3 (S3_ENDPOINT_URL para un S3 local)")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 8, 32, 128],
+                        help="Tamaños de objeto en MB")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--chunk-size", type=int, default=STORAGE_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        storage = build_storage(args.backend, args.root or temp_dir, args.bucket)
+        benchmark_storage(storage, args.sizes, args.repeats, args.chunk_size)
@@ -0,0 +1,140 @@
+"""
+Benchmark de respuesta en streaming
+Simula una invocación en streaming (Lambda Web Adapter en modo
+RESPONSE_STREAM) llamando directamente a la app ASGI de lambda/main.py y
+registrando cuándo sale cada bloque de la respuesta
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+import fitz  # PyMuPDF
+
+
+def create_synthetic_pdf(path, page_count):
+    """Genera un PDF de prueba con page_count páginas A4 de texto"""
+    doc = fitz.open()
+    for page_num in range(page_count):
+        page = doc.new_page(width=595, height=842)
+        page.insert_text((72, 72), f"Página de prueba {page_num + 1}", fontsize=14)
+    doc.save(path)
+    doc.close()
+
+
+def multipart_body(filename, content):
+    """Cuerpo multipart/form-data con el PDF en el campo "file" """
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode() + content + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+async def invoke(app, path, query, body, content_type):
+    """
+    Ejecuta una petición contra la app ASGI y devuelve el código HTTP y los
+    bloques del cuerpo con el instante (s) en que se enviaron
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [
+            (b"host", b"localhost"),
+            (b"content-type", content_type.encode()),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 8080),
+    }
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # El cliente simulado no se desconecta
+        await asyncio.Event().wait()
+
+    status = None
+    chunks = []
+    start = time.perf_counter()
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body" and message.get("body"):
+            chunks.append((time.perf_counter() - start, message["body"]))
+
+    await app(scope, receive, send)
+    return status, chunks, time.perf_counter() - start
+
+
+def benchmark_streaming(app_dir, pdf_path, runs):
+    """Imprime tiempo hasta el primer byte frente al tiempo total"""
+    sys.path.insert(0, os.path.abspath(app_dir))
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    import main
+
+    insertions = [{"type": "text", "content": "CONFIDENCIAL", "position": [50, 50],
+                   "font_size": 10, "color": [1, 0, 0], "pages": "all"}]
+    with open(pdf_path, "rb") as f:
+        content = f.read()
+    body, content_type = multipart_body(os.path.basename(pdf_path), content)
+    query = f"stream=true&insertions={json.dumps(insertions)}"
+
+    print("🌊 BENCHMARK DE RESPUESTA EN STREAMING")
+    print("=" * 60)
+    print(f"📄 Entrada: {pdf_path} ({len(content) / (1024 * 1024):.1f} MB)")
+
+    first_byte, totals = [], []
+    for _ in range(runs):
+        status, chunks, elapsed = asyncio.run(
+            invoke(main.app, "/upload-and-process", query, body, content_type)
+        )
+        if status != 200 or not chunks:
+            raise RuntimeError(f"Respuesta inesperada: {status}")
+        output = b"".join(chunk for _, chunk in chunks)
+        if not output.startswith(b"%PDF"):
+            # Salida demasiado grande: la app respondió con la URL de S3
+            raise RuntimeError(f"La respuesta no es un PDF: {output[:200]!r}")
+        first_byte.append(chunks[0][0])
+        totals.append(elapsed)
+
+    print(f"📦 Salida: {len(output) / (1024 * 1024):.1f} MB en {len(chunks)} bloques")
+    print(f"⏱️ Primer byte (mediana): {statistics.median(first_byte) * 1000:.0f} ms")
+    print(f"⏱️ Respuesta completa (mediana): {statistics.median(totals) * 1000:.0f} ms")
+    return {"first_byte_s": first_byte, "total_s": totals, "chunks": len(chunks)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de respuesta en streaming")
+    parser.add_argument("--app-dir", default="lambda", help="Directorio con main.py de la Lambda")
+    parser.add_argument("--pdf", default=None, help="PDF de entrada (por defecto, uno sintético)")
+    parser.add_argument("--pages", type=int, default=500, help="Páginas del PDF sintético")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = args.pdf
+        if pdf_path is None:
+            pdf_path = os.path.join(temp_dir, "synthetic.pdf")
+            create_synthetic_pdf(pdf_path, args.pages)
+        benchmark_streaming(args.app_dir, pdf_path, args.runs)
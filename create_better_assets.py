@@ -84,6 +84,20 @@ def create_seal_stamp():
     img.save('assets/sello_oficial.png')
     print("✅ Sello oficial creado")
 
+def create_seal_svg():
+    """Crear el sello circular RB en SVG (vectorial, nítido a cualquier tamaño)"""
+    svg = """<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100" viewBox="0 0 100 100">
+  <circle cx="50" cy="50" r="46" fill="none" stroke="#000000" stroke-width="2.5"/>
+  <circle cx="50" cy="50" r="36" fill="none" stroke="#000000" stroke-width="1"/>
+  <text x="50" y="24" font-family="Helvetica" font-size="9" font-weight="bold" text-anchor="middle">APROBADO</text>
+  <text x="50" y="58" font-family="Helvetica" font-size="22" text-anchor="middle">RB</text>
+  <text x="50" y="84" font-family="Helvetica" font-size="9" font-weight="bold" text-anchor="middle">SELLADO</text>
+</svg>
+"""
+    with open('assets/sello_circular_rb.svg', 'w') as f:
+        f.write(svg)
+    print("✅ Sello SVG creado")
+
 def create_watermark():
     """Crear una marca de agua"""
     img = Image.new('RGBA', (200, 50), (255, 255, 255, 0))
@@ -111,6 +125,7 @@ if __name__ == "__main__":
     create_realistic_signature()
     create_realistic_qr()
     create_seal_stamp()
+    create_seal_svg()
     create_watermark()
     
     print("\n🎬 ¡Assets listos para el video de TikTok!")
@@ -118,4 +133,5 @@ if __name__ == "__main__":
     print("   - rubrica_realista.png")
     print("   - qr_realista.png") 
     print("   - sello_oficial.png")
+    print("   - sello_circular_rb.svg")
     print("   - marca_agua.png") 
\ No newline at end of file
@@ -0,0 +1,389 @@
+"""
+Appearance Module
+Apariencia visible de las firmas (bloque con rúbrica, nombre, sujeto del
+certificado, fecha, hash del documento y sello)
+
+La apariencia de un firmante se compila una vez y se guarda en caché por
+huella del certificado y opciones de apariencia (tamaño incluido):
+    - las imágenes se decodifican y comprimen una vez; en cada documento se
+      copian sus bytes ya comprimidos como XObject de imagen
+    - los sellos y rúbricas SVG o PDF (vector.py) quedan como XObject de
+      formulario vectorial, con sus recursos ya extraídos
+    - el texto se compone una vez con Helvetica (fuente estándar, sin
+      incrustar) y queda como plantilla del flujo de contenido
+    - la fecha y el hash del documento son marcadores de la plantilla que
+      se sustituyen en cada documento
+
+En cada documento solo se crean los objetos de la apariencia (/AP /N del
+widget de firma) a partir de bytes ya preparados.
+"""
+
+import json
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+import fitz  # PyMuPDF
+
+from vector import get_vector_cache, is_vector_source
+
+
+APPEARANCE_CACHE_MAX_ENTRIES = int(os.environ.get("PDF_APPEARANCE_CACHE_MAX_ENTRIES", 64))
+APPEARANCE_FONT_SIZE = 7
+
+# Marcadores de los campos dinámicos en la plantilla del contenido
+_DATE_MARK = b"@@DATE@@"
+_HASH_MARK = b"@@HASH@@"
+_TEXT_COLOR = "0.1 0.1 0.1 rg"
+
+# Opciones que solo colocan la apariencia y no cambian su contenido
+_PLACEMENT_OPTIONS = ("page", "rect")
+
+
+class CompiledAppearance:
+    """Apariencia de un firmante lista para copiarse en cada documento"""
+
+    def __init__(self, width: float, height: float, content: bytes, images: List[Dict[str, Any]],
+                 hash_chars: int = 64):
+        """
+        Args:
+            width: Ancho del bloque en puntos
+            height: Alto del bloque en puntos
+            content: Plantilla del flujo de contenido con los marcadores
+            hash_chars: Cifras del hash del documento que caben en una línea
+            images: Por imagen: name, dict (diccionario PDF con las
+                referencias como {ref:n}), stream (bytes comprimidos) y
+                objects (objetos referenciados, con el mismo formato)
+        """
+        self.width = width
+        self.height = height
+        self.content = content
+        self.images = images
+        self.hash_chars = hash_chars
+
+    def render(self, date: str, document_hash: str) -> bytes:
+        """Contenido con los campos dinámicos de un documento"""
+        shown_hash = document_hash
+        if len(document_hash) > self.hash_chars:
+            shown_hash = document_hash[:max(self.hash_chars - 1, 8)] + "…"
+        return (self.content
+                .replace(_DATE_MARK, _pdf_text(f"Fecha: {date}"))
+                .replace(_HASH_MARK, _pdf_text(f"SHA-256: {shown_hash}")))
+
+    def add_to(self, doc: fitz.Document, date: str, document_hash: str) -> int:
+        """
+        Crea en doc el XObject de formulario de la apariencia
+
+        Args:
+            doc: Documento de destino
+            date: Fecha de la firma ya formateada
+            document_hash: Hash del documento a mostrar
+
+        Returns:
+            int: xref del XObject (para /AP /N)
+        """
+        images = []
+        for image in self.images:
+            images.append((image["name"], _copy_object(doc, image)))
+
+        fonts = []
+        for name, base_font in (("F1", "Helvetica"), ("F2", "Helvetica-Bold")):
+            xref = doc.get_new_xref()
+            doc.update_object(xref, f"<< /Type /Font /Subtype /Type1 /BaseFont /{base_font} "
+                                    "/Encoding /WinAnsiEncoding >>")
+            fonts.append((name, xref))
+
+        resources = "/Font << " + " ".join(f"/{name} {xref} 0 R" for name, xref in fonts) + " >>"
+        if images:
+            resources += " /XObject << " + " ".join(f"/{name} {xref} 0 R" for name, xref in images) + " >>"
+        form_xref = doc.get_new_xref()
+        doc.update_object(form_xref, f"<< /Type /XObject /Subtype /Form /BBox [0 0 {self.width:g} "
+                                     f"{self.height:g}] /Resources << {resources} >> >>")
+        doc.update_stream(form_xref, self.render(date, document_hash), new=True)
+        return form_xref
+
+
+def _copy_object(doc: fitz.Document, entry: Dict[str, Any]) -> int:
+    """Crea en doc un objeto compilado y, antes, los que referencia"""
+    references = {
+        index: _copy_object(doc, referenced) for index, referenced in enumerate(entry.get("objects", []))
+    }
+    xref = doc.get_new_xref()
+    definition = re.sub(r"\{ref:(\d+)\}", lambda match: f"{references[int(match.group(1))]} 0 R", entry["dict"])
+    if entry.get("stream") is not None:
+        # Los bytes ya van comprimidos: se escriben tal cual y después se
+        # restaura el diccionario con su /Filter
+        doc.update_object(xref, "<< >>")
+        doc.update_stream(xref, entry["stream"], new=True, compress=False)
+    doc.update_object(xref, definition)
+    return xref
+
+
+def _extract_references(doc: fitz.Document, definition: str, objects: List[Dict[str, Any]],
+                        visited: Tuple[int, ...] = ()) -> str:
+    """Sustituye las referencias de definition por {ref:n}, extrayendo sus objetos en objects"""
+    def reference(match):
+        objects.append(_extract_object(doc, int(match.group(1)), visited))
+        return f"{{ref:{len(objects) - 1}}}"
+
+    return re.sub(r"(\d+) 0 R", reference, definition)
+
+
+def _extract_object(doc: fitz.Document, xref: int, visited: Tuple[int, ...] = ()) -> Dict[str, Any]:
+    """Objeto de doc (y los que referencia) en el formato de CompiledAppearance"""
+    if xref in visited:
+        raise ValueError("Referencia circular en la imagen de la apariencia")
+    objects = []
+    definition = _extract_references(doc, doc.xref_object(xref, compressed=True), objects, visited + (xref,))
+    # /Length se recalcula al guardar
+    definition = re.sub(r"/Length \d+", "", definition)
+    stream = doc.xref_stream_raw(xref) if doc.xref_is_stream(xref) else None
+    return {"dict": definition, "stream": stream, "objects": objects}
+
+
+def _load_source(source: str) -> bytes:
+    """Bytes de una imagen local o remota (http(s):// o s3://, con la caché de /tmp)"""
+    if source.startswith(("http://", "https://", "s3://")):
+        from processor import PDFProcessor
+        return b"".join(PDFProcessor()._iter_remote_asset(source))
+    with open(source, "rb") as f:
+        return f.read()
+
+
+def _compile_image(source: str, name: str, box: fitz.Rect, height: float) -> Tuple[Dict[str, Any], bytes]:
+    """
+    Decodifica y comprime una imagen una vez
+
+    Returns:
+        Tuple: (imagen en formato de CompiledAppearance, operadores que la
+        dibujan ajustada a box conservando la proporción)
+    """
+    data = _load_source(source)
+    if is_vector_source(source):
+        return _compile_vector(data, name, box, height)
+    # Un documento temporal hace la conversión (transparencia en /SMask
+    # incluida) y guardarlo con deflate deja los flujos comprimidos
+    scratch = fitz.open()
+    page = scratch.new_page(width=box.width or 1, height=box.height or 1)
+    page.insert_image(page.rect, stream=data, keep_proportion=True)
+    compressed = fitz.open("pdf", scratch.tobytes(deflate=True))
+    scratch.close()
+    try:
+        xref, _, pixel_width, pixel_height = compressed[0].get_images(full=True)[0][:4]
+        entry = _extract_object(compressed, xref)
+    finally:
+        compressed.close()
+    entry["name"] = name
+
+    # Ajustar a box conservando la proporción, centrada
+    scale = min(box.width / pixel_width, box.height / pixel_height)
+    draw_width, draw_height = pixel_width * scale, pixel_height * scale
+    x = box.x0 + (box.width - draw_width) / 2
+    # Las cajas van en coordenadas con origen arriba; el contenido, abajo
+    y = height - box.y0 - (box.height + draw_height) / 2
+    drawing = f"q {draw_width:.2f} 0 0 {draw_height:.2f} {x:.2f} {y:.2f} cm /{name} Do Q\n".encode("ascii")
+    return entry, drawing
+
+
+def compile_form(source: fitz.Document, page_number: int = 0) -> Tuple[Dict[str, Any], fitz.Rect]:
+    """
+    XObject de formulario con el contenido y los recursos (ya extraídos) de
+    una página, en el formato de CompiledAppearance
+
+    Returns:
+        Tuple: (XObject para add_form, caja de la página en coordenadas PDF)
+    """
+    page = source[page_number]
+    # Caja de la página en coordenadas PDF (/CropBox o /MediaBox)
+    bbox = page.rect
+    for key in ("CropBox", "MediaBox"):
+        kind, value = source.xref_get_key(page.xref, key)
+        if kind == "array":
+            bbox = fitz.Rect([float(number) for number in value.strip("[]").split()])
+            break
+
+    objects: List[Dict[str, Any]] = []
+    kind, resources = source.xref_get_key(page.xref, "Resources")
+    if kind == "null":
+        resources = "<< >>"
+    resources = _extract_references(source, resources, objects)
+    entry = {
+        "dict": (f"<< /Type /XObject /Subtype /Form /BBox [{bbox.x0:g} {bbox.y0:g} {bbox.x1:g} {bbox.y1:g}] "
+                 f"/Resources {resources} /Filter /FlateDecode >>"),
+        "stream": zlib.compress(page.read_contents()),
+        "objects": objects
+    }
+    return entry, bbox
+
+
+def add_form(doc: fitz.Document, form: Dict[str, Any]) -> int:
+    """Crea en doc un XObject de compile_form (y los objetos que usa); devuelve su xref"""
+    return _copy_object(doc, form)
+
+
+def _compile_vector(data: bytes, name: str, box: fitz.Rect, height: float) -> Tuple[Dict[str, Any], bytes]:
+    """
+    XObject de formulario con la página de un SVG o PDF de una página
+    (convertida con la caché de vector.py), ajustado a box como las imágenes
+    """
+    entry, bbox = compile_form(get_vector_cache().get(data))
+    entry["name"] = name
+
+    scale = min(box.width / bbox.width, box.height / bbox.height)
+    draw_width, draw_height = bbox.width * scale, bbox.height * scale
+    x = box.x0 + (box.width - draw_width) / 2
+    y = height - box.y0 - (box.height + draw_height) / 2
+    drawing = (f"q {scale:.4f} 0 0 {scale:.4f} {x - bbox.x0 * scale:.2f} {y - bbox.y0 * scale:.2f} cm "
+               f"/{name} Do Q\n").encode("ascii")
+    return entry, drawing
+
+
+def _pdf_text(text: str) -> bytes:
+    """Cadena literal PDF en WinAnsi, con los caracteres no representables como '?'"""
+    encoded = text.encode("cp1252", errors="replace")
+    return b"(" + encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _wrap(text: str, fontname: str, font_size: float, width: float) -> List[str]:
+    """Parte text en líneas que caben en width"""
+    lines, current = [], ""
+    for word in text.split():
+        candidate = f"{current} {word}".strip()
+        if current and fitz.get_text_length(candidate, fontname=fontname, fontsize=font_size) > width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+    if current:
+        lines.append(current)
+    return lines
+
+
+def compile_appearance(certificate, options: Dict[str, Any]) -> CompiledAppearance:
+    """
+    Compone la apariencia de un firmante
+
+    Args:
+        certificate: cryptography.x509.Certificate del firmante
+        options: rect [x0, y0, x1, y1] (solo cuenta su tamaño), image
+            (rúbrica), seal (sello), name (por defecto el CN), reason,
+            font_size y show_hash (por defecto True)
+
+    Returns:
+        CompiledAppearance: Apariencia lista para add_to
+    """
+    from cryptography.x509.oid import NameOID
+
+    rect = fitz.Rect(options["rect"])
+    width, height = rect.width, rect.height
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Rectángulo de firma no válido: {options['rect']}")
+    font_size = float(options.get("font_size") or APPEARANCE_FONT_SIZE)
+    padding = 2.0
+
+    drawings, images = [], []
+    text_box = fitz.Rect(padding, padding, width - padding, height - padding)
+    if options.get("seal"):
+        # Sello cuadrado a la derecha
+        side = min(height - 2 * padding, width / 4)
+        entry, drawing = _compile_image(options["seal"], "Im2",
+                                        fitz.Rect(width - padding - side, padding, width - padding, padding + side),
+                                        height)
+        images.append(entry)
+        drawings.append(drawing)
+        text_box.x1 -= side + padding
+    if options.get("image"):
+        # Rúbrica en el 40 % izquierdo
+        image_box = fitz.Rect(padding, padding, padding + text_box.width * 0.4, height - padding)
+        entry, drawing = _compile_image(options["image"], "Im1", image_box, height)
+        images.append(entry)
+        drawings.append(drawing)
+        text_box.x0 = image_box.x1 + padding
+
+    common_names = certificate.subject.get_attributes_for_oid(NameOID.COMMON_NAME)
+    name = options.get("name") or (common_names[0].value if common_names else "")
+    lines: List[Tuple[str, Any]] = [("F2", line) for line in _wrap(name, "hebo", font_size, text_box.width)]
+    lines.append(("F1", "Firmado digitalmente"))
+    for line in _wrap(certificate.subject.rfc4514_string(), "helv", font_size, text_box.width):
+        lines.append(("F1", line))
+    if options.get("reason"):
+        for line in _wrap(f"Motivo: {options['reason']}", "helv", font_size, text_box.width):
+            lines.append(("F1", line))
+    lines.append(("F1", _DATE_MARK))
+    if options.get("show_hash", True):
+        lines.append(("F1", _HASH_MARK))
+
+    # Reducir la letra si las líneas no caben en el alto disponible
+    leading = font_size * 1.2
+    if leading * len(lines) > text_box.height:
+        leading = text_box.height / len(lines)
+        font_size = leading / 1.2
+
+    text = [f"BT {_TEXT_COLOR}\n".encode("ascii")]
+    baseline = height - text_box.y0 - font_size
+    text.append(f"{text_box.x0:.2f} {baseline:.2f} Td {leading:.2f} TL\n".encode("ascii"))
+    for index, (font, line) in enumerate(lines):
+        if line == _DATE_MARK:
+            literal = _DATE_MARK
+        elif line == _HASH_MARK:
+            literal = _HASH_MARK
+        else:
+            literal = _pdf_text(line)
+        text.append(f"/{font} {font_size:.2f} Tf ".encode("ascii") + literal
+                    + (b" Tj\n" if index == 0 else b" '\n"))
+    text.append(b"ET\n")
+    label_width = fitz.get_text_length("SHA-256: ", fontname="helv", fontsize=font_size)
+    digit_width = fitz.get_text_length("0", fontname="helv", fontsize=font_size)
+    hash_chars = int((text_box.width - label_width) // digit_width)
+    return CompiledAppearance(width, height, b"".join(drawings) + b"".join(text), images, hash_chars)
+
+
+class AppearanceCache:
+    """Apariencias compiladas por huella del firmante y opciones (LRU)"""
+
+    def __init__(self, max_entries: int = APPEARANCE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], CompiledAppearance]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, certificate, options: Dict[str, Any]) -> CompiledAppearance:
+        """Apariencia del firmante con options, compilándola solo la primera vez"""
+        from cryptography.hazmat.primitives import hashes
+
+        rect = fitz.Rect(options["rect"])
+        content_options = {key: value for key, value in options.items() if key not in _PLACEMENT_OPTIONS}
+        content_options["size"] = [round(rect.width, 2), round(rect.height, 2)]
+        key = (certificate.fingerprint(hashes.SHA256()).hex(),
+               json.dumps(content_options, sort_keys=True, default=str))
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return compiled
+            self.stats["misses"] += 1
+
+        compiled = compile_appearance(certificate, options)
+        with self._lock:
+            self._entries[key] = compiled
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        print(f"🖋️ Apariencia de firma compilada ({compiled.width:g}x{compiled.height:g} pt)")
+        return compiled
+
+    def clear(self):
+        """Vacía la caché"""
+        with self._lock:
+            self._entries.clear()
+
+
+_appearance_cache = AppearanceCache()
+
+
+def get_appearance_cache() -> AppearanceCache:
+    """Caché de apariencias compartida por todo el proceso"""
+    return _appearance_cache
@@ -0,0 +1,326 @@
+"""
+Asset Cache Module
+Caché persistente en /tmp de imágenes y PDFs remotos (http(s):// y s3://)
+
+En Lambda, /tmp sobrevive entre invocaciones del mismo contenedor, así que
+las imágenes de firma y las plantillas se descargan una vez por contenedor.
+Cada entrada se revalida con una petición condicional (ETag /
+If-None-Match y Last-Modified / If-Modified-Since) pasado
+PDF_CACHE_TTL_SECONDS, y las entradas menos usadas se eliminan cuando la
+caché supera PDF_CACHE_MAX_BYTES.
+
+Cada entrada son dos archivos en el directorio de la caché:
+    {sha256(source)}.bin    contenido
+    {sha256(source)}.json   source, ETag, Last-Modified y fecha de validación
+Se escriben con renombrado atómico, de modo que varios procesos (por
+ejemplo los hijos de batch.py) pueden compartir la caché.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+
+
+CACHE_ENABLED = os.environ.get("PDF_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+CACHE_DIR = os.environ.get("PDF_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "pdf-asset-cache")
+# /tmp en Lambda es de 512 MB por defecto: dejar espacio para el trabajo
+CACHE_MAX_BYTES = int(os.environ.get("PDF_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+# Objetos más grandes no se guardan (se descargan a un temporal)
+CACHE_MAX_ENTRY_BYTES = int(os.environ.get("PDF_CACHE_MAX_ENTRY_BYTES", 64 * 1024 * 1024))
+# Dentro de este plazo una entrada se usa sin revalidar
+CACHE_TTL_SECONDS = int(os.environ.get("PDF_CACHE_TTL_SECONDS", 60))
+
+CACHE_CHUNK_SIZE = 1024 * 1024
+
+
+def _is_unreachable(error: Exception) -> bool:
+    """True si el origen no respondió (conexión o plazo), no si rechazó la petición"""
+    import requests
+
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    try:
+        from botocore.exceptions import ConnectTimeoutError, EndpointConnectionError, ReadTimeoutError
+    except ImportError:
+        return False
+    return isinstance(error, (EndpointConnectionError, ConnectTimeoutError, ReadTimeoutError))
+
+
+def _is_client_error(error: Exception) -> bool:
+    """True si el origen respondió que el objeto no existe o no es accesible (4xx)"""
+    import requests
+
+    if isinstance(error, FileNotFoundError):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return 400 <= error.response.status_code < 500
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        # botocore ClientError (NoSuchKey, AccessDenied, 403...)
+        status = response.get("ResponseMetadata", {}).get("HTTPStatusCode") or 0
+        code = response.get("Error", {}).get("Code", "")
+        return 400 <= status < 500 or code in ("NoSuchKey", "NotFound", "AccessDenied", "403", "404")
+    return False
+
+
+class AssetCache:
+    """Caché LRU en disco de objetos remotos, validada con peticiones condicionales"""
+
+    def __init__(self, root: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES,
+                 max_entry_bytes: int = CACHE_MAX_ENTRY_BYTES, ttl_seconds: int = CACHE_TTL_SECONDS):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Reinicia los contadores (al empezar cada invocación)"""
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "bytes_downloaded": 0}
+
+    def _paths(self, source: str) -> Tuple[str, str]:
+        digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        base = os.path.join(self.root, digest)
+        return base + ".bin", base + ".json"
+
+    def _read_meta(self, meta_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(meta_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, meta_path: str, meta: Dict[str, Any]):
+        fd, temp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(meta, f)
+        os.replace(temp_path, meta_path)
+
+    def fetch(self, source: str) -> Tuple[str, bool]:
+        """
+        Devuelve una ruta local con el contenido de source
+
+        Args:
+            source: URL http(s):// o URI s3://
+
+        Returns:
+            Tuple[str, bool]: (ruta, cacheado). Si cacheado es False el
+            objeto era demasiado grande para la caché y la ruta es un
+            temporal que el llamador debe borrar
+        """
+        data_path, meta_path = self._paths(source)
+        meta = self._read_meta(meta_path)
+        if meta is not None and not os.path.exists(data_path):
+            meta = None
+
+        if meta is not None and time.time() - meta.get("validated_at", 0) < self.ttl_seconds:
+            return self._hit(data_path, "hits")
+
+        try:
+            opened = self._open_source(source, meta)
+        except Exception as e:
+            if meta is None:
+                raise
+            if _is_unreachable(e):
+                # Sin conexión con el origen se sirve la copia anterior
+                print(f"⚠️ No se pudo revalidar {source}, se usa la copia en caché: {e}")
+                return self._hit(data_path, "hits")
+            if _is_client_error(e):
+                # Borrado o revocado en el origen: la copia no debe seguir usándose
+                self._remove(data_path, meta_path)
+                print(f"🗑️ {source} ya no está disponible en el origen, eliminado de la caché: {e}")
+            raise
+
+        if opened is None:
+            meta["validated_at"] = time.time()
+            self._write_meta(meta_path, meta)
+            return self._hit(data_path, "revalidated")
+
+        return self._store(source, opened, data_path, meta_path)
+
+    def _remove(self, data_path: str, meta_path: str):
+        """Elimina una entrada (sin error si otro proceso ya lo hizo)"""
+        for path in (meta_path, data_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _hit(self, data_path: str, counter: str) -> Tuple[str, bool]:
+        with self._lock:
+            self.stats[counter] += 1
+        # La fecha de modificación sirve de orden LRU
+        os.utime(data_path)
+        return data_path, True
+
+    def _open_source(self, source: str, meta: Optional[Dict[str, Any]]):
+        """
+        Abre la descarga, condicional si hay una copia en caché
+
+        Returns:
+            None si el objeto no cambió (304); si no, (bloques, ETag,
+            Last-Modified)
+        """
+        etag = meta.get("etag") if meta else None
+        last_modified = meta.get("last_modified") if meta else None
+
+        if source.startswith("s3://"):
+            from botocore.exceptions import ClientError
+            from storage import S3Storage, parse_s3_uri
+
+            bucket, key = parse_s3_uri(source)
+            storage = S3Storage(bucket)
+            params = {"Bucket": bucket, "Key": key}
+            if etag:
+                params["IfNoneMatch"] = etag
+            try:
+                head = storage.client.head_object(**params)
+            except ClientError as e:
+                code = e.response.get("Error", {}).get("Code")
+                if code in ("304", "NotModified"):
+                    return None
+                if code in ("404", "NoSuchKey", "NotFound"):
+                    raise FileNotFoundError(f"El objeto no existe: {source}")
+                raise
+            # La descarga usa GETs por rangos en paralelo si el objeto es grande;
+            # en S3 basta con el ETag para revalidar
+            return storage.iter_chunks(key, CACHE_CHUNK_SIZE), head.get("ETag"), None
+
+        import requests
+
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        response = requests.get(source, headers=headers, stream=True, timeout=30)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        return (response.iter_content(chunk_size=CACHE_CHUNK_SIZE),
+                response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+    def _store(self, source: str, opened, data_path: str, meta_path: str) -> Tuple[str, bool]:
+        """Descarga el objeto a la caché (o a un temporal si es demasiado grande)"""
+        chunks, etag, last_modified = opened
+        fd, temp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    size += len(chunk)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+        with self._lock:
+            self.stats["misses"] += 1
+            self.stats["bytes_downloaded"] += size
+
+        if size > self.max_entry_bytes:
+            fd, uncached_path = tempfile.mkstemp(suffix=".bin")
+            os.close(fd)
+            shutil.move(temp_path, uncached_path)
+            return uncached_path, False
+
+        self._evict(size)
+        os.replace(temp_path, data_path)
+        self._write_meta(meta_path, {
+            "source": source,
+            "size": size,
+            "etag": etag,
+            "last_modified": last_modified,
+            "validated_at": time.time()
+        })
+        return data_path, True
+
+    def _entries(self):
+        """Entradas de la caché como (ruta, tamaño, fecha de último uso)"""
+        entries = []
+        for name in os.listdir(self.root):
+            if not name.endswith(".bin"):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self, incoming: int):
+        """Elimina las entradas menos usadas hasta que quepan incoming bytes"""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        free = shutil.disk_usage(self.root).free
+        while entries and (total + incoming > self.max_bytes or free < incoming):
+            path, size, _ = entries.pop(0)
+            for entry_path in (path, path[:-len(".bin")] + ".json"):
+                try:
+                    os.remove(entry_path)
+                except FileNotFoundError:
+                    pass
+            total -= size
+            free += size
+
+    def size(self) -> Tuple[int, int]:
+        """(número de entradas, bytes ocupados)"""
+        entries = self._entries()
+        return len(entries), sum(size for _, size, _ in entries)
+
+    def log_stats(self, label: str = "invocación"):
+        """Imprime la tasa de aciertos acumulada desde reset_stats()"""
+        hits = self.stats["hits"] + self.stats["revalidated"]
+        total = hits + self.stats["misses"]
+        if total == 0:
+            return
+        count, used = self.size()
+        print(
+            f"📦 Caché /tmp ({label}): {self.stats['hits']} aciertos, "
+            f"{self.stats['revalidated']} revalidados, {self.stats['misses']} descargas "
+            f"({hits / total:.0%} aciertos, {self.stats['bytes_downloaded'] / (1024 * 1024):.1f} MB descargados); "
+            f"{count} entradas, {used / (1024 * 1024):.1f} MB"
+        )
+
+
+_asset_cache = None
+_asset_cache_lock = threading.Lock()
+
+
+def get_asset_cache() -> Optional[AssetCache]:
+    """
+    Devuelve la caché del contenedor, o None si PDF_CACHE_ENABLED=0
+
+    Returns:
+        Optional[AssetCache]: Instancia compartida de la caché
+    """
+    global _asset_cache
+    if not CACHE_ENABLED:
+        return None
+    if _asset_cache is None:
+        with _asset_cache_lock:
+            if _asset_cache is None:
+                _asset_cache = AssetCache()
+    return _asset_cache
+
+
+@contextmanager
+def invocation_stats(label: str = "invocación"):
+    """Reinicia los contadores de la caché y registra la tasa de aciertos al salir"""
+    cache = get_asset_cache()
+    if cache is not None:
+        cache.reset_stats()
+    try:
+        yield cache
+    finally:
+        if cache is not None:
+            cache.log_stats(label)
@@ -0,0 +1,284 @@
+"""
+Batch Module
+Procesamiento por lotes de eventos SQS y S3 dentro de una misma invocación
+
+Cada registro se procesa en un proceso hijo (PyMuPDF no es thread-safe), con
+tantos procesos simultáneos como permitan las CPUs y la memoria de la
+función. Las imágenes remotas se descargan una sola vez por lote y los
+hijos las heredan. Se usan Process y Pipe en lugar de Pool o Queue porque
+Lambda no dispone de /dev/shm.
+
+Formatos de registro aceptados:
+    - S3 (eventSource "aws:s3"): PDF subido en uploads/, ver jobs.py
+    - SQS con una notificación de S3 en el body
+    - SQS con un trabajo directo en el body:
+        {"pdf_path": "s3://bucket/in.pdf", "output_key": "restamped/in.pdf",
+         "insertions": [...], "save_profile": "fast"}
+
+Si alguna tarea pide "sign", el firmante se carga antes de crear los hijos
+para que lo hereden con la clave ya cargada.
+"""
+
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from collections import deque
+from multiprocessing.connection import wait
+from typing import Any, Dict, List, Tuple
+from urllib.parse import unquote_plus
+
+from asset_cache import get_asset_cache
+from jobs import load_job, job_id_from_upload_key, run_job, storage_for_bucket, UPLOAD_PREFIX
+from processor import DEADLINE_MARGIN_SECONDS
+from storage import get_storage
+
+
+# Memoria estimada por proceso hijo; limita los procesos simultáneos
+BATCH_WORKER_MEMORY_MB = int(os.environ.get("PDF_BATCH_WORKER_MEMORY_MB", 512))
+BATCH_MAX_WORKERS = int(os.environ.get("PDF_BATCH_MAX_WORKERS", 0))
+
+# Margen antes del timeout de la función para devolver los fallos
+BATCH_DEADLINE_MARGIN_MS = int(os.environ.get("PDF_BATCH_DEADLINE_MARGIN_MS", 5000))
+
+_PROCESS_OPTIONS = ("incremental", "save_profile", "large_document", "sign")
+
+
+def batch_worker_count(pending: int) -> int:
+    """
+    Número de procesos simultáneos para un lote
+
+    Args:
+        pending: Número de tareas del lote
+
+    Returns:
+        int: Mínimo entre tareas, CPUs, memoria de la función /
+        PDF_BATCH_WORKER_MEMORY_MB y PDF_BATCH_MAX_WORKERS (si se definió)
+    """
+    limits = [pending, os.cpu_count() or 1]
+    function_memory_mb = int(os.environ.get("AWS_LAMBDA_FUNCTION_MEMORY_SIZE", 0))
+    if function_memory_mb:
+        limits.append(function_memory_mb // BATCH_WORKER_MEMORY_MB)
+    if BATCH_MAX_WORKERS:
+        limits.append(BATCH_MAX_WORKERS)
+    return max(1, min(limits))
+
+
+def parse_records(event: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Convierte los registros del evento en tareas
+
+    Args:
+        event: Evento de SQS o de S3
+
+    Returns:
+        Tuple: (tareas, identificadores de registros inválidos). Cada tarea
+        lleva "item_id" (messageId en SQS, clave en S3) para reportar fallos
+    """
+    tasks, invalid = [], []
+    for record in event.get("Records", []):
+        source = record.get("eventSource")
+        if source == "aws:s3":
+            tasks.extend(_s3_tasks([record], record["s3"]["object"]["key"]))
+        elif source == "aws:sqs":
+            item_id = record["messageId"]
+            try:
+                body = json.loads(record["body"])
+                if "Records" in body:
+                    tasks.extend(_s3_tasks(body["Records"], item_id))
+                else:
+                    if not body.get("pdf_path") or not body.get("output_key"):
+                        raise ValueError("El mensaje requiere pdf_path y output_key")
+                    tasks.append({"item_id": item_id, "kind": "direct", "spec": body})
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"❌ Mensaje inválido {item_id}: {e}")
+                invalid.append(item_id)
+    return tasks, invalid
+
+
+def _s3_tasks(records: List[Dict[str, Any]], item_id: str) -> List[Dict[str, Any]]:
+    tasks = []
+    for record in records:
+        if "s3" not in record:
+            continue
+        key = unquote_plus(record["s3"]["object"]["key"])
+        if not key.startswith(UPLOAD_PREFIX):
+            print(f"⏭️ Objeto ignorado (fuera de {UPLOAD_PREFIX}): {key}")
+            continue
+        tasks.append({
+            "item_id": item_id,
+            "kind": "upload",
+            "bucket": record["s3"]["bucket"]["name"],
+            "key": key
+        })
+    return tasks
+
+
+def _task_instructions(task: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Inserciones y opciones de una tarea (las de un trabajo se leen de su JSON)"""
+    if task["kind"] == "direct":
+        return task["spec"].get("insertions", []), task["spec"]
+    try:
+        storage = storage_for_bucket(task["bucket"])
+        job = load_job(storage, job_id_from_upload_key(task["key"]))
+        return job["insertions"], job.get("options", {})
+    except Exception:
+        # El error se reportará al procesar la tarea
+        return [], {}
+
+
+def _execute(processor, task: Dict[str, Any], deadline: float = None) -> Dict[str, Any]:
+    """
+    Procesa una tarea (se ejecuta en el proceso hijo). Si se agota el plazo,
+    los trabajos de subida guardan un checkpoint y el reintento de SQS los
+    reanuda; los trabajos directos empiezan de nuevo
+    """
+    if task["kind"] == "upload":
+        job = run_job(storage_for_bucket(task["bucket"]), processor, task["key"], deadline)
+        return {"output_key": job["output_key"], "size": job.get("size"), "sha256": job.get("sha256"),
+                "input_sha256": job.get("input_sha256")}
+
+    spec = task["spec"]
+    storage = get_storage("s3")
+    with storage.open_write(spec["output_key"]) as writer:
+        processor.process_pdf({
+            "pdf_path": spec["pdf_path"],
+            "insertions": spec.get("insertions", []),
+            "output_stream": writer,
+            "deadline": deadline,
+            **{option: spec[option] for option in _PROCESS_OPTIONS if option in spec}
+        })
+    return {"output_key": spec["output_key"], "size": writer.size, "sha256": writer.sha256,
+            "input_sha256": processor.fingerprints["input_sha256"]}
+
+
+def _worker(processor, task: Dict[str, Any], connection, deadline: float = None):
+    """
+    Punto de entrada del proceso hijo: envía (ok, resultado o error,
+    contadores de la caché de /tmp)
+    """
+    # El límite de memoria de cada hijo es su parte de la función
+    processor.memory_limit_mb = BATCH_WORKER_MEMORY_MB
+    cache = get_asset_cache()
+    if cache is not None:
+        cache.reset_stats()
+    try:
+        outcome = (True, _execute(processor, task, deadline))
+    except Exception as e:
+        outcome = (False, str(e))
+    try:
+        connection.send((*outcome, cache.stats if cache is not None else None))
+    finally:
+        connection.close()
+
+
+def run_batch(event: Dict[str, Any], context, processor) -> Dict[str, Any]:
+    """
+    Procesa todos los registros de un evento en procesos concurrentes
+
+    Args:
+        event: Evento de SQS o S3 con uno o más registros
+        context: Contexto de Lambda (para el tiempo restante; puede ser None)
+        processor: PDFProcessor que heredan los procesos hijos
+
+    Returns:
+        Dict[str, Any]: {"batchItemFailures": [{"itemIdentifier": ...}]},
+        el formato de respuesta parcial de SQS: solo se reintentan los
+        mensajes fallidos
+    """
+    start = time.perf_counter()
+    tasks, failed = parse_records(event)
+    deadline = None
+    if context is not None and hasattr(context, "get_remaining_time_in_millis"):
+        remaining_ms = context.get_remaining_time_in_millis() - BATCH_DEADLINE_MARGIN_MS
+        deadline = time.monotonic() + max(remaining_ms, 0) / 1000
+    # Los hijos paran antes para guardar su checkpoint sin que se les corte
+    task_deadline = None if deadline is None else deadline - DEADLINE_MARGIN_SECONDS
+
+    workers = batch_worker_count(len(tasks))
+    print(f"📦 Lote: {len(tasks)} tareas, {workers} procesos simultáneos")
+
+    with tempfile.TemporaryDirectory() as asset_dir:
+        try:
+            # Descargar una sola vez las imágenes compartidas por el lote
+            instructions = [_task_instructions(task) for task in tasks]
+            sources = [
+                insertion.get("source")
+                for insertions, _ in instructions
+                for insertion in insertions
+                if insertion.get("type") == "image"
+            ]
+            try:
+                processor.prefetch_assets(sources, asset_dir)
+            except Exception as e:
+                # Cada tarea volverá a intentar la descarga por su cuenta
+                print(f"⚠️ No se pudieron descargar las imágenes del lote: {e}")
+
+            if any(options.get("sign") for _, options in instructions):
+                from signing import get_signer
+                try:
+                    get_signer()
+                except Exception as e:
+                    # Cada tarea fallará con el mismo error al firmar
+                    print(f"⚠️ No se pudo cargar el firmante: {e}")
+
+            # fork: los hijos heredan el procesador, las imágenes ya descargadas
+            # y el firmante
+            mp_context = multiprocessing.get_context("fork")
+            queue = deque(tasks)
+            running = {}
+            succeeded = 0
+
+            while queue or running:
+                while queue and len(running) < workers:
+                    task = queue.popleft()
+                    parent_conn, child_conn = mp_context.Pipe(duplex=False)
+                    process = mp_context.Process(target=_worker, args=(processor, task, child_conn, task_deadline))
+                    process.start()
+                    child_conn.close()
+                    running[parent_conn] = (process, task)
+
+                timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+                ready = wait(list(running), timeout=timeout)
+                if not ready:
+                    print(f"⏰ Tiempo agotado: {len(running) + len(queue)} tareas sin terminar")
+                    for connection, (process, task) in running.items():
+                        process.terminate()
+                        process.join()
+                        connection.close()
+                        failed.append(task["item_id"])
+                    failed.extend(task["item_id"] for task in queue)
+                    break
+
+                for connection in ready:
+                    process, task = running.pop(connection)
+                    try:
+                        ok, result, cache_stats = connection.recv()
+                    except EOFError:
+                        ok, result, cache_stats = False, f"el proceso terminó con código {process.exitcode}", None
+                    connection.close()
+                    process.join()
+
+                    # Sumar los aciertos de caché del hijo a los de la invocación
+                    cache = get_asset_cache()
+                    if cache is not None and cache_stats:
+                        for counter, value in cache_stats.items():
+                            cache.stats[counter] += value
+
+                    if ok:
+                        succeeded += 1
+                        print(f"✅ {task['item_id']}: {result['output_key']}")
+                    else:
+                        print(f"❌ {task['item_id']}: {result}")
+                        failed.append(task["item_id"])
+        finally:
+            # Las descargas desaparecen con asset_dir: que la próxima invocación
+            # del contenedor no las dé por buenas
+            processor.forget_assets(asset_dir)
+
+    # Un mensaje falla si falla cualquiera de sus tareas
+    failed_ids = list(dict.fromkeys(failed))
+    elapsed = time.perf_counter() - start
+    print(f"📊 Lote terminado en {elapsed:.1f}s: {succeeded} correctas, {len(failed_ids)} registros fallidos")
+    return {"batchItemFailures": [{"itemIdentifier": item_id} for item_id in failed_ids]}
@@ -0,0 +1,338 @@
+"""
+Fan-out Module
+Procesamiento en paralelo de documentos muy grandes por rangos de páginas
+
+El documento se divide en rangos contiguos y cada rango se procesa en un
+proceso hijo (PDF_FANOUT_MODE=local) o en otra invocación de Lambda
+(PDF_FANOUT_MODE=lambda), aplicando solo las inserciones de sus páginas.
+Los resultados se reensamblan sobre el documento original trasplantando a
+cada página su /Contents y /Resources nuevos: los objetos de página no
+cambian, así que el esquema (outlines), los enlaces, las anotaciones, los
+campos de formulario y los metadatos se conservan tal cual.
+
+En modo lambda cada rango se procesa con main.fanout_handler en la función
+PDF_FANOUT_FUNCTION (la misma imagen con ese handler), y la entrada y las
+partes pasan por el almacenamiento bajo fanout/{run_id}/.
+"""
+
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import wait
+from typing import Any, Dict, List, Tuple
+
+import fitz  # PyMuPDF
+
+
+# Por debajo de este número de páginas dividir no compensa
+FANOUT_MIN_PAGES = int(os.environ.get("PDF_FANOUT_MIN_PAGES", 200))
+FANOUT_MAX_WORKERS = int(os.environ.get("PDF_FANOUT_MAX_WORKERS", 0))
+FANOUT_MODE = os.environ.get("PDF_FANOUT_MODE", "local")
+FANOUT_FUNCTION = os.environ.get("PDF_FANOUT_FUNCTION") or os.environ.get("AWS_LAMBDA_FUNCTION_NAME")
+FANOUT_PREFIX = "fanout/"
+
+
+def split_ranges(total_pages: int, parts: int) -> List[Tuple[int, int]]:
+    """
+    Divide el documento en rangos contiguos de tamaño similar
+
+    Args:
+        total_pages: Páginas del documento
+        parts: Número de rangos deseado
+
+    Returns:
+        List[Tuple[int, int]]: Rangos [inicio, fin) 0-indexados, sin vacíos
+    """
+    parts = max(1, min(parts, total_pages))
+    size, extra = divmod(total_pages, parts)
+    ranges, start = [], 0
+    for index in range(parts):
+        end = start + size + (1 if index < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def fanout_worker_count(requested: int) -> int:
+    """
+    Rangos en los que dividir un documento
+
+    Args:
+        requested: Trabajadores pedidos por la petición
+
+    Returns:
+        int: En modo local, limitado por CPUs y memoria como en batch.py;
+        siempre limitado por PDF_FANOUT_MAX_WORKERS si se definió
+    """
+    limits = [requested]
+    if FANOUT_MODE == "local":
+        from batch import batch_worker_count
+        limits.append(batch_worker_count(requested))
+    if FANOUT_MAX_WORKERS:
+        limits.append(FANOUT_MAX_WORKERS)
+    return max(1, min(limits))
+
+
+def apply_insertions_parallel(processor, source: Dict[str, Any], insertions: List[Dict[str, Any]],
+                              workers: int, options: Dict[str, Any] = None, deadline: float = None,
+                              source_uri: str = None) -> bool:
+    """
+    Aplica las inserciones a processor.doc procesando rangos de páginas en
+    paralelo y reensamblando el resultado sobre el propio processor.doc
+
+    Args:
+        processor: PDFProcessor con el documento original abierto en doc
+        source: {"pdf_stream": bytes} o {"pdf_path": ruta local} del original
+        insertions: Inserciones a aplicar
+        workers: Trabajadores pedidos
+        options: Opciones de process_pdf para cada rango (large_document)
+        deadline: Instante de time.monotonic() que cada rango respeta
+        source_uri: URI s3:// del original, si lo hay (evita subirlo de
+            nuevo en modo lambda)
+
+    Returns:
+        bool: False si el documento es demasiado pequeño para dividirlo (no
+        se aplicó nada y hay que procesarlo en serie)
+
+    Raises:
+        DeadlineExceeded: Si algún rango agotó el plazo. Los rangos
+            terminados seguidos desde el principio quedan reensamblados en
+            processor.doc y pages_done es la página siguiente al último,
+            así que process_pdf guarda un checkpoint reanudable como en serie
+    """
+    total_pages = len(processor.doc)
+    workers = fanout_worker_count(workers)
+    if workers < 2 or total_pages < FANOUT_MIN_PAGES:
+        return False
+
+    ranges = split_ranges(total_pages, workers)
+    start = time.perf_counter()
+    print(f"🔀 Fan-out: {total_pages} páginas en {len(ranges)} rangos ({FANOUT_MODE})")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if FANOUT_MODE == "lambda":
+            parts = _run_ranges_lambda(source, source_uri, insertions, options or {}, ranges, deadline, temp_dir)
+        else:
+            parts = _run_ranges_local(processor, source, insertions, options or {}, ranges, deadline, temp_dir)
+        processed = time.perf_counter()
+
+        pages_done = 0
+        for page_range, part_path in zip(ranges, parts):
+            if part_path is None:
+                break
+            merge_range(processor.doc, part_path, page_range)
+            pages_done = page_range[1]
+
+    if pages_done < total_pages:
+        from processor import DeadlineExceeded
+        print(f"⏰ Fan-out: plazo agotado; reensambladas las primeras {pages_done} páginas")
+        raise DeadlineExceeded(pages_done, total_pages)
+
+    print(f"✅ Fan-out terminado: rangos {processed - start:.2f}s, "
+          f"reensamblado {time.perf_counter() - processed:.2f}s")
+    return True
+
+
+def merge_range(doc: fitz.Document, part_path: str, page_range: Tuple[int, int]):
+    """
+    Copia en doc el contenido de las páginas de un rango procesado
+
+    Las páginas del rango se añaden temporalmente al final de doc para que
+    PyMuPDF copie sus objetos; después las páginas originales pasan a usar
+    su /Contents y /Resources y las copias se eliminan
+
+    Args:
+        doc: Documento original
+        part_path: PDF completo en el que se procesó el rango
+        page_range: Rango [inicio, fin) procesado
+    """
+    start, end = page_range
+    part = fitz.open(part_path)
+    try:
+        appended_at = len(doc)
+        doc.insert_pdf(part, from_page=start, to_page=end - 1, links=False, annots=False)
+    finally:
+        part.close()
+
+    for offset, page_num in enumerate(range(start, end)):
+        copy_xref = doc.page_xref(appended_at + offset)
+        page_xref = doc.page_xref(page_num)
+        for key in ("Contents", "Resources"):
+            kind, value = doc.xref_get_key(copy_xref, key)
+            if kind != "null":
+                doc.xref_set_key(page_xref, key, value)
+    doc.delete_pages(appended_at, len(doc) - 1)
+
+
+def _range_data(source: Dict[str, Any], insertions: List[Dict[str, Any]], options: Dict[str, Any],
+                page_range: Tuple[int, int], deadline: float) -> Dict[str, Any]:
+    """Datos de process_pdf para un rango (sin salida)"""
+    return {
+        **source,
+        **options,
+        "insertions": insertions,
+        "page_range": list(page_range),
+        "deadline": deadline,
+        # Las partes se guardan rápido: el perfil se aplica al reensamblar
+        "save_profile": "fast",
+        "incremental": False,
+        "parallel_workers": 0
+    }
+
+
+def _range_worker(processor, pdf_data: Dict[str, Any], connection):
+    """Punto de entrada del proceso hijo: envía (ok, error, plazo agotado)"""
+    from batch import BATCH_WORKER_MEMORY_MB
+    from processor import DeadlineExceeded
+
+    processor.memory_limit_mb = BATCH_WORKER_MEMORY_MB
+    try:
+        processor.process_pdf(pdf_data)
+        outcome = (True, None, False)
+    except DeadlineExceeded as e:
+        outcome = (False, str(e), True)
+    except Exception as e:
+        outcome = (False, str(e), False)
+    try:
+        connection.send(outcome)
+    finally:
+        connection.close()
+
+
+def _run_ranges_local(processor, source, insertions, options, ranges, deadline, temp_dir) -> List[str]:
+    """
+    Procesa cada rango en un proceso hijo; devuelve las rutas de las partes
+    (None en los rangos que agotaron el plazo)
+    """
+    mp_context = multiprocessing.get_context("fork")
+    parts, running = [], {}
+    for index, page_range in enumerate(ranges):
+        part_path = os.path.join(temp_dir, f"part-{index}.pdf")
+        parts.append(part_path)
+        pdf_data = {**_range_data(source, insertions, options, page_range, deadline), "output_path": part_path}
+        parent_conn, child_conn = mp_context.Pipe(duplex=False)
+        process = mp_context.Process(target=_range_worker, args=(processor, pdf_data, child_conn))
+        process.start()
+        child_conn.close()
+        running[parent_conn] = (process, index)
+
+    errors = []
+    while running:
+        for connection in wait(list(running)):
+            process, index = running.pop(connection)
+            start, end = ranges[index]
+            try:
+                ok, error, timed_out = connection.recv()
+            except EOFError:
+                ok, error, timed_out = False, f"el proceso terminó con código {process.exitcode}", False
+            connection.close()
+            process.join()
+            if timed_out:
+                parts[index] = None
+            elif not ok:
+                errors.append(f"páginas {start + 1}-{end}: {error}")
+
+    if errors:
+        raise Exception(f"Error en el procesamiento por rangos: {'; '.join(errors)}")
+    return parts
+
+
+def _run_ranges_lambda(source, source_uri, insertions, options, ranges, deadline, temp_dir) -> List[str]:
+    """
+    Procesa cada rango en una invocación de PDF_FANOUT_FUNCTION (None en los
+    rangos que agotaron el plazo)
+    """
+    import boto3
+    from storage import S3Storage, get_storage
+
+    if not FANOUT_FUNCTION:
+        raise ValueError("PDF_FANOUT_MODE=lambda requiere PDF_FANOUT_FUNCTION")
+    storage = get_storage("s3")
+    if not isinstance(storage, S3Storage):
+        raise ValueError("PDF_FANOUT_MODE=lambda requiere el backend de almacenamiento s3")
+
+    run_prefix = f"{FANOUT_PREFIX}{uuid.uuid4().hex}/"
+    written = []
+    try:
+        if source_uri is None:
+            input_key = f"{run_prefix}input.pdf"
+            with storage.open_write(input_key) as writer:
+                if source.get("pdf_stream") is not None:
+                    writer.write(source["pdf_stream"])
+                else:
+                    with open(source["pdf_path"], "rb") as f:
+                        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                            writer.write(chunk)
+            written.append(input_key)
+            source_uri = f"s3://{storage.bucket}/{input_key}"
+
+        # El plazo es local a este proceso: a cada rango se le pasa el
+        # tiempo restante
+        remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+        client = boto3.client("lambda")
+
+        def invoke(index):
+            output_key = f"{run_prefix}part-{index}.pdf"
+            written.append(output_key)
+            payload = {
+                **_range_data({"pdf_path": source_uri}, insertions, options, ranges[index], None),
+                "output_key": output_key,
+                "remaining_seconds": remaining
+            }
+            response = client.invoke(FunctionName=FANOUT_FUNCTION, Payload=json.dumps(payload).encode("utf-8"))
+            result = json.loads(response["Payload"].read() or b"null")
+            if not response.get("FunctionError") and result and result.get("deadline_exceeded"):
+                return None
+            if response.get("FunctionError") or not result or not result.get("success"):
+                start, end = ranges[index]
+                raise Exception(f"páginas {start + 1}-{end}: {result}")
+            part_path = os.path.join(temp_dir, f"part-{index}.pdf")
+            with open(part_path, "wb") as f:
+                for chunk in storage.iter_chunks(output_key):
+                    f.write(chunk)
+            return part_path
+
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            return list(executor.map(invoke, range(len(ranges))))
+    finally:
+        for key in written:
+            try:
+                storage.delete(key)
+            except Exception as e:
+                print(f"⚠️ No se pudo borrar {key}: {e}")
+
+
+def run_range_event(event: Dict[str, Any], processor) -> Dict[str, Any]:
+    """
+    Procesa un rango recibido en una invocación (ver fanout_handler)
+
+    Args:
+        event: Datos de process_pdf del rango más "output_key" y
+            "remaining_seconds"
+        processor: PDFProcessor a utilizar
+
+    Returns:
+        Dict[str, Any]: {"success", "output_key", "size"} o {"success": False,
+        "error", "deadline_exceeded"}
+    """
+    from processor import DeadlineExceeded
+    from storage import get_storage
+
+    pdf_data = {key: value for key, value in event.items() if key not in ("output_key", "remaining_seconds")}
+    if event.get("remaining_seconds") is not None:
+        pdf_data["deadline"] = time.monotonic() + event["remaining_seconds"]
+    storage = get_storage("s3")
+    try:
+        with storage.open_write(event["output_key"]) as writer:
+            processor.process_pdf({**pdf_data, "output_stream": writer})
+    except DeadlineExceeded as e:
+        print(f"⏰ Rango {event.get('page_range')}: {e}")
+        return {"success": False, "error": str(e), "deadline_exceeded": True}
+    except Exception as e:
+        print(f"❌ Error en el rango {event.get('page_range')}: {e}")
+        return {"success": False, "error": str(e), "deadline_exceeded": False}
+    return {"success": True, "output_key": event["output_key"], "size": writer.size}
@@ -0,0 +1,278 @@
+"""
+Jobs Module
+Trabajos de procesamiento diferido: el cliente sube el PDF directamente al
+almacenamiento con un POST prefirmado y un evento de S3 lo procesa con las
+instrucciones guardadas al crear el trabajo
+
+Cada trabajo se guarda como un JSON junto a los objetos:
+    jobs/{job_id}.json       instrucciones y estado
+    uploads/{job_id}.pdf     PDF subido por el cliente
+    processed/{job_id}.pdf   resultado
+    jobs/{job_id}.checkpoint.pdf
+                             PDF parcial si la invocación se quedó sin tiempo
+
+Si el plazo de la invocación se agota, el trabajo queda en estado
+"checkpointed" con las páginas ya procesadas y la siguiente ejecución de
+run_job continúa desde ahí en lugar de empezar de nuevo.
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List
+
+from storage import Storage, S3Storage, get_storage
+
+
+UPLOAD_PREFIX = "uploads/"
+JOB_PREFIX = "jobs/"
+OUTPUT_PREFIX = "processed/"
+
+# Tamaño máximo aceptado por el POST prefirmado
+MAX_UPLOAD_BYTES = int(os.environ.get("PDF_MAX_UPLOAD_BYTES", 100 * 1024 * 1024))
+UPLOAD_EXPIRES_IN = int(os.environ.get("PDF_UPLOAD_EXPIRES_IN", 3600))
+
+# Reanudaciones seguidas sin avanzar ninguna página antes de dar el trabajo
+# por fallido (una sola página que no cabe en una invocación)
+MAX_STALLED_RESUMES = int(os.environ.get("PDF_MAX_STALLED_RESUMES", 3))
+
+_JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+class JobCheckpointed(Exception):
+    """El plazo se agotó y el trabajo quedó guardado para reanudarse"""
+    pass
+
+
+def job_key(job_id: str) -> str:
+    """Clave del JSON del trabajo"""
+    if not _JOB_ID_PATTERN.match(job_id or ""):
+        raise ValueError(f"Identificador de trabajo no válido: {job_id}")
+    return f"{JOB_PREFIX}{job_id}.json"
+
+
+def job_id_from_upload_key(key: str) -> str:
+    """
+    Extrae el identificador de trabajo de la clave de un PDF subido
+
+    Args:
+        key: Clave con formato uploads/{job_id}.pdf
+
+    Returns:
+        str: Identificador del trabajo
+    """
+    if not key.startswith(UPLOAD_PREFIX) or not key.endswith(".pdf"):
+        raise ValueError(f"La clave no corresponde a una subida: {key}")
+    job_id = key[len(UPLOAD_PREFIX):-len(".pdf")]
+    job_key(job_id)
+    return job_id
+
+
+def storage_for_bucket(bucket: str) -> Storage:
+    """
+    Almacenamiento para el bucket de un evento: el configurado si es el
+    mismo bucket o si el backend es local (pruebas con eventos sintéticos)
+    """
+    storage = get_storage("s3")
+    if isinstance(storage, S3Storage) and storage.bucket != bucket:
+        return S3Storage(bucket)
+    return storage
+
+
+def save_job(storage: Storage, job: Dict[str, Any]):
+    """Guarda (o sobrescribe) el JSON del trabajo"""
+    storage.write_bytes(job_key(job["job_id"]), json.dumps(job).encode("utf-8"), "application/json")
+
+
+def load_job(storage: Storage, job_id: str) -> Dict[str, Any]:
+    """Lee el trabajo; FileNotFoundError si no existe"""
+    return json.loads(storage.read_bytes(job_key(job_id)))
+
+
+def create_job(storage: Storage, insertions: List[Dict[str, Any]], options: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Crea un trabajo pendiente y el formulario para subir su PDF
+
+    Args:
+        storage: Almacenamiento donde viven los trabajos y los PDFs
+        insertions: Inserciones a aplicar cuando llegue el PDF
+        options: Opciones de process_pdf (incremental, save_profile, large_document)
+
+    Returns:
+        Dict[str, Any]: El trabajo y, en "upload", el formulario prefirmado
+    """
+    job_id = uuid.uuid4().hex
+    job = {
+        "job_id": job_id,
+        "status": "pending",
+        "input_key": f"{UPLOAD_PREFIX}{job_id}.pdf",
+        "output_key": f"{OUTPUT_PREFIX}{job_id}.pdf",
+        "insertions": insertions,
+        "options": options or {},
+        "created_at": datetime.now().isoformat()
+    }
+    save_job(storage, job)
+
+    upload = storage.presigned_post(
+        job["input_key"], expires_in=UPLOAD_EXPIRES_IN, max_bytes=MAX_UPLOAD_BYTES
+    )
+    return {**job, "upload": upload}
+
+
+def checkpoint_key(job_id: str) -> str:
+    """Clave del PDF parcial de un trabajo"""
+    job_key(job_id)
+    return f"{JOB_PREFIX}{job_id}.checkpoint.pdf"
+
+
+def run_job(storage: Storage, processor, input_key: str, deadline: float = None) -> Dict[str, Any]:
+    """
+    Procesa el PDF subido para un trabajo y guarda el resultado
+
+    Los eventos de S3 pueden llegar más de una vez: un trabajo ya completado
+    no se vuelve a procesar. Un trabajo con checkpoint continúa desde la
+    última página terminada.
+
+    Args:
+        storage: Almacenamiento del trabajo
+        processor: PDFProcessor a utilizar
+        input_key: Clave del PDF subido (uploads/{job_id}.pdf)
+        deadline: Instante de time.monotonic() en que hay que parar y
+            guardar un checkpoint (ver processor.deadline_from_context)
+
+    Returns:
+        Dict[str, Any]: El trabajo actualizado
+
+    Raises:
+        JobCheckpointed: Se agotó el plazo y el trabajo quedó en estado
+        "checkpointed"; una nueva llamada lo reanuda
+    """
+    from processor import DeadlineExceeded, spool_pdf
+
+    job = load_job(storage, job_id_from_upload_key(input_key))
+    if job.get("status") == "completed" and storage.exists(job["output_key"]):
+        print(f"⏭️ Trabajo {job['job_id']} ya completado")
+        return job
+
+    # Los fallos posteriores a un checkpoint también se reanudan desde él
+    source_key, resume_from = input_key, 0
+    if job.get("checkpoint_key") and storage.exists(job["checkpoint_key"]):
+        source_key, resume_from = job["checkpoint_key"], job["pages_done"]
+        print(f"⏯️ Trabajo {job['job_id']}: reanudando tras {resume_from} páginas")
+
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pdf_source = spool_pdf(storage.iter_chunks(source_key), temp_dir=temp_dir)
+            if not resume_from:
+                # Huella de la subida original (un checkpoint es un PDF parcial)
+                job["input_sha256"] = pdf_source["input_sha256"]
+                job["input_size"] = pdf_source["input_size"]
+            elif job.get("input_sha256"):
+                # Los QR con {sha256} de las páginas restantes deben llevar el
+                # hash de la subida, no el del checkpoint
+                pdf_source.update(input_sha256=job["input_sha256"], input_size=job.get("input_size"))
+            try:
+                with storage.open_write(job["output_key"]) as writer:
+                    processor.process_pdf({
+                        **pdf_source,
+                        **job["options"],
+                        "insertions": job["insertions"],
+                        "output_stream": writer,
+                        "deadline": deadline,
+                        "resume_from": resume_from,
+                        "checkpoint_path": os.path.join(temp_dir, "checkpoint.pdf")
+                    })
+            except DeadlineExceeded as e:
+                # El checkpoint vive en el temporal: subirlo antes de salir
+                if _save_checkpoint(storage, job, e, resume_from):
+                    raise JobCheckpointed(str(e)) from e
+                raise
+    except JobCheckpointed:
+        raise
+    except Exception as e:
+        job.update(status="failed", error=str(e), failed_at=datetime.now().isoformat())
+        save_job(storage, job)
+        raise
+
+    if job.get("checkpoint_key"):
+        storage.delete(job.pop("checkpoint_key"))
+    job.update(
+        status="completed",
+        size=writer.size,
+        sha256=writer.sha256,
+        completed_at=datetime.now().isoformat()
+    )
+    job.pop("error", None)
+    save_job(storage, job)
+    print(f"✅ Trabajo {job['job_id']} completado: {job['output_key']}")
+    return job
+
+
+def _save_checkpoint(storage: Storage, job: Dict[str, Any], error, resume_from: int):
+    """
+    Sube el PDF parcial y deja el trabajo en estado "checkpointed"
+
+    Returns:
+        bool: False si el trabajo no se puede reanudar (sin checkpoint, o
+        demasiadas reanudaciones seguidas sin avanzar)
+    """
+    if error.checkpoint_path is None:
+        return False
+
+    if error.pages_done > resume_from:
+        key = checkpoint_key(job["job_id"])
+        with open(error.checkpoint_path, "rb") as f, storage.open_write(key) as writer:
+            shutil.copyfileobj(f, writer, 1024 * 1024)
+        job.update(checkpoint_key=key, pages_done=error.pages_done, stalled=0)
+    else:
+        job["stalled"] = job.get("stalled", 0) + 1
+        if job["stalled"] > MAX_STALLED_RESUMES:
+            return False
+
+    job.update(
+        status="checkpointed",
+        total_pages=error.total_pages,
+        resumes=job.get("resumes", 0) + 1,
+        checkpointed_at=datetime.now().isoformat()
+    )
+    save_job(storage, job)
+    print(f"💾 Trabajo {job['job_id']}: {job.get('pages_done', 0)} de {error.total_pages} páginas, "
+          f"se reanudará en otra invocación")
+    return True
+
+
+def resume_job_async(context, bucket: str, input_key: str) -> bool:
+    """
+    Invoca de nuevo la función de forma asíncrona con un evento de S3
+    sintético para continuar un trabajo con checkpoint. Requiere permiso
+    lambda:InvokeFunction sobre la propia función
+
+    Args:
+        context: Contexto de Lambda de la invocación actual
+        bucket: Bucket del trabajo
+        input_key: Clave del PDF subido
+
+    Returns:
+        bool: True si se lanzó la invocación
+    """
+    if context is None or not hasattr(context, "invoked_function_arn"):
+        print(f"⚠️ Sin contexto de Lambda: el trabajo de {input_key} se reanudará en el próximo evento")
+        return False
+
+    import boto3
+
+    event = {"Records": [{
+        "eventSource": "aws:s3",
+        "s3": {"bucket": {"name": bucket}, "object": {"key": input_key}}
+    }]}
+    boto3.client("lambda").invoke(
+        FunctionName=context.invoked_function_arn,
+        InvocationType="Event",
+        Payload=json.dumps(event).encode("utf-8")
+    )
+    print(f"🔁 Reanudación de {input_key} programada")
+    return True
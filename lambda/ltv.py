@@ -0,0 +1,629 @@
+"""
+LTV Module
+Validación a largo plazo de las firmas (PAdES B-T y B-LT)
+
+- Sello de tiempo RFC 3161 sobre el valor de cada firma, embebido en la CMS
+  como atributo no firmado signature-time-stamp-token
+- Diccionario /DSS en el catálogo con los certificados, las respuestas OCSP
+  y las CRL de la cadena, y una entrada /VRI por firma, añadido en una
+  segunda actualización incremental
+
+Los proveedores son intercambiables (TimestampProvider, RevocationProvider):
+por defecto hablan HTTP con la TSA de PDF_TSA_URL y con los respondedores
+OCSP y las CRL que indica cada certificado, de modo que en pruebas basta
+con apuntarlos a servidores locales que los sustituyan.
+
+Las respuestas de revocación se guardan en una caché del proceso hasta su
+nextUpdate y se reutilizan entre documentos: un lote con la misma cadena
+hace una sola consulta. Los certificados que comparten respondedor y emisor
+van en una sola petición OCSP (admite varios CertID); la firma de cada
+respuesta se verifica contra el emisor o un respondedor delegado por él
+antes de guardarla. RFC 3161 solo admite una
+huella por petición, así que los sellos de un lote se piden en paralelo
+sobre conexiones reutilizadas.
+"""
+
+import datetime
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+from signing import SigningError, _append_reference
+
+
+TSA_URL = os.environ.get("PDF_TSA_URL")
+TSA_TIMEOUT_SECONDS = float(os.environ.get("PDF_TSA_TIMEOUT_SECONDS", 10))
+# Peticiones simultáneas a la TSA al sellar un lote
+TSA_CONCURRENCY = int(os.environ.get("PDF_TSA_CONCURRENCY", 8))
+
+# Respondedor OCSP fijo; si no se indica, el del certificado (AIA)
+OCSP_URL = os.environ.get("PDF_OCSP_URL")
+REVOCATION_TIMEOUT_SECONDS = float(os.environ.get("PDF_REVOCATION_TIMEOUT_SECONDS", 10))
+# Validez en caché de las respuestas sin nextUpdate
+REVOCATION_DEFAULT_TTL_SECONDS = int(os.environ.get("PDF_REVOCATION_DEFAULT_TTL_SECONDS", 3600))
+REVOCATION_CACHE_MAX_ENTRIES = int(os.environ.get("PDF_REVOCATION_CACHE_MAX_ENTRIES", 1024))
+
+
+class TimestampProvider:
+    """Autoridad de sellado de tiempo (TSA)"""
+
+    def timestamp(self, digests: List[bytes]) -> List[bytes]:
+        """
+        Sella varias huellas SHA-256
+
+        Args:
+            digests: Huellas a sellar
+
+        Returns:
+            List[bytes]: Un TimeStampToken (ContentInfo DER) por huella, en orden
+        """
+        raise NotImplementedError
+
+
+class RevocationProvider:
+    """Origen de las respuestas OCSP y las CRL"""
+
+    def fetch_ocsp(self, url: str, request: bytes) -> bytes:
+        """Envía una OCSPRequest DER al respondedor y devuelve la respuesta DER"""
+        raise NotImplementedError
+
+    def fetch_crl(self, url: str) -> bytes:
+        """Descarga una CRL y la devuelve en DER"""
+        raise NotImplementedError
+
+
+class HTTPTimestampProvider(TimestampProvider):
+    """TSA RFC 3161 por HTTP (application/timestamp-query)"""
+
+    def __init__(self, url: str, timeout: float = TSA_TIMEOUT_SECONDS,
+                 concurrency: int = TSA_CONCURRENCY):
+        import requests
+
+        self.url = url
+        self.timeout = timeout
+        self.concurrency = max(1, concurrency)
+        # La sesión reutiliza las conexiones entre sellos
+        self.session = requests.Session()
+
+    def timestamp(self, digests: List[bytes]) -> List[bytes]:
+        if len(digests) <= 1 or self.concurrency == 1:
+            return [self._request(digest) for digest in digests]
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(digests))) as executor:
+            return list(executor.map(self._request, digests))
+
+    def _request(self, digest: bytes) -> bytes:
+        nonce = int.from_bytes(os.urandom(8), "big")
+        response = self.session.post(
+            self.url,
+            data=build_timestamp_request(digest, nonce),
+            headers={"Content-Type": "application/timestamp-query"},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return parse_timestamp_response(response.content, digest, nonce)
+
+
+class HTTPRevocationProvider(RevocationProvider):
+    """OCSP por HTTP POST (application/ocsp-request) y CRL por HTTP GET"""
+
+    def __init__(self, timeout: float = REVOCATION_TIMEOUT_SECONDS):
+        import requests
+
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def fetch_ocsp(self, url: str, request: bytes) -> bytes:
+        response = self.session.post(url, data=request, timeout=self.timeout,
+                                     headers={"Content-Type": "application/ocsp-request"})
+        response.raise_for_status()
+        return response.content
+
+    def fetch_crl(self, url: str) -> bytes:
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.content
+
+
+class RevocationCache:
+    """
+    Respuestas OCSP y CRL válidas hasta su nextUpdate, compartidas entre
+    documentos y firmantes del proceso
+    """
+
+    def __init__(self, max_entries: int = REVOCATION_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, key: Tuple[str, str]) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key: Tuple[str, str], value: bytes, expires_at: float):
+        if expires_at <= time.time():
+            return
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def build_timestamp_request(digest: bytes, nonce: int = None) -> bytes:
+    """TimeStampReq DER para una huella SHA-256, pidiendo el certificado de la TSA"""
+    from asn1crypto import tsp
+
+    request = {
+        "version": 1,
+        "message_imprint": {"hash_algorithm": {"algorithm": "sha256"}, "hashed_message": digest},
+        "cert_req": True
+    }
+    if nonce is not None:
+        request["nonce"] = nonce
+    return tsp.TimeStampReq(request).dump()
+
+
+def parse_timestamp_response(data: bytes, digest: bytes, nonce: int = None) -> bytes:
+    """
+    Comprueba una TimeStampResp y devuelve su TimeStampToken
+
+    Args:
+        data: TimeStampResp DER
+        digest: Huella que se pidió sellar
+        nonce: Nonce de la petición, si se envió
+
+    Returns:
+        bytes: TimeStampToken (ContentInfo DER)
+    """
+    from asn1crypto import tsp
+
+    response = tsp.TimeStampResp.load(data)
+    status = response["status"]["status"].native
+    if status not in ("granted", "granted_with_mods"):
+        detail = response["status"]["status_string"].native
+        raise SigningError(f"La TSA rechazó el sello de tiempo: {status} {detail or ''}".strip())
+    token = response["time_stamp_token"]
+    tst_info = token["content"]["encap_content_info"]["content"].parsed
+    if tst_info["message_imprint"]["hashed_message"].native != digest:
+        raise SigningError("El sello de tiempo no corresponde a la huella enviada")
+    if nonce is not None and tst_info["nonce"].native != nonce:
+        raise SigningError("El nonce del sello de tiempo no coincide")
+    return token.dump()
+
+
+def timestamp_info(token: bytes) -> Dict[str, Any]:
+    """
+    Datos de un TimeStampToken
+
+    Returns:
+        Dict[str, Any]: gen_time (datetime), digest (huella sellada) y
+        certificates (certificados DER incluidos por la TSA)
+    """
+    from asn1crypto import cms
+
+    signed_data = cms.ContentInfo.load(token)["content"]
+    tst_info = signed_data["encap_content_info"]["content"].parsed
+    return {
+        "gen_time": tst_info["gen_time"].native,
+        "digest": tst_info["message_imprint"]["hashed_message"].native,
+        "certificates": [cert.chosen.dump() for cert in signed_data["certificates"] or []]
+    }
+
+
+def _ocsp_urls(certificate) -> List[str]:
+    from cryptography import x509
+    from cryptography.x509.oid import AuthorityInformationAccessOID
+
+    try:
+        access = certificate.extensions.get_extension_for_class(x509.AuthorityInformationAccess).value
+    except x509.ExtensionNotFound:
+        return []
+    return [description.access_location.value for description in access
+            if description.access_method == AuthorityInformationAccessOID.OCSP]
+
+
+def _crl_urls(certificate) -> List[str]:
+    from cryptography import x509
+
+    try:
+        points = certificate.extensions.get_extension_for_class(x509.CRLDistributionPoints).value
+    except x509.ExtensionNotFound:
+        return []
+    return [name.value for point in points for name in (point.full_name or [])
+            if isinstance(name, x509.UniformResourceIdentifier)]
+
+
+def build_ocsp_request(pairs: List[Tuple[Any, Any]]) -> bytes:
+    """
+    OCSPRequest DER con un CertID (SHA-1) por cada (certificado, emisor)
+
+    cryptography solo construye peticiones de un certificado; el protocolo
+    admite varios y así la cadena entera cuesta una sola consulta
+    """
+    from asn1crypto import ocsp, x509 as asn1_x509
+    from cryptography.hazmat.primitives.serialization import Encoding
+
+    request_list = []
+    for certificate, issuer in pairs:
+        cert = asn1_x509.Certificate.load(certificate.public_bytes(Encoding.DER))
+        issuer_cert = asn1_x509.Certificate.load(issuer.public_bytes(Encoding.DER))
+        request_list.append({"req_cert": {
+            "hash_algorithm": {"algorithm": "sha1"},
+            "issuer_name_hash": cert.issuer.sha1,
+            "issuer_key_hash": issuer_cert.public_key.sha1,
+            "serial_number": cert.serial_number
+        }})
+    return ocsp.OCSPRequest({"tbs_request": {"request_list": request_list}}).dump()
+
+
+def _expiry(this_update: datetime.datetime, next_update: Optional[datetime.datetime]) -> float:
+    """Hasta cuándo se puede reutilizar una respuesta"""
+    if next_update is not None:
+        return next_update.timestamp()
+    return max(this_update.timestamp(), time.time()) + REVOCATION_DEFAULT_TTL_SECONDS
+
+
+def _fingerprint(certificate) -> str:
+    from cryptography.hazmat.primitives import hashes
+
+    return certificate.fingerprint(hashes.SHA256()).hex()
+
+
+def collect_revocation_info(certificates: List[Any], provider: RevocationProvider = None,
+                            cache: RevocationCache = None) -> Dict[str, List[bytes]]:
+    """
+    Reúne la información de revocación de una cadena para el /DSS
+
+    Cada certificado no autofirmado necesita a su emisor en la lista. Se
+    usa OCSP si hay respondedor (PDF_OCSP_URL o AIA) y si no la CRL del
+    certificado. Las respuestas en caché no generan tráfico y las que
+    faltan se piden agrupando los certificados por respondedor
+
+    Args:
+        certificates: Firmante e intermedios (y opcionalmente la raíz)
+        provider: Proveedor de revocación (por defecto, HTTP)
+        cache: Caché de respuestas (por defecto, la del proceso)
+
+    Returns:
+        Dict[str, List[bytes]]: certs, ocsps y crls en DER, sin repetidos
+    """
+    from cryptography.hazmat.primitives.serialization import Encoding
+
+    cache = cache if cache is not None else get_revocation_cache()
+    info = {"certs": [], "ocsps": [], "crls": []}
+
+    def add(kind, data):
+        if data not in info[kind]:
+            info[kind].append(data)
+
+    ocsp_groups: Dict[Tuple[str, str], List[Tuple[Any, Any]]] = {}
+    crl_targets = []
+    for certificate in certificates:
+        add("certs", certificate.public_bytes(Encoding.DER))
+        if certificate.issuer == certificate.subject:
+            continue  # Raíz autofirmada: no tiene revocación
+        issuer = _find_issuer(certificate, certificates)
+        subject = certificate.subject.rfc4514_string()
+        if issuer is None:
+            raise SigningError(f"Falta el emisor de {subject} en la cadena (PDF_SIGNING_CHAIN) para LTV")
+
+        fingerprint = _fingerprint(certificate)
+        cached = cache.get(("ocsp", fingerprint))
+        if cached is not None:
+            add("ocsps", cached)
+            continue
+        ocsp_url = OCSP_URL or next(iter(_ocsp_urls(certificate)), None)
+        if ocsp_url:
+            # Una respuesta la firma un solo respondedor, autorizado por un
+            # solo emisor
+            ocsp_groups.setdefault((ocsp_url, _fingerprint(issuer)), []).append((certificate, issuer))
+            continue
+        crl_url = next(iter(_crl_urls(certificate)), None)
+        if crl_url is None:
+            raise SigningError(f"{subject} no indica respondedor OCSP ni CRL")
+        crl_targets.append((certificate, issuer, crl_url))
+
+    if ocsp_groups or crl_targets:
+        provider = provider or get_revocation_provider()
+
+    for (url, _), pairs in ocsp_groups.items():
+        # Una sola petición por respondedor y emisor con todos sus certificados
+        data = provider.fetch_ocsp(url, build_ocsp_request(pairs))
+        expires_at = _check_ocsp_response(data, pairs, url)
+        for certificate, _ in pairs:
+            cache.put(("ocsp", _fingerprint(certificate)), data, expires_at)
+        add("ocsps", data)
+
+    for certificate, issuer, url in crl_targets:
+        data = cache.get(("crl", url))
+        if data is None:
+            data = provider.fetch_crl(url)
+            crl = _load_crl(data)
+            if not crl.is_signature_valid(issuer.public_key()):
+                raise SigningError(f"La firma de la CRL {url} no es válida")
+            cache.put(("crl", url), data, _expiry(crl.last_update_utc, crl.next_update_utc))
+        else:
+            crl = _load_crl(data)
+        if crl.get_revoked_certificate_by_serial_number(certificate.serial_number) is not None:
+            raise SigningError(f"El certificado {certificate.subject.rfc4514_string()} está revocado")
+        add("crls", data)
+
+    return info
+
+
+def _find_issuer(certificate, candidates: List[Any]):
+    """Emisor directo de certificate entre candidates, o None"""
+    for candidate in candidates:
+        if candidate is certificate or candidate.subject != certificate.issuer:
+            continue
+        try:
+            certificate.verify_directly_issued_by(candidate)
+            return candidate
+        except Exception:
+            continue
+    return None
+
+
+def _load_crl(data: bytes):
+    from cryptography import x509
+
+    if data.lstrip().startswith(b"-----BEGIN"):
+        return x509.load_pem_x509_crl(data)
+    return x509.load_der_x509_crl(data)
+
+
+def _check_ocsp_response(data: bytes, pairs: List[Tuple[Any, Any]], url: str = "") -> float:
+    """
+    Comprueba que la respuesta OCSP está firmada por el emisor de los
+    certificados pedidos (o por un respondedor delegado por él), que cubre
+    todos sus CertID y que ninguno está revocado
+
+    Args:
+        data: OCSPResponse DER
+        pairs: (certificado, emisor) de la petición, todos del mismo emisor
+        url: Respondedor (solo para los mensajes)
+
+    Returns:
+        float: Momento (epoch) hasta el que la respuesta es reutilizable
+    """
+    from asn1crypto import x509 as asn1_x509
+    from cryptography.hazmat.primitives.serialization import Encoding
+    from cryptography.x509 import ocsp
+
+    response = ocsp.load_der_ocsp_response(data)
+    if response.response_status != ocsp.OCSPResponseStatus.SUCCESSFUL:
+        raise SigningError(f"El respondedor OCSP respondió {response.response_status.name}")
+    issuer = pairs[0][1]
+    _check_ocsp_signature(data, issuer, url)
+
+    # Solo cuentan los CertID del emisor de la petición, no basta el número de serie
+    issuer_info = asn1_x509.Certificate.load(issuer.public_bytes(Encoding.DER))
+    issuer_name, issuer_key = issuer_info.subject.dump(), bytes(issuer_info.public_key["public_key"])
+    single_responses = {}
+    for single in response.responses:
+        algorithm = single.hash_algorithm.name
+        if (single.issuer_name_hash == hashlib.new(algorithm, issuer_name).digest()
+                and single.issuer_key_hash == hashlib.new(algorithm, issuer_key).digest()):
+            single_responses[single.serial_number] = single
+
+    expires_at = None
+    for certificate, _ in pairs:
+        subject = certificate.subject.rfc4514_string()
+        single = single_responses.get(certificate.serial_number)
+        if single is None:
+            raise SigningError(f"La respuesta OCSP no incluye {subject}")
+        if single.certificate_status == ocsp.OCSPCertStatus.REVOKED:
+            raise SigningError(f"El certificado {subject} está revocado")
+        if single.certificate_status != ocsp.OCSPCertStatus.GOOD:
+            raise SigningError(f"El respondedor OCSP no conoce {subject}")
+        single_expiry = _expiry(single.this_update_utc, single.next_update_utc)
+        expires_at = single_expiry if expires_at is None else min(expires_at, single_expiry)
+    return expires_at
+
+
+def _check_ocsp_signature(data: bytes, issuer, url: str = ""):
+    """
+    Verifica la firma de la BasicOCSPResponse: la del propio emisor o la de
+    un respondedor incluido en la respuesta, emitido directamente por él y
+    con id-kp-OCSPSigning (RFC 6960, 4.2.2.2)
+    """
+    from asn1crypto import ocsp as asn1_ocsp, x509 as asn1_x509
+    from cryptography import x509
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+    from cryptography.x509.oid import ExtendedKeyUsageOID
+
+    basic = asn1_ocsp.OCSPResponse.load(data)["response_bytes"]["response"].parsed
+    responder_id = basic["tbs_response_data"]["responder_id"]
+    candidates = [issuer]
+    if basic["certs"].native is not None:
+        candidates += [x509.load_der_x509_certificate(cert.dump()) for cert in basic["certs"]]
+
+    responder = None
+    for candidate in candidates:
+        info = asn1_x509.Certificate.load(candidate.public_bytes(Encoding.DER))
+        if responder_id.name == "by_key":
+            matches = info.public_key.sha1 == responder_id.chosen.native
+        else:
+            matches = info.subject == responder_id.chosen
+        if matches:
+            responder = candidate
+            break
+    if responder is None:
+        raise SigningError(f"La respuesta OCSP de {url} no incluye el certificado del respondedor")
+
+    if responder.public_key().public_bytes(Encoding.DER, PublicFormat.SubjectPublicKeyInfo) != \
+            issuer.public_key().public_bytes(Encoding.DER, PublicFormat.SubjectPublicKeyInfo):
+        try:
+            responder.verify_directly_issued_by(issuer)
+            extended_usage = responder.extensions.get_extension_for_class(x509.ExtendedKeyUsage).value
+        except Exception:
+            extended_usage = []
+        if ExtendedKeyUsageOID.OCSP_SIGNING not in extended_usage:
+            raise SigningError(f"El respondedor OCSP de {url} no está autorizado por "
+                               f"{issuer.subject.rfc4514_string()}")
+
+    try:
+        _verify_signature(responder.public_key(), basic["signature"].native,
+                          basic["tbs_response_data"].dump(), basic["signature_algorithm"])
+    except InvalidSignature:
+        raise SigningError(f"La firma de la respuesta OCSP de {url} no es válida")
+
+
+def _verify_signature(public_key, signature: bytes, data: bytes, algorithm):
+    """Verifica una firma con el SignedDigestAlgorithm de asn1crypto"""
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import ec, padding, rsa
+
+    signature_algo = algorithm.signature_algo
+    if signature_algo == "rsassa_pss":
+        params = algorithm["parameters"]
+        hash_algorithm = getattr(hashes, params["hash_algorithm"]["algorithm"].native.upper())()
+        mgf_hash = getattr(hashes, params["mask_gen_algorithm"]["parameters"]["algorithm"].native.upper())()
+        signature_padding = padding.PSS(mgf=padding.MGF1(mgf_hash), salt_length=params["salt_length"].native)
+    elif signature_algo in ("rsassa_pkcs1v15", "ecdsa"):
+        hash_algorithm = getattr(hashes, algorithm.hash_algo.upper())()
+    else:
+        raise SigningError(f"Algoritmo de firma OCSP no soportado: {signature_algo}")
+
+    expected_key = ec.EllipticCurvePublicKey if signature_algo == "ecdsa" else rsa.RSAPublicKey
+    if not isinstance(public_key, expected_key):
+        raise SigningError("La clave del respondedor OCSP no corresponde al algoritmo de firma")
+    if signature_algo == "ecdsa":
+        public_key.verify(signature, data, ec.ECDSA(hash_algorithm))
+    elif signature_algo == "rsassa_pss":
+        public_key.verify(signature, data, signature_padding, hash_algorithm)
+    else:
+        public_key.verify(signature, data, padding.PKCS1v15(), hash_algorithm)
+
+
+def vri_key(contents: bytes) -> str:
+    """Clave /VRI de una firma: SHA-1 en hexadecimal de los bytes de /Contents"""
+    return hashlib.sha1(contents).hexdigest().upper()
+
+
+def add_dss(path: str, contents: bytes, info: Dict[str, List[bytes]]):
+    """
+    Añade o amplía el /DSS del documento en una actualización incremental
+
+    Args:
+        path: PDF ya firmado (se modifica)
+        contents: Bytes de /Contents de la firma (CMS y relleno)
+        info: certs, ocsps y crls en DER (ver collect_revocation_info)
+    """
+    doc = fitz.open(path)
+    try:
+        if not doc.can_save_incrementally():
+            raise SigningError("El PDF no admite una actualización incremental para el /DSS")
+
+        catalog = doc.pdf_catalog()
+        kind, value = doc.xref_get_key(catalog, "DSS")
+        dss = int(value.split()[0]) if kind == "xref" else None
+        owner, prefix = (dss, "") if dss else (catalog, "DSS/")
+
+        # Los certificados y respuestas que ya están en el /DSS (de otra
+        # firma con la misma cadena) se referencian sin repetirlos
+        existing = {}
+        if kind != "null":
+            for name in ("Certs", "OCSPs", "CRLs"):
+                array_kind, array = doc.xref_get_key(owner, prefix + name)
+                if array_kind == "xref":
+                    array = doc.xref_object(int(array.split()[0]), compressed=True)
+                for xref in re.findall(r"(\d+) 0 R", array if array_kind in ("array", "xref") else ""):
+                    existing.setdefault(hashlib.sha256(doc.xref_stream(int(xref))).digest(), int(xref))
+
+        xrefs, added = {}, {}
+        for name, kind_name in (("Certs", "certs"), ("OCSPs", "ocsps"), ("CRLs", "crls")):
+            xrefs[kind_name], added[name] = [], []
+            for data in info.get(kind_name, []):
+                xref = existing.get(hashlib.sha256(data).digest())
+                if xref is None:
+                    xref = doc.get_new_xref()
+                    doc.update_object(xref, "<< >>")
+                    doc.update_stream(xref, data, new=True)
+                    added[name].append(xref)
+                xrefs[kind_name].append(xref)
+
+        def array(values):
+            return "[" + " ".join(f"{xref} 0 R" for xref in values) + "]"
+
+        vri = "<< " + " ".join(
+            f"/{name} {array(xrefs[kind_name])}"
+            for name, kind_name in (("Cert", "certs"), ("OCSP", "ocsps"), ("CRL", "crls")) if xrefs[kind_name]
+        ) + " >>"
+
+        if kind == "null":
+            entries = " ".join(f"/{name} {array(values)}" for name, values in added.items() if values)
+            doc.xref_set_key(catalog, "DSS", f"<< {entries} /VRI << /{vri_key(contents)} {vri} >> >>")
+        else:
+            # /DSS de una firma anterior, directo o indirecto
+            for name, values in added.items():
+                for xref in values:
+                    _append_reference(doc, owner, prefix + name, xref)
+            vri_kind, vri_value = doc.xref_get_key(owner, prefix + "VRI")
+            if vri_kind == "xref":
+                owner, prefix = int(vri_value.split()[0]), ""
+            elif vri_kind == "null":
+                doc.xref_set_key(owner, prefix + "VRI", "<< >>")
+                prefix += "VRI/"
+            else:
+                prefix += "VRI/"
+            doc.xref_set_key(owner, prefix + vri_key(contents), vri)
+        doc.saveIncr()
+    finally:
+        doc.close()
+
+
+# Proveedores y caché del proceso, creados al primer uso
+_timestamp_provider = None
+_revocation_provider = None
+_revocation_cache = RevocationCache()
+_providers_lock = threading.Lock()
+
+
+def get_timestamp_provider() -> TimestampProvider:
+    """TSA configurada con PDF_TSA_URL"""
+    global _timestamp_provider
+    if _timestamp_provider is None:
+        with _providers_lock:
+            if _timestamp_provider is None:
+                if not TSA_URL:
+                    raise SigningError("El sello de tiempo requiere PDF_TSA_URL")
+                _timestamp_provider = HTTPTimestampProvider(TSA_URL)
+                print(f"⏱️ TSA configurada: {TSA_URL}")
+    return _timestamp_provider
+
+
+def get_revocation_provider() -> RevocationProvider:
+    """Proveedor de revocación por HTTP"""
+    global _revocation_provider
+    if _revocation_provider is None:
+        with _providers_lock:
+            if _revocation_provider is None:
+                _revocation_provider = HTTPRevocationProvider()
+    return _revocation_provider
+
+
+def get_revocation_cache() -> RevocationCache:
+    """Caché de revocación compartida por todo el proceso"""
+    return _revocation_cache
@@ -1,23 +1,25 @@
 """
 FastAPI Application para procesamiento de PDFs en AWS Lambda
+
+Optimizada para el arranque en frío: fitz, PIL, boto3 y requests se
+importan en la primera ruta que los necesita, y el procesador, el cliente
+S3 y el adaptador de Mangum se crean una sola vez por contenedor.
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, Request, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Dict, Any, Union, Optional
 import os
 import tempfile
-import shutil
+import time
 from datetime import datetime
-import boto3
-from botocore.exceptions import NoCredentialsError
 from mangum import Mangum
 import json
-import requests
+from urllib.parse import unquote_plus
 
-# Importar la lógica de procesamiento
-from processor import PDFProcessor
+from asset_cache import invocation_stats
+from storage import get_storage
 
 # Crear aplicación FastAPI
 app = FastAPI(
@@ -51,18 +53,189 @@ class Insertion(BaseModel):
     correct_orientation: Optional[bool] = True
     flip_type: Optional[str] = "horizontal"
     pages: Union[str, int, List[int]] = "all"
+    error_correction: Optional[str] = None  # QR: "L", "M" (por defecto), "Q" o "H"
+    quiet_zone: Optional[int] = None  # QR: módulos de margen (por defecto 4)
+    mode: Optional[str] = None  # "content" (por defecto, en el contenido de la página) o "annotation"
+    stamp_id: Optional[str] = None  # Modo annotation: nombre para sustituir o quitar el sello después
+
+class SignatureAppearance(BaseModel):
+    rect: List[float]  # [x0, y0, x1, y1] con origen arriba a la izquierda
+    page: Optional[int] = 0
+    image: Optional[str] = None  # Rúbrica (ruta local, http(s):// o s3://)
+    seal: Optional[str] = None  # Sello, a la derecha del bloque
+    name: Optional[str] = None  # Por defecto el CN del certificado
+    font_size: Optional[float] = None
+    show_reason: Optional[bool] = True
+    show_hash: Optional[bool] = True  # SHA-256 del documento antes de la firma
+
+class SignOptions(BaseModel):
+    field_name: Optional[str] = None  # Por defecto SignatureN
+    reason: Optional[str] = None
+    location: Optional[str] = None
+    contact_info: Optional[str] = None
+    timestamp: Optional[bool] = False  # Sello de tiempo RFC 3161 de PDF_TSA_URL (PAdES B-T)
+    ltv: Optional[bool] = False  # /DSS con OCSP/CRL de la cadena (PAdES B-LT)
+    appearance: Optional[SignatureAppearance] = None  # Firma visible; sin ella, invisible
 
 class ProcessURLRequest(BaseModel):
     pdf_path: str
     insertions: List[Insertion]
+    incremental: Optional[bool] = False  # Añadir cambios sin reescribir el PDF (preserva firmas previas)
+    save_profile: Optional[str] = None  # "fast", "compact" o "web"; None usa el del servidor
+    large_document: Optional[bool] = False  # Procesar con memoria acotada (documentos muy grandes)
+    parallel_workers: Optional[int] = 0  # Procesar por rangos de páginas en paralelo (0 = en serie)
+    sign: Optional[SignOptions] = None  # Firmar el resultado (PAdES) con el firmante configurado
+    remove_stamps: Optional[List[str]] = None  # stamp_id de sellos (anotaciones) a quitar antes; "*" = todos
+    content_addressed: Optional[bool] = False  # Clave de salida por hash; reutiliza resultados idénticos
+    stream: Optional[bool] = False  # Devolver el PDF en la respuesta si es pequeño (si no, URL de S3)
 
-# Instancia del procesador y cliente S3
-processor = PDFProcessor()
-s3_client = boto3.client('s3')
+class FingerprintRequest(BaseModel):
+    pdf_path: Optional[str] = None  # URL http(s):// o URI s3://
+    key: Optional[str] = None  # Clave de un objeto del bucket (alternativa a pdf_path)
+
+class UploadJobRequest(BaseModel):
+    insertions: List[Insertion]
+    incremental: Optional[bool] = False
+    save_profile: Optional[str] = None
+    large_document: Optional[bool] = False
+    parallel_workers: Optional[int] = 0
+    sign: Optional[SignOptions] = None
 
 # Nombre del bucket S3 desde variables de entorno
 S3_BUCKET_NAME = os.environ.get("PDF_BUCKET_NAME", "your-default-bucket-name")
 
+# Prefijo de las salidas con clave por contenido (content_addressed)
+CONTENT_KEY_PREFIX = "processed/sha256/"
+
+# Instancia del procesador, creada en la primera petición que la necesita
+_processor = None
+
+
+def get_processor():
+    """Devuelve el PDFProcessor del contenedor, importando fitz la primera vez"""
+    global _processor
+    if _processor is None:
+        from processor import PDFProcessor
+        _processor = PDFProcessor()
+    return _processor
+
+
+def content_addressed_output(pdf_source: Dict[str, Any], insertions: List[Dict[str, Any]],
+                             options: Dict[str, Any]):
+    """
+    Clave de salida derivada del contenido y, si ese resultado ya existe,
+    la respuesta que lo reutiliza sin procesar ni subir nada
+
+    Args:
+        pdf_source: {"pdf_stream": bytes} o {"pdf_path": ruta local}
+        insertions: Inserciones de la petición
+        options: Opciones de process_pdf de la petición
+
+    Returns:
+        Tuple: (clave, respuesta o None si hay que procesar)
+    """
+    from processor import content_hash
+
+    if options.get("sign"):
+        # El mismo resultado firmado por otro certificado (o con otra TSA) es
+        # otro objeto: rotar la clave no debe reutilizar los anteriores
+        from cryptography.hazmat.primitives import hashes
+        from signing import get_signer
+
+        try:
+            certificate = get_signer().certificate
+        except Exception as e:
+            raise HTTPException(status_code=503, detail=f"Firma no disponible: {str(e)}")
+        options = {**options, "signer": certificate.fingerprint(hashes.SHA256()).hex()}
+        if options["sign"].get("timestamp") or options["sign"].get("ltv"):
+            from ltv import TSA_URL
+            options["tsa"] = TSA_URL
+
+    # Normalizar con el modelo para que la misma inserción (con o sin valores
+    # por defecto explícitos) produzca la misma clave en ambos endpoints
+    normalized = [Insertion(**insertion).dict() for insertion in insertions]
+    key = f"{CONTENT_KEY_PREFIX}{content_hash(pdf_source, normalized, options)}.pdf"
+    storage = get_storage("s3")
+    if not storage.exists(key):
+        return key, None
+
+    print(f"♻️ Resultado existente reutilizado: {key}")
+    return key, {
+        "success": True,
+        "message": "PDF ya procesado con las mismas instrucciones; se reutiliza el resultado.",
+        "download_url": storage.url(key, expires_in=3600),
+        "s3_bucket": S3_BUCKET_NAME,
+        "s3_key": key,
+        "size": storage.size(key),
+        "input_sha256": pdf_source.get("input_sha256"),
+        "reused": True
+    }
+
+async def pdf_streaming_response(pdf_source: Dict[str, Any], pdf_data: Dict[str, Any], filename: str):
+    """
+    Respuesta que envía el PDF mientras se serializa, o None si la salida
+    estimada no cabe en una respuesta (PDF_STREAM_MAX_BYTES) y hay que
+    subirla a S3
+
+    Args:
+        pdf_source: {"pdf_stream": bytes} o {"pdf_path": ruta local}
+        pdf_data: Datos para process_pdf, sin salida
+        filename: Nombre del archivo para Content-Disposition
+    """
+    from fastapi.concurrency import run_in_threadpool
+    from fastapi.responses import StreamingResponse
+    from processor import PDFProcessor
+    from streaming import should_stream, stream_pdf
+
+    # Los PDFs volcados a disco viven en un temporal que desaparece al
+    # volver del endpoint, antes de terminar la respuesta
+    if pdf_source.get("pdf_stream") is None or not should_stream(pdf_source, pdf_data["insertions"]):
+        print("📦 Salida estimada demasiado grande para streaming; se sube a S3")
+        return None
+
+    # Procesador propio: la serialización continúa en un hilo tras volver
+    chunks = await run_in_threadpool(stream_pdf, PDFProcessor(), pdf_data)
+    # El hash de la salida no se conoce hasta terminar de enviarla
+    return StreamingResponse(
+        chunks,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="{os.path.basename(filename)}"',
+                 "X-Input-SHA256": pdf_source["input_sha256"]}
+    )
+
+def stored_response(existing: Dict[str, Any], stream: bool):
+    """Respuesta para un resultado ya guardado: el PDF si se pidió streaming y cabe, si no su URL"""
+    from fastapi.responses import StreamingResponse
+    from streaming import STREAM_MAX_BYTES
+
+    if not stream or existing["size"] > STREAM_MAX_BYTES:
+        return existing
+    return StreamingResponse(
+        get_storage("s3").iter_chunks(existing["s3_key"]),
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="{os.path.basename(existing["s3_key"])}"'}
+    )
+
+def request_deadline(http_request: Request):
+    """
+    Plazo de procesamiento de una petición HTTP a partir del tiempo restante
+    de la invocación (Mangum deja el contexto de Lambda en el scope)
+
+    Returns:
+        float: Instante de time.monotonic(), o None fuera de Lambda
+    """
+    from processor import deadline_from_context
+    return deadline_from_context(http_request.scope.get("aws.context"))
+
+def deadline_error(error) -> HTTPException:
+    """504 con el avance, en lugar del 502 opaco de una invocación cortada"""
+    return HTTPException(status_code=504, detail={
+        "message": f"{error}. Para documentos de este tamaño use /upload-url: "
+                   "los trabajos se reanudan desde la última página procesada.",
+        "pages_done": error.pages_done,
+        "total_pages": error.total_pages
+    })
+
 @app.get("/")
 async def root():
     """Endpoint raíz con información de la API"""
@@ -74,17 +247,37 @@ async def root():
 
 @app.post("/upload-and-process")
 async def upload_and_process_pdf(
+    http_request: Request,
     file: UploadFile = File(...),
-    insertions: str = None  # JSON string de las inserciones
+    insertions: str = None,  # JSON string de las inserciones
+    incremental: bool = False,  # Guardar como actualización incremental
+    save_profile: str = None,  # "fast", "compact" o "web"
+    large_document: bool = False,  # Procesar con memoria acotada
+    parallel_workers: int = 0,  # Procesar por rangos de páginas en paralelo
+    sign: bool = False,  # Firmar el resultado (PAdES) con el firmante configurado
+    sign_reason: str = None,  # Motivo de la firma
+    sign_location: str = None,  # Lugar de la firma
+    sign_ltv: bool = False,  # Sellar la firma y añadir el /DSS (PAdES B-LT)
+    content_addressed: bool = False,  # Clave de salida por hash; reutiliza resultados idénticos
+    stream: bool = False  # Devolver el PDF en la respuesta si es pequeño (si no, URL de S3)
 ):
     """
     Sube un PDF, lo procesa con las instrucciones dadas y lo guarda en S3.
     Devuelve una URL prefirmada para descargar el resultado.
     """
+    from botocore.exceptions import NoCredentialsError
+    from processor import DeadlineExceeded, MemoryLimitExceeded, spool_pdf, SPOOL_CHUNK_SIZE
+
     if not file.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Solo se permiten archivos PDF")
 
-    # Usar el directorio temporal de Lambda para guardar archivos
+    # Parsear instrucciones de inserción desde el string JSON
+    try:
+        insertions_data = json.loads(insertions) if insertions else []
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="El JSON de inserciones es inválido")
+
+    # El directorio temporal de Lambda solo se usa para PDFs de entrada muy grandes
     with tempfile.TemporaryDirectory() as temp_dir:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         original_filename = os.path.splitext(file.filename)[0]
@@ -92,50 +285,65 @@ async def upload_and_process_pdf(
         input_filename = f"{original_filename}_{timestamp}.pdf"
         output_filename = f"processed_{input_filename}"
         
-        input_path = os.path.join(temp_dir, input_filename)
-        output_path = os.path.join(temp_dir, output_filename)
-        
-        # Guardar archivo subido
-        with open(input_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        # Parsear instrucciones de inserción desde el string JSON
-        try:
-            insertions_data = json.loads(insertions) if insertions else []
-        except json.JSONDecodeError:
-            raise HTTPException(status_code=400, detail="El JSON de inserciones es inválido")
+        # Mantener el archivo subido en memoria (solo se vuelca a /tmp si es muy grande)
+        pdf_source = spool_pdf(iter(lambda: file.file.read(SPOOL_CHUNK_SIZE), b""), temp_dir=temp_dir)
 
         # Preparar datos para el procesador
         pdf_data = {
-            "pdf_path": input_path,
-            "output_path": output_path,
-            "insertions": insertions_data
+            **pdf_source,
+            "insertions": insertions_data,
+            "incremental": incremental,
+            "save_profile": save_profile,
+            "large_document": large_document,
+            "parallel_workers": parallel_workers,
+            "sign": {"reason": sign_reason, "location": sign_location,
+                     "timestamp": sign_ltv, "ltv": sign_ltv} if sign else None,
+            "deadline": request_deadline(http_request)
         }
         
         try:
-            # Procesar el PDF
-            processor.process_pdf(pdf_data)
+            if content_addressed:
+                output_filename, existing = content_addressed_output(pdf_source, insertions_data, pdf_data)
+                if existing:
+                    return stored_response(existing, stream)
+
+            # Con clave por contenido el resultado se guarda siempre y se
+            # devuelve desde el almacenamiento
+            if stream and not content_addressed:
+                response = await pdf_streaming_response(pdf_source, pdf_data, output_filename)
+                if response is not None:
+                    return response
 
-            # Subir el archivo procesado a S3
-            s3_client.upload_file(output_path, S3_BUCKET_NAME, output_filename)
+            # Procesar el PDF serializándolo directamente en el almacenamiento
+            # (subida multipart a S3 en Lambda), sin pasar por /tmp
+            storage = get_storage("s3")
+            with storage.open_write(output_filename) as writer:
+                get_processor().process_pdf({**pdf_data, "output_stream": writer})
 
             # Generar una URL prefirmada para el archivo
-            presigned_url = s3_client.generate_presigned_url(
-                'get_object',
-                Params={'Bucket': S3_BUCKET_NAME, 'Key': output_filename},
-                ExpiresIn=3600  # La URL expira en 1 hora
-            )
+            presigned_url = storage.url(output_filename, expires_in=3600)  # La URL expira en 1 hora
             
-            return {
+            return stored_response({
                 "success": True,
                 "message": "PDF procesado y subido a S3 exitosamente.",
                 "download_url": presigned_url,
                 "s3_bucket": S3_BUCKET_NAME,
-                "s3_key": output_filename
-            }
+                "s3_key": output_filename,
+                "size": writer.size,
+                "sha256": writer.sha256,
+                "input_sha256": get_processor().fingerprints["input_sha256"],
+                "input_size": get_processor().fingerprints["input_size"],
+                "reused": False
+            }, stream and content_addressed)
 
+        except HTTPException:
+            raise
         except FileNotFoundError as e:
             raise HTTPException(status_code=404, detail=str(e))
+        except MemoryLimitExceeded as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except DeadlineExceeded as e:
+            raise deadline_error(e)
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
         except NoCredentialsError:
@@ -144,15 +352,21 @@ async def upload_and_process_pdf(
             raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}")
 
 @app.post("/process-from-url")
-async def process_from_url(request: ProcessURLRequest):
+async def process_from_url(request: ProcessURLRequest, http_request: Request):
     """
-    Descarga un PDF desde una URL, lo procesa y lo sube a S3.
+    Descarga un PDF desde una URL (http(s):// o s3://), lo procesa y lo sube a S3.
     """
-    try:
-        response = requests.get(request.pdf_path, stream=True)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        raise HTTPException(status_code=400, detail=f"Error al descargar el archivo desde la URL: {e}")
+    from botocore.exceptions import NoCredentialsError
+    from processor import DeadlineExceeded, MemoryLimitExceeded, spool_pdf, SPOOL_CHUNK_SIZE
+
+    from_s3 = request.pdf_path.startswith("s3://")
+    if not from_s3:
+        import requests
+        try:
+            response = requests.get(request.pdf_path, stream=True)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            raise HTTPException(status_code=400, detail=f"Error al descargar el archivo desde la URL: {e}")
 
     with tempfile.TemporaryDirectory() as temp_dir:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -166,15 +380,23 @@ async def process_from_url(request: ProcessURLRequest):
         input_filename = f"{original_filename}_{timestamp}.pdf"
         output_filename = f"processed_{input_filename}"
         
-        input_path = os.path.join(temp_dir, input_filename)
-        output_path = os.path.join(temp_dir, output_filename)
-        
-        # Guardar archivo descargado
-        try:
-            with open(input_path, "wb") as buffer:
-                shutil.copyfileobj(response.raw, buffer)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error al guardar el archivo descargado: {e}")
+        if from_s3 and (request.content_addressed or request.stream):
+            # El hash y la estimación del tamaño necesitan los bytes de entrada
+            from storage import S3Storage, parse_s3_uri
+            bucket, key = parse_s3_uri(request.pdf_path)
+            try:
+                pdf_source = spool_pdf(S3Storage(bucket).iter_chunks(key, SPOOL_CHUNK_SIZE), temp_dir=temp_dir)
+            except FileNotFoundError as e:
+                raise HTTPException(status_code=404, detail=str(e))
+        elif from_s3:
+            # El procesador lee el objeto directamente con el cliente S3 compartido
+            pdf_source = {"pdf_path": request.pdf_path}
+        else:
+            # Mantener el archivo descargado en memoria (solo se vuelca a /tmp si es muy grande)
+            try:
+                pdf_source = spool_pdf(response.iter_content(chunk_size=SPOOL_CHUNK_SIZE), temp_dir=temp_dir)
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Error al leer el archivo descargado: {e}")
 
         # Preparar datos para el procesador
         # La validación de pydantic ya nos da `Insertion` objects.
@@ -182,35 +404,60 @@ async def process_from_url(request: ProcessURLRequest):
         insertions_data = [insertion.dict() for insertion in request.insertions]
         
         pdf_data = {
-            "pdf_path": input_path,
-            "output_path": output_path,
-            "insertions": insertions_data
+            **pdf_source,
+            "insertions": insertions_data,
+            "incremental": request.incremental,
+            "save_profile": request.save_profile,
+            "large_document": request.large_document,
+            "parallel_workers": request.parallel_workers,
+            "sign": request.sign.dict() if request.sign else None,
+            "remove_stamps": request.remove_stamps,
+            "deadline": request_deadline(http_request)
         }
         
         try:
-            # Procesar el PDF
-            processor.process_pdf(pdf_data)
+            if request.content_addressed:
+                output_filename, existing = content_addressed_output(pdf_source, insertions_data, pdf_data)
+                if existing:
+                    return stored_response(existing, request.stream)
+
+            # Con clave por contenido el resultado se guarda siempre y se
+            # devuelve desde el almacenamiento
+            if request.stream and not request.content_addressed:
+                response = await pdf_streaming_response(pdf_source, pdf_data, output_filename)
+                if response is not None:
+                    return response
 
-            # Subir el archivo procesado a S3
-            s3_client.upload_file(output_path, S3_BUCKET_NAME, output_filename)
+            # Procesar el PDF serializándolo directamente en el almacenamiento
+            # (subida multipart a S3 en Lambda), sin pasar por /tmp
+            storage = get_storage("s3")
+            with storage.open_write(output_filename) as writer:
+                get_processor().process_pdf({**pdf_data, "output_stream": writer})
 
             # Generar una URL prefirmada para el archivo
-            presigned_url = s3_client.generate_presigned_url(
-                'get_object',
-                Params={'Bucket': S3_BUCKET_NAME, 'Key': output_filename},
-                ExpiresIn=3600
-            )
+            presigned_url = storage.url(output_filename, expires_in=3600)
             
-            return {
+            return stored_response({
                 "success": True,
                 "message": "PDF procesado y subido a S3 exitosamente desde URL.",
                 "download_url": presigned_url,
                 "s3_bucket": S3_BUCKET_NAME,
-                "s3_key": output_filename
-            }
+                "s3_key": output_filename,
+                "size": writer.size,
+                "sha256": writer.sha256,
+                "input_sha256": get_processor().fingerprints["input_sha256"],
+                "input_size": get_processor().fingerprints["input_size"],
+                "reused": False
+            }, request.stream and request.content_addressed)
 
+        except HTTPException:
+            raise
         except FileNotFoundError as e:
             raise HTTPException(status_code=404, detail=str(e))
+        except MemoryLimitExceeded as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except DeadlineExceeded as e:
+            raise deadline_error(e)
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
         except NoCredentialsError:
@@ -218,6 +465,203 @@ async def process_from_url(request: ProcessURLRequest):
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}")
 
+@app.post("/upload-url")
+async def create_upload_url(request: UploadJobRequest):
+    """
+    Crea un trabajo y devuelve un POST prefirmado para subir el PDF
+    directamente a S3. Al completarse la subida, s3_event_handler procesa el
+    PDF con estas inserciones; el estado se consulta en /jobs/{job_id}.
+    """
+    from jobs import create_job
+
+    job = create_job(
+        get_storage("s3"),
+        [insertion.dict() for insertion in request.insertions],
+        {
+            "incremental": request.incremental,
+            "save_profile": request.save_profile,
+            "large_document": request.large_document,
+            "parallel_workers": request.parallel_workers,
+            "sign": request.sign.dict() if request.sign else None
+        }
+    )
+    return {
+        "success": True,
+        "job_id": job["job_id"],
+        "upload": job["upload"],
+        "input_key": job["input_key"],
+        "output_key": job["output_key"],
+        "status_url": f"/jobs/{job['job_id']}"
+    }
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Estado de un trabajo; si está completado incluye la URL de descarga"""
+    from jobs import load_job
+
+    storage = get_storage("s3")
+    try:
+        job = load_job(storage, job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado")
+
+    response = {key: value for key, value in job.items() if key not in ("insertions", "options")}
+    if job["status"] == "completed":
+        response["download_url"] = storage.url(job["output_key"], expires_in=3600)
+    return response
+
+@app.post("/fingerprint")
+async def fingerprint(request: FingerprintRequest):
+    """
+    SHA-256 de un archivo remoto leído en streaming (los objetos de S3
+    grandes, por rangos en paralelo), sin guardarlo en memoria ni en /tmp
+
+    Returns:
+        dict: source, sha256 y size
+    """
+    from fastapi.concurrency import run_in_threadpool
+
+    if (request.pdf_path is None) == (request.key is None):
+        raise HTTPException(status_code=400, detail="Indique pdf_path o key")
+    source = request.pdf_path or f"s3://{S3_BUCKET_NAME}/{request.key}"
+    processor = get_processor()
+    if not processor._is_url(source):
+        raise HTTPException(status_code=400, detail="pdf_path debe ser una URL http(s):// o s3://")
+
+    try:
+        return {"success": True, **await run_in_threadpool(processor.fingerprint, source)}
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error calculando la huella: {str(e)}")
+
+@app.post("/verify")
+async def verify_signatures(file: UploadFile = File(None), key: str = None):
+    """
+    Verifica las firmas de un PDF subido o de un PDF del almacenamiento (S3)
+    
+    Args:
+        file: PDF a verificar
+        key: Clave de un PDF ya guardado (alternativa a file)
+        
+    Returns:
+        dict: Por cada campo de firma, integridad (hash del /ByteRange y
+        firma CMS), confianza de la cadena de certificados y errores
+    """
+    from verification import verify_pdf
+    from processor import SPOOL_CHUNK_SIZE
+
+    storage = get_storage("s3")
+
+    if (file is None) == (key is None):
+        raise HTTPException(status_code=400, detail="Indique file o key")
+    if key is not None and not storage.exists(key):
+        raise HTTPException(status_code=404, detail="Archivo no encontrado")
+    
+    # La verificación lee el archivo por rangos: copiarlo a un temporal
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as f:
+        if file is not None:
+            for chunk in iter(lambda: file.file.read(SPOOL_CHUNK_SIZE), b""):
+                f.write(chunk)
+        else:
+            for chunk in storage.iter_chunks(key):
+                f.write(chunk)
+        f.flush()
+        try:
+            return verify_pdf(f.name)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"No se pudo verificar el PDF: {str(e)}")
+
+
+def s3_event_handler(event, context):
+    """
+    Handler para eventos s3:ObjectCreated:* sobre el prefijo uploads/
+
+    Procesa cada PDF subido con las instrucciones de su trabajo y guarda el
+    resultado. Se puede invocar en local con un evento sintético:
+        {"Records": [{"eventSource": "aws:s3",
+                      "s3": {"bucket": {"name": "mi-bucket"},
+                             "object": {"key": "uploads/<job_id>.pdf"}}}]}
+
+    Si el tiempo de la invocación se agota, el trabajo guarda un checkpoint
+    y la función se vuelve a invocar a sí misma para continuarlo.
+
+    Returns:
+        dict: Claves procesadas, reanudadas y fallidas (con su error)
+    """
+    from jobs import JobCheckpointed, resume_job_async, run_job, storage_for_bucket, UPLOAD_PREFIX
+    from processor import deadline_from_context
+
+    processed, resumed, failed = [], [], []
+    deadline = deadline_from_context(context)
+    started = False
+    with invocation_stats("evento S3"):
+        for record in event.get("Records", []):
+            if record.get("eventSource") != "aws:s3":
+                continue
+            bucket = record["s3"]["bucket"]["name"]
+            key = unquote_plus(record["s3"]["object"]["key"])
+            if not key.startswith(UPLOAD_PREFIX):
+                print(f"⏭️ Objeto ignorado (fuera de {UPLOAD_PREFIX}): {key}")
+                continue
+
+            print(f"📥 Procesando subida s3://{bucket}/{key}")
+            try:
+                if started and deadline is not None and time.monotonic() >= deadline:
+                    # Los registros anteriores agotaron el plazo: este pasa
+                    # entero a otra invocación
+                    raise JobCheckpointed("Tiempo agotado antes de empezar")
+                started = True
+                job = run_job(storage_for_bucket(bucket), get_processor(), key, deadline)
+                processed.append({"key": key, "output_key": job["output_key"]})
+            except JobCheckpointed as e:
+                print(f"⏸️ {key}: {e}")
+                try:
+                    resume_job_async(context, bucket, key)
+                    resumed.append({"key": key, "detail": str(e)})
+                except Exception as resume_error:
+                    print(f"❌ No se pudo programar la reanudación de {key}: {resume_error}")
+                    failed.append({"key": key, "error": str(resume_error)})
+            except Exception as e:
+                print(f"❌ Error procesando {key}: {e}")
+                failed.append({"key": key, "error": str(e)})
+
+    return {"processed": processed, "resumed": resumed, "failed": failed}
+
+
+def batch_handler(event, context):
+    """
+    Handler para lotes de SQS (o eventos de S3 con varios registros)
+
+    Procesa los registros en procesos concurrentes y devuelve
+    batchItemFailures para que SQS reintente solo los mensajes fallidos
+    (requiere ReportBatchItemFailures en el event source mapping).
+    """
+    from batch import run_batch
+
+    with invocation_stats("lote"):
+        return run_batch(event, context, get_processor())
+
+
+def fanout_handler(event, context):
+    """
+    Handler de los rangos de páginas con PDF_FANOUT_MODE=lambda: procesa un
+    rango y guarda el PDF resultante en event["output_key"]. Se despliega
+    con la misma imagen en la función PDF_FANOUT_FUNCTION.
+    """
+    from fanout import run_range_event
+
+    with invocation_stats("rango"):
+        return run_range_event(event, get_processor())
+
+
+# Handler de Mangum para AWS Lambda (creado una vez por contenedor)
+handler = Mangum(app, lifespan="off")
+
 
-# Handler de Mangum para AWS Lambda
-handler = Mangum(app) 
\ No newline at end of file
+def lambda_handler(event, context):
+    """Handler HTTP; registra la tasa de aciertos de la caché de /tmp por invocación"""
+    with invocation_stats():
+        return handler(event, context) 
\ No newline at end of file
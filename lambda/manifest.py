@@ -0,0 +1,345 @@
+"""
+Manifest Module
+Firma en bloque de muchos PDFs con una sola operación de clave privada
+
+sign_manifest calcula el SHA-256 de cada documento leyéndolo por bloques,
+construye un árbol de Merkle con todos los hashes y firma una sola vez una
+declaración con la raíz (CMS separada, como en signing.py). Después cada
+PDF recibe, en una actualización incremental, un adjunto merkle-proof.json
+con la declaración firmada y su prueba de inclusión, y un sello visible de
+verificación.
+
+verify_document comprueba un documento sin el resto del lote: hashea los
+bytes anteriores a la actualización de la prueba, sube por el árbol con los
+log2(n) hermanos de la prueba hasta la raíz y valida la firma de la
+declaración y la cadena del firmante (ver verification.py).
+
+Las hojas y los nodos llevan prefijos distintos (0x00 y 0x01, como en RFC
+6962) y un nodo sin pareja sube tal cual al nivel siguiente.
+"""
+
+import base64
+import datetime
+import hashlib
+import json
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Tuple
+
+import fitz  # PyMuPDF
+
+from signing import SIGNING_CHUNK_SIZE, SigningError
+
+
+PROOF_ATTACHMENT = "merkle-proof.json"
+TREE_SCHEME = "sha256-rfc6962-prefix"
+
+
+def hash_file(path: str, length: int = None) -> bytes:
+    """
+    SHA-256 de un archivo (o de sus primeros length bytes) leído por bloques
+
+    Args:
+        path: Archivo local
+        length: Bytes a hashear desde el inicio (por defecto, todo)
+
+    Returns:
+        bytes: Hash SHA-256
+    """
+    digest = hashlib.sha256()
+    remaining = os.path.getsize(path) if length is None else length
+    with open(path, "rb") as f:
+        while remaining > 0:
+            chunk = f.read(min(SIGNING_CHUNK_SIZE, remaining))
+            if not chunk:
+                raise SigningError(f"{path} es más corto que la longitud firmada")
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest.digest()
+
+
+def _leaf_hash(document_hash: bytes) -> bytes:
+    return hashlib.sha256(b"\x00" + document_hash).digest()
+
+
+def _node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def merkle_levels(document_hashes: List[bytes]) -> List[List[bytes]]:
+    """
+    Niveles del árbol de Merkle, de las hojas a la raíz
+
+    Args:
+        document_hashes: SHA-256 de cada documento, en orden
+
+    Returns:
+        List[List[bytes]]: levels[0] son las hojas y levels[-1] == [raíz]
+    """
+    if not document_hashes:
+        raise SigningError("El manifiesto necesita al menos un documento")
+    levels = [[_leaf_hash(document_hash) for document_hash in document_hashes]]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [_node_hash(level[index], level[index + 1]) for index in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])  # El nodo sin pareja sube sin cambios
+        levels.append(parents)
+    return levels
+
+
+def merkle_proof(levels: List[List[bytes]], index: int) -> List[Tuple[str, str]]:
+    """
+    Prueba de inclusión de la hoja index
+
+    Returns:
+        List[Tuple[str, str]]: (lado del hermano, "left" o "right", y su
+        hash en hex) de las hojas hacia la raíz
+    """
+    proof = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append(("left" if sibling < index else "right", level[sibling].hex()))
+        index //= 2
+    return proof
+
+
+def root_from_proof(document_hash: bytes, proof: List[Tuple[str, str]]) -> bytes:
+    """Raíz que resulta de subir desde el hash del documento con la prueba"""
+    node = _leaf_hash(document_hash)
+    for side, sibling in proof:
+        sibling = bytes.fromhex(sibling)
+        node = _node_hash(sibling, node) if side == "left" else _node_hash(node, sibling)
+    return node
+
+
+def _canonical_json(value: Dict[str, Any]) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def sign_manifest(paths: List[str], signer=None, manifest_path: str = None,
+                  stamp: bool = True) -> Dict[str, Any]:
+    """
+    Firma un lote de PDFs con una sola firma sobre la raíz de Merkle
+
+    Los documentos se modifican en su sitio: cada uno recibe su prueba de
+    inclusión como adjunto (y el sello, si stamp) en una actualización
+    incremental que no entra en su hash
+
+    Args:
+        paths: PDFs a firmar (se modifican)
+        signer: signing.PDFSigner (por defecto, get_signer())
+        manifest_path: Dónde escribir el manifiesto completo (JSON), si se quiere
+        stamp: Añadir en la primera página un sello visible de verificación
+
+    Returns:
+        Dict[str, Any]: manifest_id, root, count, results (uno por ruta, en
+        orden, con success, index, sha256 o error), signed, failed,
+        seconds, documents_per_second y manifest_path
+    """
+    if signer is None:
+        from signing import get_signer
+        signer = get_signer()
+
+    start = time.perf_counter()
+    results: List[Dict[str, Any]] = []
+    entries = []
+    for path in paths:
+        try:
+            doc = fitz.open(path)
+            try:
+                if doc.is_encrypted or not doc.can_save_incrementally():
+                    raise SigningError("El PDF no admite una actualización incremental para la prueba")
+            finally:
+                doc.close()
+            signed_length = os.path.getsize(path)
+            document_hash = hash_file(path)
+            results.append({"success": True, "path": path, "index": len(entries),
+                            "sha256": document_hash.hex()})
+            entries.append((path, document_hash, signed_length))
+        except Exception as e:
+            results.append({"success": False, "path": path, "error": str(e)})
+
+    if not entries:
+        raise SigningError("Ningún documento del lote se pudo preparar")
+
+    levels = merkle_levels([document_hash for _, document_hash, _ in entries])
+    root = levels[-1][0].hex()
+    statement_fields = {
+        "manifest_id": uuid.uuid4().hex,
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "count": len(entries),
+        "root": root,
+        "tree": TREE_SCHEME
+    }
+    statement = _canonical_json(statement_fields)
+    # La única operación de clave privada del lote
+    signature = signer.sign_digest(hashlib.sha256(statement.encode("utf-8")).digest())
+    signature_b64 = base64.b64encode(signature).decode("ascii")
+
+    for result in results:
+        if not result["success"]:
+            continue
+        path, _, signed_length = entries[result["index"]]
+        try:
+            _embed_proof(path, {
+                "version": 1,
+                "statement": statement,
+                "signature": signature_b64,
+                "index": result["index"],
+                "sha256": result["sha256"],
+                "signed_length": signed_length,
+                "proof": merkle_proof(levels, result["index"])
+            }, statement_fields if stamp else None)
+        except Exception as e:
+            result.update({"success": False, "error": str(e)})
+
+    if manifest_path:
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "statement": statement,
+                "signature": signature_b64,
+                "documents": [
+                    {"index": index, "name": os.path.basename(path), "sha256": document_hash.hex()}
+                    for index, (path, document_hash, _) in enumerate(entries)
+                ]
+            }, f, ensure_ascii=False, indent=2)
+
+    elapsed = time.perf_counter() - start
+    signed = sum(1 for result in results if result["success"])
+    for result in results:
+        if not result["success"]:
+            print(f"❌ {result['path']}: {result['error']}")
+    print(f"🌳 Manifiesto {statement_fields['manifest_id'][:8]}: {signed} de {len(paths)} documentos "
+          f"en {elapsed:.2f}s con una firma (raíz {root[:16]}…)")
+    return {
+        "manifest_id": statement_fields["manifest_id"],
+        "root": root,
+        "count": len(entries),
+        "results": results,
+        "signed": signed,
+        "failed": len(paths) - signed,
+        "seconds": elapsed,
+        "documents_per_second": signed / elapsed if elapsed else 0.0,
+        "manifest_path": manifest_path
+    }
+
+
+def _embed_proof(path: str, proof: Dict[str, Any], statement: Dict[str, Any] = None):
+    """Adjunta la prueba (y el sello) en una actualización incremental"""
+    doc = fitz.open(path)
+    try:
+        doc.embfile_add(PROOF_ATTACHMENT, json.dumps(proof).encode("utf-8"), filename=PROOF_ATTACHMENT,
+                        desc="Prueba de inclusión en el manifiesto firmado")
+        if statement is not None and len(doc):
+            page = doc[0]
+            page.insert_text(
+                (page.rect.x0 + 20, page.rect.y1 - 10),
+                f"Firmado en lote {statement['manifest_id'][:8]} · documento {proof['index'] + 1}"
+                f"/{statement['count']} · raíz {statement['root'][:16]}",
+                fontsize=6,
+                color=(0.3, 0.3, 0.3)
+            )
+        doc.saveIncr()
+    finally:
+        doc.close()
+
+
+def read_proof(path: str) -> Dict[str, Any]:
+    """Prueba de inclusión adjunta al PDF, o None si no tiene"""
+    doc = fitz.open(path)
+    try:
+        if PROOF_ATTACHMENT not in doc.embfile_names():
+            return None
+        return json.loads(doc.embfile_get(PROOF_ATTACHMENT))
+    finally:
+        doc.close()
+
+
+def verify_document(path: str, manifest_path: str = None, validator=None) -> Dict[str, Any]:
+    """
+    Verifica un documento firmado con sign_manifest en O(log n)
+
+    Args:
+        path: PDF con merkle-proof.json adjunto
+        manifest_path: Manifiesto del lote para comprobar además que el
+            documento figura en él (opcional)
+        validator: verification.ChainValidator (por defecto, el del proceso)
+
+    Returns:
+        Dict[str, Any]: manifest_id, index, root, integrity (el hash sube
+        hasta la raíz firmada), trusted, signer, unsigned_bytes (bytes
+        añadidos tras el hash: prueba y sello), valid y errors
+    """
+    from asn1crypto import cms
+    from cryptography import x509
+    from verification import _check_signature, _find_signer_certificate, get_chain_validator
+
+    proof = read_proof(path)
+    if proof is None:
+        raise SigningError("El PDF no tiene prueba de inclusión de un manifiesto")
+    statement = json.loads(proof["statement"])
+    result = {
+        "manifest_id": statement["manifest_id"],
+        "created_at": statement["created_at"],
+        "index": proof["index"],
+        "count": statement["count"],
+        "root": statement["root"],
+        "unsigned_bytes": os.path.getsize(path) - proof["signed_length"],
+        "integrity": False,
+        "trusted": False,
+        "errors": []
+    }
+    errors = result["errors"]
+
+    document_hash = hash_file(path, proof["signed_length"])
+    if document_hash.hex() != proof["sha256"]:
+        errors.append("El hash del documento no coincide con el de la prueba")
+    elif root_from_proof(document_hash, proof["proof"]).hex() != statement["root"]:
+        errors.append("La prueba de inclusión no lleva a la raíz del manifiesto")
+    if statement.get("tree") != TREE_SCHEME:
+        errors.append(f"Esquema de árbol no soportado: {statement.get('tree')}")
+
+    signed_data = cms.ContentInfo.load(base64.b64decode(proof["signature"]))["content"]
+    signer_info = signed_data["signer_infos"][0]
+    certificates = [
+        x509.load_der_x509_certificate(choice.chosen.dump())
+        for choice in signed_data["certificates"] or []
+        if choice.name == "certificate"
+    ]
+    signer_cert = _find_signer_certificate(signer_info["sid"], certificates)
+    hash_name = signer_info["digest_algorithm"]["algorithm"].native
+    message_digest = None
+    for attribute in signer_info["signed_attrs"]:
+        if attribute["type"].native == "message_digest":
+            message_digest = attribute["values"][0].native
+    if message_digest != hashlib.new(hash_name, proof["statement"].encode("utf-8")).digest():
+        errors.append("La firma no corresponde a la declaración del manifiesto")
+    else:
+        try:
+            _check_signature(signer_cert, signer_info, hash_name)
+        except Exception as e:
+            errors.append(f"Firma criptográfica no válida: {e or type(e).__name__}")
+    result["integrity"] = not errors
+    result["signer"] = signer_cert.subject.rfc4514_string()
+
+    if manifest_path:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        documents = manifest.get("documents", [])
+        if manifest.get("statement") != proof["statement"]:
+            errors.append("El documento pertenece a otro manifiesto")
+        elif proof["index"] >= len(documents) or documents[proof["index"]]["sha256"] != proof["sha256"]:
+            errors.append("El documento no figura en el manifiesto con ese hash")
+
+    chain = (validator or get_chain_validator()).validate(
+        signer_cert, [cert for cert in certificates if cert != signer_cert]
+    )
+    result["trusted"] = chain["trusted"]
+    result["chain"] = chain["chain"]
+    if chain["error"]:
+        errors.append(chain["error"])
+    result["valid"] = not errors
+    return result
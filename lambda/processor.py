@@ -1,24 +1,347 @@
 """
 PDF Processor Module
-Maneja la inserción de texto e imágenes en PDFs usando PyMuPDF
+Maneja la inserción de texto, imágenes y códigos QR en PDFs usando PyMuPDF
+
+requests y PIL se importan solo cuando se necesitan, para no penalizar el
+arranque en frío en Lambda
 """
 
 import fitz  # PyMuPDF
 import os
-import requests
 import tempfile
-from typing import List, Dict, Any, Union
-from PIL import Image, ImageOps
+from typing import List, Dict, Any, Union, Iterable
 import io
+import gc
+import hashlib
+import json
+import mmap
+import shutil
+import time
 from urllib.parse import urlparse
 import sys
 
 
+# Perfiles de guardado: argumentos de fitz.Document.save() para cada uno.
+# "fast" minimiza la latencia, "compact" minimiza el tamaño y "web" genera
+# un PDF linealizado para visualización progresiva.
+SAVE_PROFILES = {
+    "fast": {},
+    "compact": {
+        "garbage": 4,
+        "clean": 1,
+        "deflate": 1,
+        "deflate_images": 1,
+        "deflate_fonts": 1,
+    },
+    "web": {
+        "garbage": 3,
+        "deflate": 1,
+        "linear": 1,
+    },
+}
+
+DEFAULT_SAVE_PROFILE = os.environ.get("PDF_SAVE_PROFILE", "fast")
+
+# PDFs de hasta este tamaño se mantienen en memoria; los mayores se vuelcan a disco
+SPOOL_MAX_BYTES = int(os.environ.get("PDF_SPOOL_MAX_BYTES", 64 * 1024 * 1024))
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+
+def spool_pdf(chunks: Iterable[bytes], max_bytes: int = None, temp_dir: str = None) -> Dict[str, Any]:
+    """
+    Acumula un PDF en memoria y solo lo vuelca a disco si supera max_bytes
+    
+    Args:
+        chunks: Iterable con los bloques de bytes del PDF
+        max_bytes: Umbral en bytes (por defecto SPOOL_MAX_BYTES)
+        temp_dir: Directorio donde volcar el archivo si supera el umbral
+        
+    Returns:
+        Dict[str, Any]: {"pdf_stream": bytearray} si cabe en memoria, o
+        {"pdf_path": ruta} si se volcó a disco, con el SHA-256 y el tamaño
+        de la entrada calculados al leerla (input_sha256, input_size). El
+        llamador debe eliminar el archivo volcado. Se puede combinar
+        directamente con pdf_data
+    """
+    if max_bytes is None:
+        max_bytes = SPOOL_MAX_BYTES
+    
+    chunks = iter(chunks)
+    buffer = bytearray()
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk)
+        buffer += chunk
+        if len(buffer) > max_bytes:
+            break
+    else:
+        return {"pdf_stream": buffer, "input_sha256": digest.hexdigest(), "input_size": len(buffer)}
+    
+    # Archivo muy grande: volcar lo acumulado y el resto directamente a disco
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf", dir=temp_dir) as f:
+        f.write(buffer)
+        del buffer
+        for chunk in chunks:
+            digest.update(chunk)
+            f.write(chunk)
+        size = f.tell()
+    print(f"💾 PDF mayor de {max_bytes} bytes volcado a disco: {f.name}")
+    return {"pdf_path": f.name, "input_sha256": digest.hexdigest(), "input_size": size}
+
+
+def file_digest(path: str, hash_name: str = "sha256") -> Dict[str, Any]:
+    """
+    Hash de un archivo local mapeado en memoria: el sistema lee las páginas
+    bajo demanda, sin copiarlo entero al heap ni leerlo por bloques en Python
+    
+    Args:
+        path: Ruta del archivo
+        hash_name: Algoritmo de hashlib
+        
+    Returns:
+        Dict[str, Any]: {"sha256": hex, "size": bytes} (la clave es hash_name)
+    """
+    digest = hashlib.new(hash_name)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                # hashlib libera el GIL mientras recorre el búfer
+                with memoryview(mapped) as view:
+                    digest.update(view)
+    return {hash_name: digest.hexdigest(), "size": size}
+
+
+class DigestWriter:
+    """
+    Envuelve un objeto con write() y calcula el SHA-256 y el tamaño de lo
+    que se escribe en él (la escritura es secuencial, como en storage.py)
+    """
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._hash = hashlib.sha256()
+        self._position = 0
+    
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+    
+    @property
+    def size(self) -> int:
+        return self._position
+    
+    def write(self, data) -> int:
+        self._hash.update(data)
+        self.stream.write(data)
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def seekable(self) -> bool:
+        return False
+    
+    def seek(self, offset: int, whence: int = 0) -> int:
+        # PyMuPDF exige que el objeto tenga seek(); la escritura es secuencial
+        raise io.UnsupportedOperation("La escritura con hash es secuencial")
+    
+    def writable(self) -> bool:
+        return True
+    
+    def flush(self):
+        if hasattr(self.stream, "flush"):
+            self.stream.flush()
+
+
+# Versión del motor de procesamiento. Forma parte de las claves por
+# contenido: incrementarla cuando cambie el PDF generado para una misma
+# entrada invalida los resultados anteriores
+ENGINE_VERSION = "1"
+
+
+def _canonical(value: Any) -> Any:
+    """Normaliza números para el JSON canónico (1.0 y 1 son la misma coordenada)"""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {key: _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    return value
+
+
+def content_hash(pdf_source: Dict[str, Any], insertions: List[Dict[str, Any]],
+                 options: Dict[str, Any] = None) -> str:
+    """
+    SHA-256 que identifica el resultado de procesar un PDF
+    
+    Combina la versión del motor (y de PyMuPDF), las inserciones y las
+    opciones que afectan a la salida en JSON canónico, y los bytes del PDF
+    de entrada. Las imágenes remotas entran por su URL, no por su contenido.
+    
+    Args:
+        pdf_source: {"pdf_stream": bytes} o {"pdf_path": ruta local}
+        insertions: Inserciones a aplicar
+        options: incremental, save_profile, sign y remove_stamps
+            (large_document no cambia la salida), más signer (huella del
+            certificado del firmante) y tsa (URL de la TSA) si quien llama
+            los añade para las salidas firmadas
+        
+    Returns:
+        str: Hash hexadecimal
+    """
+    options = options or {}
+    normalized = {
+        "engine": ENGINE_VERSION,
+        "pymupdf": fitz.VersionBind,
+        "insertions": _canonical(insertions),
+        "incremental": bool(options.get("incremental")),
+        "save_profile": options.get("save_profile") or DEFAULT_SAVE_PROFILE
+    }
+    if options.get("sign"):
+        # Solo cuando se pide, para no cambiar las claves sin firma
+        normalized["sign"] = _canonical(options["sign"])
+    for key in ("signer", "tsa"):
+        if options.get(key):
+            normalized[key] = options[key]
+    if options.get("remove_stamps"):
+        normalized["remove_stamps"] = sorted(options["remove_stamps"])
+    digest = hashlib.sha256()
+    digest.update(json.dumps(normalized, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+    digest.update(b"\n")
+    
+    if pdf_source.get("pdf_stream") is not None:
+        digest.update(pdf_source["pdf_stream"])
+    else:
+        with open(pdf_source["pdf_path"], "rb") as f:
+            for chunk in iter(lambda: f.read(SPOOL_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Modo para documentos grandes: límite del store de MuPDF, cada cuántas
+# páginas se libera memoria y límite de RSS por trabajo (0 = sin límite)
+STORE_MAX_BYTES = int(os.environ.get("PDF_STORE_MAX_BYTES", 64 * 1024 * 1024))
+RELEASE_EVERY_PAGES = int(os.environ.get("PDF_RELEASE_EVERY_PAGES", 50))
+
+
+def _default_memory_limit_mb() -> int:
+    """
+    Límite de memoria por defecto: PDF_MEMORY_LIMIT_MB o, en Lambda, el 90%
+    de la memoria asignada a la función
+    """
+    if "PDF_MEMORY_LIMIT_MB" in os.environ:
+        return int(os.environ["PDF_MEMORY_LIMIT_MB"])
+    lambda_memory = os.environ.get("AWS_LAMBDA_FUNCTION_MEMORY_SIZE")
+    if lambda_memory:
+        return int(int(lambda_memory) * 0.9)
+    return 0
+
+
+def current_rss_mb() -> float:
+    """
+    Memoria residente actual del proceso en MB
+    
+    Returns:
+        float: RSS actual (o el pico si /proc no está disponible)
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss está en KB en Linux y en bytes en macOS
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class MemoryLimitExceeded(Exception):
+    """El trabajo superó el límite de memoria configurado"""
+    pass
+
+
+# Tiempo reservado antes del timeout para guardar el checkpoint (o la salida)
+DEADLINE_MARGIN_SECONDS = float(os.environ.get("PDF_DEADLINE_MARGIN_SECONDS", 10))
+
+
+class DeadlineExceeded(Exception):
+    """
+    Se agotó el plazo antes de procesar todas las páginas
+
+    Attributes:
+        pages_done: Páginas ya procesadas (las inserciones se aplican en orden
+            de página, así que son las primeras pages_done)
+        total_pages: Páginas del documento
+        checkpoint_path: Ruta del PDF parcial, si se pidió checkpoint_path
+    """
+
+    def __init__(self, pages_done: int, total_pages: int):
+        super().__init__(
+            f"Tiempo agotado tras procesar {pages_done} de {total_pages} páginas"
+        )
+        self.pages_done = pages_done
+        self.total_pages = total_pages
+        self.checkpoint_path = None
+
+
+def deadline_from_context(context, margin_seconds: float = None) -> Union[float, None]:
+    """
+    Plazo para dejar de procesar páginas según el tiempo restante de la
+    invocación de Lambda
+
+    Args:
+        context: Contexto de Lambda (None fuera de Lambda)
+        margin_seconds: Tiempo reservado para guardar (por defecto
+            PDF_DEADLINE_MARGIN_SECONDS)
+
+    Returns:
+        float: Instante en la escala de time.monotonic(), o None si no hay
+        contexto
+    """
+    if context is None or not hasattr(context, "get_remaining_time_in_millis"):
+        return None
+    if margin_seconds is None:
+        margin_seconds = DEADLINE_MARGIN_SECONDS
+    remaining = context.get_remaining_time_in_millis() / 1000 - margin_seconds
+    return time.monotonic() + max(remaining, 0)
+
+
 class PDFProcessor:
     """Clase para procesar y modificar PDFs"""
     
-    def __init__(self):
+    def __init__(self, save_profile: str = None, large_document: bool = False,
+                 store_max_bytes: int = None, release_every: int = None,
+                 memory_limit_mb: int = None):
         self.doc = None
+        self.save_profile = save_profile or DEFAULT_SAVE_PROFILE
+        if self.save_profile not in SAVE_PROFILES:
+            raise ValueError(f"Perfil de guardado no válido: {self.save_profile}")
+        
+        # Configuración del modo para documentos grandes
+        self.large_document = large_document
+        self.store_max_bytes = store_max_bytes if store_max_bytes is not None else STORE_MAX_BYTES
+        self.release_every = release_every or RELEASE_EVERY_PAGES
+        self.memory_limit_mb = memory_limit_mb if memory_limit_mb is not None else _default_memory_limit_mb()
+        
+        # Imágenes remotas ya descargadas (source -> ruta local), ver prefetch_assets
+        self.local_assets: Dict[str, str] = {}
+        
+        # SHA-256 y tamaño de la entrada y la salida del último process_pdf
+        self.fingerprints: Union[Dict[str, Any], None] = None
+        self.input_sha256: Union[str, None] = None
+        
+        # Documentos colocados con show_pdf_page en el documento actual (QR
+        # y orígenes vectoriales) por su clave: PyMuPDF reutiliza sus
+        # XObjects por id() del origen, así que deben seguir vivos hasta
+        # cerrar el documento
+        self.shown_sources: Dict[Any, fitz.Document] = {}
+        
+        # Sellos en modo "annotation" del documento actual: clave de
+        # apariencia -> (xref de su XObject, sello compilado)
+        self.stamp_forms: Dict[str, Any] = {}
     
     def _is_url(self, path: str) -> bool:
         """
@@ -36,39 +359,98 @@ class PDFProcessor:
         except:
             return False
     
-    def _download_file(self, url: str, temp_dir: str = None) -> str:
+    def _is_s3_uri(self, path: str) -> bool:
         """
-        Descarga un archivo desde una URL
+        Verifica si una ruta es una URI s3://bucket/key
         
         Args:
-            url: URL del archivo a descargar
-            temp_dir: Directorio temporal donde guardar el archivo
+            path: Ruta a verificar
             
         Returns:
-            str: Ruta del archivo descargado
+            bool: True si apunta a un objeto de S3
         """
-        if not temp_dir:
-            temp_dir = tempfile.gettempdir()
+        return isinstance(path, str) and path.startswith("s3://")
+    
+    def _iter_s3_object(self, uri: str) -> Iterable[bytes]:
+        """
+        Itera el contenido de un objeto de S3 con el cliente compartido del
+        proceso; los objetos grandes se leen con GETs por rangos en paralelo
+        
+        Args:
+            uri: URI s3://bucket/key
             
-        # Extraer nombre del archivo de la URL
-        parsed_url = urlparse(url)
-        filename = os.path.basename(parsed_url.path)
+        Returns:
+            Iterable[bytes]: Bloques del objeto en orden
+        """
+        from storage import S3Storage, parse_s3_uri
         
-        # Si no hay nombre de archivo en la URL, generar uno
-        if not filename or not filename.endswith('.pdf'):
-            filename = f"downloaded_pdf_{os.getpid()}.pdf"
+        bucket, key = parse_s3_uri(uri)
+        return S3Storage(bucket).iter_chunks(key, SPOOL_CHUNK_SIZE)
+    
+    def _fetch_cached(self, source: str) -> Union[Dict[str, Any], None]:
+        """
+        Obtiene un archivo remoto a través de la caché de /tmp (asset_cache)
+        
+        Args:
+            source: URL http(s):// o URI s3://
             
-        temp_path = os.path.join(temp_dir, filename)
+        Returns:
+            {"pdf_path": ruta, "cached": bool}, o None si la caché está
+            desactivada. Con "cached" False la ruta es un temporal a borrar
+        """
+        from asset_cache import get_asset_cache
         
+        cache = get_asset_cache()
+        if cache is None:
+            return None
+        path, cached = cache.fetch(source)
+        return {"pdf_path": path, "cached": cached}
+    
+    def _download_s3(self, uri: str, temp_dir: str = None) -> Dict[str, Any]:
+        """
+        Descarga un PDF desde S3 a través de la caché de /tmp o, si está
+        desactivada, en memoria si no supera SPOOL_MAX_BYTES
+        
+        Args:
+            uri: URI s3://bucket/key del PDF
+            temp_dir: Directorio temporal donde volcar archivos grandes
+            
+        Returns:
+            Dict[str, Any]: {"pdf_stream": bytes} o {"pdf_path": ruta, "cached": bool}
+        """
         try:
+            cached = self._fetch_cached(uri)
+            if cached is not None:
+                return cached
+            return spool_pdf(self._iter_s3_object(uri), temp_dir=temp_dir)
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            raise Exception(f"Error descargando archivo desde {uri}: {str(e)}")
+    
+    def _download_file(self, url: str, temp_dir: str = None) -> Dict[str, Any]:
+        """
+        Descarga un archivo desde una URL a través de la caché de /tmp o, si
+        está desactivada, en memoria si no supera SPOOL_MAX_BYTES
+        
+        Args:
+            url: URL del archivo a descargar
+            temp_dir: Directorio temporal donde volcar archivos grandes
+            
+        Returns:
+            Dict[str, Any]: {"pdf_stream": bytes} o {"pdf_path": ruta, "cached": bool}
+        """
+        import requests
+        
+        try:
+            cached = self._fetch_cached(url)
+            if cached is not None:
+                return cached
+            
             response = requests.get(url, stream=True, timeout=30)
             response.raise_for_status()
             
-            with open(temp_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-                    
-            return temp_path
+            return spool_pdf(response.iter_content(chunk_size=SPOOL_CHUNK_SIZE), temp_dir=temp_dir)
             
         except requests.exceptions.RequestException as e:
             raise Exception(f"Error descargando archivo desde {url}: {str(e)}")
@@ -97,6 +479,8 @@ class PDFProcessor:
             
         temp_path = os.path.join(temp_dir, filename)
         
+        import requests
+        
         try:
             response = requests.get(url, stream=True, timeout=30)
             response.raise_for_status()
@@ -110,57 +494,331 @@ class PDFProcessor:
         except requests.exceptions.RequestException as e:
             raise Exception(f"Error descargando imagen desde {url}: {str(e)}")
     
+    def prefetch_assets(self, sources: Iterable[str], temp_dir: str) -> Dict[str, str]:
+        """
+        Descarga una sola vez las imágenes remotas (http(s):// o s3://) para
+        que las inserciones posteriores las lean desde disco
+        
+        Args:
+            sources: Orígenes de imágenes; los locales se ignoran
+            temp_dir: Directorio donde guardar las descargas (debe existir
+                mientras se usen)
+            
+        Returns:
+            Dict[str, str]: source -> ruta local de las imágenes descargadas
+        """
+        for source in set(sources):
+            # Las descargas de un lote anterior pueden haberse borrado con su
+            # directorio temporal
+            if not source or (source in self.local_assets and os.path.exists(self.local_assets[source])):
+                continue
+            if not source.startswith(('http://', 'https://', 's3://')):
+                continue
+            
+            suffix = os.path.splitext(urlparse(source).path)[1] or '.png'
+            with tempfile.NamedTemporaryFile(dir=temp_dir, suffix=suffix, delete=False) as f:
+                for chunk in self._iter_remote_asset(source):
+                    f.write(chunk)
+            self.local_assets[source] = f.name
+            print(f"📦 Imagen descargada una vez: {source}")
+        
+        return self.local_assets
+    
+    def forget_assets(self, temp_dir: str):
+        """
+        Olvida las imágenes de prefetch_assets guardadas en temp_dir (antes
+        de borrar el directorio)
+        
+        Args:
+            temp_dir: Directorio pasado a prefetch_assets
+        """
+        temp_dir = os.path.abspath(temp_dir)
+        for source, path in list(self.local_assets.items()):
+            if os.path.commonpath([temp_dir, os.path.abspath(path)]) == temp_dir:
+                del self.local_assets[source]
+    
+    def _iter_remote_asset(self, source: str) -> Iterable[bytes]:
+        """
+        Contenido de una imagen remota: desde la descarga del lote
+        (prefetch_assets), la caché de /tmp o el origen, en ese orden
+        
+        Args:
+            source: URL http(s):// o URI s3://
+            
+        Returns:
+            Iterable[bytes]: Bloques del archivo
+        """
+        local_path = self.local_assets.get(source)
+        if local_path and os.path.exists(local_path):
+            with open(local_path, 'rb') as f:
+                return [f.read()]
+        
+        cached = self._fetch_cached(source)
+        if cached is not None:
+            with open(cached["pdf_path"], 'rb') as f:
+                content = f.read()
+            if not cached["cached"]:
+                os.remove(cached["pdf_path"])
+            return [content]
+        
+        if self._is_s3_uri(source):
+            return self._iter_s3_object(source)
+        
+        import requests
+        response = requests.get(source, stream=True, timeout=30)
+        response.raise_for_status()
+        return response.iter_content(chunk_size=SPOOL_CHUNK_SIZE)
+    
+    def fingerprint(self, source: str) -> Dict[str, Any]:
+        """
+        SHA-256 de un archivo local (mapeado en memoria) o remoto (http(s)://
+        o s3://, leído en streaming sin guardarlo en memoria ni en disco)
+        
+        Args:
+            source: Ruta local, URL o URI s3://
+            
+        Returns:
+            Dict[str, Any]: source, sha256 y size
+        """
+        if not self._is_url(source):
+            if not os.path.isfile(source):
+                raise FileNotFoundError(f"El archivo no existe: {source}")
+            return {"source": source, **file_digest(source)}
+        
+        if self._is_s3_uri(source):
+            chunks = self._iter_s3_object(source)
+        else:
+            import requests
+            response = requests.get(source, stream=True, timeout=30)
+            response.raise_for_status()
+            chunks = response.iter_content(chunk_size=SPOOL_CHUNK_SIZE)
+        digest = hashlib.sha256()
+        size = 0
+        for chunk in chunks:
+            digest.update(chunk)
+            size += len(chunk)
+        return {"source": source, "sha256": digest.hexdigest(), "size": size}
+    
     def process_pdf(self, pdf_data: Dict[str, Any]) -> str:
         """
         Procesa un PDF según las instrucciones proporcionadas
         
         Args:
-            pdf_data: Diccionario con las instrucciones de procesamiento
+            pdf_data: Diccionario con las instrucciones de procesamiento.
+                Con "incremental": True los cambios se añaden como una
+                actualización incremental en lugar de reescribir el archivo.
+                "save_profile" elige uno de SAVE_PROFILES para esta petición.
+                En lugar de "pdf_path" se puede pasar "pdf_stream" con los
+                bytes del PDF (ver spool_pdf). "large_document" activa el
+                modo de memoria acotada para documentos muy grandes. Con
+                "output_stream" (objeto con write()) el PDF se serializa
+                directamente en él y "output_path" es opcional.
+                "deadline" (instante de time.monotonic()) se comprueba entre
+                páginas: al agotarse se lanza DeadlineExceeded y, si se pasó
+                "checkpoint_path", antes se guarda ahí el PDF parcial.
+                "resume_from" continúa un checkpoint: las primeras
+                resume_from páginas ya están procesadas y se omiten.
+                "page_range" ([inicio, fin), 0-indexado) limita las
+                inserciones a esas páginas. Con "parallel_workers" > 1 los
+                documentos grandes se dividen en rangos de páginas que se
+                procesan en paralelo (ver fanout.py). "sign" (True o un
+                diccionario con field_name, reason, location y
+                contact_info) firma el resultado con el firmante del
+                proceso (ver signing.py). "input_sha256" e "input_size"
+                (de spool_pdf) evitan volver a leer la entrada para su hash.
+                Al terminar, self.fingerprints tiene el SHA-256 y el tamaño
+                de la entrada y de la salida, calculados mientras se leen
+                y se guardan. "remove_stamps" (lista de stamp_id, "*" para
+                todos) quita antes las anotaciones de sellos de un
+                procesamiento anterior (ver stamps.py)
             
         Returns:
-            str: Ruta del archivo de salida procesado
+            str: Ruta del archivo de salida procesado (None si solo se
+            escribió en output_stream)
         """
         pdf_path = pdf_data.get("pdf_path")
+        pdf_stream = pdf_data.get("pdf_stream")
         output_path = pdf_data.get("output_path")
+        output_stream = pdf_data.get("output_stream")
         insertions = pdf_data.get("insertions", [])
+        incremental = bool(pdf_data.get("incremental", False))
+        large_document = bool(pdf_data.get("large_document") or self.large_document)
+        deadline = pdf_data.get("deadline")
+        resume_from = int(pdf_data.get("resume_from") or 0)
+        checkpoint_path = pdf_data.get("checkpoint_path")
+        page_range = pdf_data.get("page_range")
+        parallel_workers = int(pdf_data.get("parallel_workers") or 0)
+        sign = pdf_data.get("sign")
+        remove_stamps = pdf_data.get("remove_stamps")
+        input_fingerprint = {"sha256": pdf_data.get("input_sha256"), "size": pdf_data.get("input_size")}
+        self.fingerprints = None
+        if parallel_workers > 1 and incremental:
+            raise ValueError("parallel_workers no es compatible con guardado incremental")
+        save_options = self._get_save_options(pdf_data.get("save_profile"), incremental)
         
-        if not pdf_path or not output_path:
-            raise ValueError("pdf_path y output_path son requeridos")
+        if (not pdf_path and pdf_stream is None) or (not output_path and output_stream is None):
+            raise ValueError("pdf_path (o pdf_stream) y output_path (o output_stream) son requeridos")
         
-        # Manejar archivos remotos (URLs)
+        # Manejar archivos remotos (URLs y URIs s3://)
         temp_file = None
         actual_pdf_path = pdf_path
         
-        if self._is_url(pdf_path):
+        if pdf_stream is None and self._is_url(pdf_path):
             print(f"📥 Descargando PDF desde URL: {pdf_path}")
             try:
-                actual_pdf_path = self._download_file(pdf_path)
-                temp_file = actual_pdf_path
-                print(f"✅ PDF descargado a: {actual_pdf_path}")
+                if self._is_s3_uri(pdf_path):
+                    downloaded = self._download_s3(pdf_path)
+                else:
+                    downloaded = self._download_file(pdf_path)
             except Exception as e:
                 raise FileNotFoundError(f"No se pudo descargar el archivo desde {pdf_path}: {str(e)}")
+            
+            pdf_stream = downloaded.get("pdf_stream")
+            input_fingerprint = {"sha256": downloaded.get("input_sha256"), "size": downloaded.get("input_size")}
+            if pdf_stream is not None:
+                print(f"✅ PDF descargado en memoria ({len(pdf_stream)} bytes)")
+            else:
+                actual_pdf_path = downloaded["pdf_path"]
+                # Los archivos de la caché de /tmp se conservan al terminar
+                if not downloaded.get("cached"):
+                    temp_file = actual_pdf_path
+                print(f"✅ PDF descargado a: {actual_pdf_path}")
         
         # Verificar que el archivo existe (local o descargado)
-        if not os.path.exists(actual_pdf_path):
+        if pdf_stream is None and not os.path.exists(actual_pdf_path):
             raise FileNotFoundError(f"El archivo PDF no existe: {actual_pdf_path}")
         
+        # Hash de la entrada si no se calculó al recibirla (antes de que el
+        # guardado incremental mueva la descarga)
+        if input_fingerprint["sha256"] is None:
+            if pdf_stream is not None:
+                input_fingerprint = {"sha256": hashlib.sha256(pdf_stream).hexdigest(), "size": len(pdf_stream)}
+            else:
+                input_fingerprint = file_digest(actual_pdf_path)
+        # Para los QR con {sha256}
+        self.input_sha256 = input_fingerprint["sha256"]
+        self.shown_sources = {}
+        self.stamp_forms = {}
+        
+        # El hash de la salida se calcula mientras se escribe
+        if output_stream is not None:
+            output_stream = DigestWriter(output_stream)
+        
         # Crear directorio de salida si no existe
-        output_dir = os.path.dirname(output_path)
+        output_dir = os.path.dirname(output_path) if output_path else None
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir)
         
+        # El guardado incremental y la firma necesitan un archivo escribible
+        # aunque la salida vaya a un stream
+        work_file = None
+        if (incremental or sign) and not output_path:
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as f:
+                work_file = f.name
+        
         # Abrir el PDF
-        self.doc = fitz.open(actual_pdf_path)
+        if incremental:
+            self.doc = self._open_incremental(output_path or work_file, actual_pdf_path, pdf_stream, temp_file)
+        elif pdf_stream is not None:
+            self.doc = fitz.open(stream=pdf_stream, filetype="pdf")
+        else:
+            self.doc = fitz.open(actual_pdf_path)
         
         try:
-            # Aplicar cada inserción
-            for insertion in insertions:
-                self._apply_insertion(insertion)
+            if remove_stamps:
+                from stamps import remove_stamps as remove_stamp_annotations
+                remove_stamp_annotations(self.doc, remove_stamps)
+            
+            # Aplicar cada inserción (en orden de página si hay plazo o se
+            # reanuda un checkpoint, para saber qué páginas están terminadas)
+            parallel = False
+            # Los sellos en modo "annotation" no se reparten: el reensamblado
+            # solo trasplanta el contenido y son baratos de añadir en serie
+            stamp_insertions = [ins for ins in insertions if ins.get("mode") == "annotation"]
+            content_insertions = [ins for ins in insertions if ins.get("mode") != "annotation"]
+            if parallel_workers > 1 and content_insertions and not (resume_from or page_range):
+                from fanout import apply_insertions_parallel
+                source = {"pdf_stream": pdf_stream} if pdf_stream is not None else {"pdf_path": actual_pdf_path}
+                # Los rangos no vuelven a calcular el hash de la entrada
+                source.update(input_sha256=input_fingerprint["sha256"], input_size=input_fingerprint["size"])
+                try:
+                    parallel = apply_insertions_parallel(
+                        self, source, content_insertions, parallel_workers,
+                        options={"large_document": large_document},
+                        deadline=deadline,
+                        source_uri=pdf_path if pdf_path and self._is_s3_uri(pdf_path) else None
+                    )
+                except DeadlineExceeded as e:
+                    # Las primeras pages_done páginas están reensambladas:
+                    # completarlas con los sellos para que el checkpoint
+                    # quede como en serie
+                    if stamp_insertions:
+                        self._apply_insertions_by_page(stamp_insertions, 0, None, False, e.pages_done)
+                    raise
+            if parallel:
+                # El reensamblado deja sin referencias el contenido anterior
+                # de las páginas: eliminarlo al guardar
+                save_options = {**save_options, "garbage": max(save_options.get("garbage", 0), 1)}
+                for insertion in stamp_insertions:
+                    self._apply_insertion(insertion)
+            elif large_document or deadline is not None or resume_from or page_range:
+                start_page, end_page = page_range or (0, None)
+                if resume_from:
+                    print(f"⏯️ Reanudando desde la página {resume_from + 1} de {len(self.doc)}")
+                self._apply_insertions_by_page(insertions, max(start_page, resume_from), deadline,
+                                               large_document, end_page)
+            else:
+                for insertion in insertions:
+                    self._apply_insertion(insertion)
             
             # Guardar el PDF modificado
-            self.doc.save(output_path)
+            if incremental:
+                # Solo se añaden al final los objetos modificados; las firmas
+                # previas del documento siguen siendo válidas
+                self.doc.saveIncr()
+            elif sign:
+                # La firma se añade después sobre el archivo guardado
+                self.doc.save(output_path or work_file, **save_options)
+            elif output_stream is not None:
+                self._save_to_stream(output_stream, save_options)
+            else:
+                with open(output_path, "wb") as f:
+                    output_stream = DigestWriter(f)
+                    self._save_to_stream(output_stream, save_options)
+
+            if sign:
+                self.doc.close()
+                self.doc = None
+                self._sign(output_path or work_file, sign)
+            if output_stream is not None and (incremental or sign):
+                with open(output_path or work_file, "rb") as f:
+                    shutil.copyfileobj(f, output_stream, SPOOL_CHUNK_SIZE)
+            
+            if output_stream is not None:
+                output_fingerprint = {"sha256": output_stream.sha256, "size": output_stream.size}
+            else:
+                # Actualización incremental o firma sobre output_path
+                output_fingerprint = file_digest(output_path)
+            self.fingerprints = {
+                "input_sha256": input_fingerprint["sha256"],
+                "input_size": input_fingerprint["size"],
+                "output_sha256": output_fingerprint["sha256"],
+                "output_size": output_fingerprint["size"]
+            }
             return output_path
             
+        except MemoryLimitExceeded:
+            raise
+        except DeadlineExceeded as e:
+            # Al reanudar hay que pasar la huella de la entrada original: la
+            # del checkpoint cambiaría los QR con {sha256} de las páginas restantes
+            e.input_sha256 = input_fingerprint["sha256"]
+            e.input_size = input_fingerprint["size"]
+            if checkpoint_path:
+                self._save_checkpoint(checkpoint_path, incremental, output_path or work_file)
+                e.checkpoint_path = checkpoint_path
+                print(f"💾 Checkpoint guardado tras {e.pages_done} de {e.total_pages} páginas: {checkpoint_path}")
+            raise
         except Exception as e:
             raise Exception(f"Error procesando PDF: {str(e)}")
         
@@ -168,13 +826,143 @@ class PDFProcessor:
             if self.doc:
                 self.doc.close()
             
-            # Limpiar archivo temporal si se descargó
-            if temp_file and os.path.exists(temp_file):
-                try:
-                    os.remove(temp_file)
-                    print(f"🗑️ Archivo temporal eliminado: {temp_file}")
-                except:
-                    pass  # Ignorar errores al eliminar temporales
+            # Limpiar archivos temporales (descarga y copia de trabajo)
+            for path in (temp_file, work_file):
+                if path and os.path.exists(path):
+                    try:
+                        os.remove(path)
+                        print(f"🗑️ Archivo temporal eliminado: {path}")
+                    except:
+                        pass  # Ignorar errores al eliminar temporales
+    
+    def _sign(self, path: str, sign: Union[bool, Dict[str, Any]]):
+        """
+        Firma el PDF guardado en path con una actualización incremental
+        
+        Args:
+            path: PDF ya guardado (se modifica)
+            sign: True o diccionario con field_name, reason, location,
+                contact_info, timestamp, ltv y appearance
+        """
+        from signing import get_signer
+        
+        options = sign if isinstance(sign, dict) else {}
+        info = get_signer().sign_file(
+            path,
+            field_name=options.get("field_name"),
+            reason=options.get("reason"),
+            location=options.get("location"),
+            contact_info=options.get("contact_info"),
+            timestamp=bool(options.get("timestamp")),
+            ltv=bool(options.get("ltv")),
+            appearance=options.get("appearance")
+        )
+        print(f"🔏 PDF firmado en el campo {info['field_name']} (SHA-256 {info['digest'][:16]}…)")
+        if info.get("timestamped_at"):
+            print(f"⏱️ Firma sellada a las {info['timestamped_at']}")
+        if info.get("ltv"):
+            print("🛡️ /DSS añadido (LTV)")
+    
+    def _save_to_stream(self, output_stream, save_options: Dict[str, Any]):
+        """
+        Serializa el documento en un objeto tipo archivo
+        
+        Args:
+            output_stream: Objeto con write() (por ejemplo S3MultipartWriter)
+            save_options: Argumentos para fitz.Document.save()
+        """
+        if save_options.get("linear"):
+            # La linealización reescribe el inicio del archivo y necesita un
+            # destino con seek(): se serializa en memoria y luego se copia
+            buffer = io.BytesIO()
+            self.doc.save(buffer, **save_options)
+            output_stream.write(buffer.getbuffer())
+        else:
+            self.doc.save(output_stream, **save_options)
+    
+    def _save_checkpoint(self, checkpoint_path: str, incremental: bool, work_path: str = None):
+        """
+        Guarda el documento parcial para reanudarlo en otra invocación
+
+        Args:
+            checkpoint_path: Ruta del checkpoint
+            incremental: Si el trabajo es incremental (el checkpoint también lo
+                es, para conservar las firmas previas)
+            work_path: Archivo abierto para guardado incremental
+        """
+        # El checkpoint anterior puede ser la entrada abierta: escribir
+        # aparte y reemplazarlo al final
+        temp_path = f"{checkpoint_path}.tmp"
+        if incremental:
+            self.doc.saveIncr()
+            shutil.copyfile(work_path, temp_path)
+        else:
+            # Sin garbage collection ni compresión: el perfil pedido se
+            # aplica al guardar la salida final
+            self.doc.save(temp_path)
+        os.replace(temp_path, checkpoint_path)
+    
+    def _get_save_options(self, save_profile: str = None, incremental: bool = False) -> Dict[str, Any]:
+        """
+        Resuelve los argumentos de guardado para un perfil
+        
+        Args:
+            save_profile: Nombre del perfil pedido, o None para el del servidor
+            incremental: Si el guardado será incremental
+            
+        Returns:
+            Dict[str, Any]: Argumentos para fitz.Document.save()
+        """
+        if save_profile and save_profile not in SAVE_PROFILES:
+            raise ValueError(
+                f"Perfil de guardado no válido: {save_profile}. "
+                f"Opciones: {', '.join(SAVE_PROFILES)}"
+            )
+        
+        if incremental:
+            # Garbage collection, limpieza y linealización reescriben el
+            # documento completo, así que no se pueden combinar con incremental
+            if save_profile and SAVE_PROFILES[save_profile]:
+                raise ValueError(
+                    f"El perfil '{save_profile}' no es compatible con guardado incremental"
+                )
+            return {}
+        
+        return SAVE_PROFILES[save_profile or self.save_profile]
+    
+    def _open_incremental(self, output_path: str, source_path: str = None,
+                          stream: bytes = None, temp_file: str = None) -> fitz.Document:
+        """
+        Prepara una copia escribible del PDF en output_path y la abre para
+        guardado incremental
+        
+        Args:
+            output_path: Ruta donde se escribirá el PDF procesado
+            source_path: Ruta del PDF original (local o descargado)
+            stream: Bytes del PDF original, si se recibió en memoria
+            temp_file: Ruta temporal de la descarga, si el PDF vino de una URL
+            
+        Returns:
+            fitz.Document: Documento abierto sobre output_path
+        """
+        if stream is not None:
+            with open(output_path, "wb") as f:
+                f.write(stream)
+        elif os.path.abspath(source_path) != os.path.abspath(output_path):
+            if temp_file:
+                # La descarga ya es una copia propia: moverla evita otra copia
+                shutil.move(temp_file, output_path)
+            else:
+                shutil.copyfile(source_path, output_path)
+        
+        doc = fitz.open(output_path)
+        if not doc.can_save_incrementally():
+            doc.close()
+            raise ValueError(
+                "El PDF está dañado o fue reparado al abrirlo; no admite guardado incremental"
+            )
+        print(f"🧩 Guardado incremental activado sobre: {output_path}")
+        return doc
     
     def _apply_insertion(self, insertion: Dict[str, Any]):
         """
@@ -188,8 +976,9 @@ class PDFProcessor:
         pages = insertion.get("pages") or insertion.get("page", "all")
         position = insertion.get("position", [0, 0])
         
-        if insertion_type not in ["text", "image"]:
+        if insertion_type not in ["text", "image", "qr"]:
             raise ValueError(f"Tipo de inserción no válido: {insertion_type}")
+        stamp = self._is_stamp(insertion)
         
         target_pages = self._get_target_pages(pages)
         
@@ -197,10 +986,106 @@ class PDFProcessor:
             if 0 <= page_num < len(self.doc):
                 page = self.doc[page_num]
                 
-                if insertion_type == "text":
+                if stamp:
+                    self._insert_stamp(page, insertion, position)
+                elif insertion_type == "text":
                     self._insert_text(page, insertion, position)
                 elif insertion_type == "image":
                     self._insert_image(page, insertion, position)
+                elif insertion_type == "qr":
+                    self._insert_qr(page, insertion, position)
+    
+    def _apply_insertions_by_page(self, insertions: List[Dict[str, Any]], start_page: int = 0,
+                                  deadline: float = None, large_document: bool = True,
+                                  end_page: int = None):
+        """
+        Aplica todas las inserciones recorriendo el documento página a página,
+        con memoria acotada: cada página se libera al terminarla, el store de
+        MuPDF se reduce periódicamente y se vigila el RSS del proceso
+        
+        Args:
+            insertions: Lista de inserciones a aplicar
+            start_page: Primera página a procesar (las anteriores ya lo están)
+            deadline: Instante de time.monotonic() a partir del cual se deja
+                de procesar y se lanza DeadlineExceeded
+            large_document: Si se pidió el modo documento grande (solo
+                afecta a los mensajes)
+            end_page: Página siguiente a la última a procesar (None = hasta
+                el final)
+        """
+        for insertion in insertions:
+            insertion_type = insertion.get("type")
+            if insertion_type not in ["text", "image", "qr"]:
+                raise ValueError(f"Tipo de inserción no válido: {insertion_type}")
+            self._is_stamp(insertion)
+        
+        # Páginas destino de cada inserción, respetando el orden original
+        targets = [
+            set(self._get_target_pages(insertion.get("pages") or insertion.get("page", "all")))
+            for insertion in insertions
+        ]
+        
+        if large_document:
+            print(f"🐘 Modo documento grande: {len(self.doc)} páginas, "
+                  f"store máx. {self.store_max_bytes} bytes, "
+                  f"límite RSS {self.memory_limit_mb or 'ninguno'} MB")
+        
+        if end_page is None or end_page > len(self.doc):
+            end_page = len(self.doc)
+        
+        for page_num in range(start_page, end_page):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise DeadlineExceeded(page_num, len(self.doc))
+            
+            page_insertions = [ins for ins, pages in zip(insertions, targets) if page_num in pages]
+            if page_insertions:
+                page = self.doc[page_num]
+                for insertion in page_insertions:
+                    position = insertion.get("position", [0, 0])
+                    if insertion.get("mode") == "annotation":
+                        self._insert_stamp(page, insertion, position)
+                    elif insertion.get("type") == "text":
+                        self._insert_text(page, insertion, position)
+                    elif insertion.get("type") == "qr":
+                        self._insert_qr(page, insertion, position)
+                    else:
+                        self._insert_image(page, insertion, position)
+                del page
+            
+            if (page_num + 1) % self.release_every == 0:
+                self._release_memory(page_num + 1)
+    
+    def _is_stamp(self, insertion: Dict[str, Any]) -> bool:
+        """
+        True si la inserción va como anotación ("mode": "annotation") y no
+        en el flujo de contenido ("content", por defecto)
+        """
+        from stamps import STAMP_MODES
+        
+        mode = insertion.get("mode") or "content"
+        if mode not in STAMP_MODES:
+            raise ValueError(f"Modo de inserción no válido: {mode}")
+        return mode == "annotation"
+    
+    def _release_memory(self, pages_done: int):
+        """
+        Libera memoria entre bloques de páginas y aborta el trabajo si el
+        proceso supera el límite de memoria
+        
+        Args:
+            pages_done: Número de páginas procesadas hasta ahora
+        """
+        gc.collect()
+        if fitz.TOOLS.store_size > self.store_max_bytes:
+            fitz.TOOLS.store_shrink(100)
+        
+        if self.memory_limit_mb:
+            rss_mb = current_rss_mb()
+            if rss_mb > self.memory_limit_mb:
+                raise MemoryLimitExceeded(
+                    f"El trabajo superó el límite de memoria ({rss_mb:.0f} MB > "
+                    f"{self.memory_limit_mb} MB) tras {pages_done} páginas"
+                )
     
     def _get_target_pages(self, pages: Union[str, int, List[int]]) -> List[int]:
         """
@@ -292,6 +1177,12 @@ class PDFProcessor:
         correct_orientation = insertion.get("correct_orientation", True)
         flip_type = insertion.get("flip_type", "horizontal")  # Tipo específico de transformación
         
+        from vector import is_vector_source
+        
+        if is_vector_source(source):
+            self._insert_vector(page, source, position, width, height, rotate)
+            return
+        
         print(f"🔧 correct_orientation = {correct_orientation}")
         print(f"🔧 flip_type = {flip_type}")
         
@@ -300,9 +1191,8 @@ class PDFProcessor:
         temp_file_path = source  # Inicializar con el source original
         
         try:
-            if source.startswith(('http://', 'https://')):
-                response = requests.get(source, timeout=30)
-                response.raise_for_status()
+            if source.startswith(('http://', 'https://', 's3://')):
+                content = b"".join(self._iter_remote_asset(source))
                 
                 # Crear archivo temporal
                 temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
@@ -316,7 +1206,7 @@ class PDFProcessor:
                         import io
                         
                         # Cargar imagen con PIL
-                        img = Image.open(io.BytesIO(response.content))
+                        img = Image.open(io.BytesIO(content))
                         
                         # Aplicar flip vertical para corregir la inversión de PyMuPDF
                         img_flipped = img.transpose(Image.FLIP_TOP_BOTTOM)
@@ -330,12 +1220,12 @@ class PDFProcessor:
                     except ImportError:
                         print("❌ PIL/Pillow no está instalado")
                         # Fallback: usar imagen original
-                        temp_file.write(response.content)
+                        temp_file.write(content)
                         temp_file.close()
                         temp_file_path = temp_file.name
                 else:
                     # Guardar imagen original sin modificaciones
-                    temp_file.write(response.content)
+                    temp_file.write(content)
                     temp_file.close()
                     temp_file_path = temp_file.name
             
@@ -403,11 +1293,143 @@ class PDFProcessor:
                 except:
                     pass
 
+    
+    def _insert_vector(self, page: fitz.Page, source: str, position: List[int],
+                       width: int = None, height: int = None, rotate: int = 0):
+        """
+        Inserta un SVG o un PDF de una página como gráfico vectorial: se
+        convierte una vez (caché por contenido de vector.py) y en cada
+        documento se copia una sola vez como XObject de formulario
+        
+        Args:
+            page: Página de PyMuPDF
+            source: Ruta local, URL o URI s3:// del .svg o .pdf
+            position: Posición [x, y] donde insertar
+            width: Ancho del rectángulo (por defecto 100)
+            height: Alto del rectángulo (por defecto 100)
+            rotate: Grados de rotación (múltiplo de 90)
+        """
+        from vector import get_vector_cache
+        
+        key = ("vector", source)
+        vector = self.shown_sources.get(key)
+        if vector is None:
+            if source.startswith(('http://', 'https://', 's3://')):
+                data = b"".join(self._iter_remote_asset(source))
+            else:
+                with open(source, "rb") as f:
+                    data = f.read()
+            vector = self.shown_sources[key] = get_vector_cache().get(data)
+        
+        # Mismo rectángulo que las imágenes; el contenido conserva su proporción
+        x, y = position[0], position[1]
+        if width and height:
+            rect = fitz.Rect(x, y, x + width, y + height)
+        else:
+            rect = fitz.Rect(x, y, x + 100, y + 100)
+        page.show_pdf_page(rect, vector, 0, keep_proportion=True, rotate=rotate or 0, overlay=True)
+        print(f"📐 Gráfico vectorial insertado en: {rect}")
+    
+    def _insert_qr(self, page: fitz.Page, insertion: Dict[str, Any], position: List[int]):
+        """
+        Inserta un código QR vectorial en una página
+        
+        Args:
+            page: Página de PyMuPDF
+            insertion: Datos de la inserción QR: content (texto a codificar;
+                {sha256} se sustituye por el SHA-256 del PDF de entrada),
+                width o height (lado en puntos), color, error_correction,
+                quiet_zone y rotate
+            position: Posición [x, y] de la esquina del QR
+        """
+        from qr import DEFAULT_ERROR_CORRECTION, DEFAULT_QUIET_ZONE, get_qr_cache
+        
+        payload = insertion.get("content") or ""
+        if not payload:
+            raise ValueError("La inserción QR necesita content")
+        if self.input_sha256:
+            payload = payload.replace("{sha256}", self.input_sha256)
+        
+        color = insertion.get("color") or [0, 0, 0]
+        if any(c > 1 for c in color[:3]):
+            color = [c / 255.0 for c in color[:3]]
+        error_correction = insertion.get("error_correction") or DEFAULT_ERROR_CORRECTION
+        quiet_zone = insertion.get("quiet_zone")
+        if quiet_zone is None:
+            quiet_zone = DEFAULT_QUIET_ZONE
+        
+        # Mismo rectángulo que las imágenes, siempre cuadrado
+        x, y = position[0], position[1]
+        size = insertion.get("width") or insertion.get("height") or 100
+        rect = fitz.Rect(x, y, x + size, y + size)
+        
+        key = ("qr", payload, error_correction, quiet_zone, tuple(color[:3]))
+        source = self.shown_sources.get(key)
+        if source is None:
+            source = self.shown_sources[key] = get_qr_cache().get(*key[1:])
+        page.show_pdf_page(rect, source, 0, rotate=insertion.get("rotate") or 0, overlay=True)
+        print(f"🔳 QR insertado en: {rect}")
+
+    
+    def _insert_stamp(self, page: fitz.Page, insertion: Dict[str, Any], position: List[int]):
+        """
+        Inserta un sello como anotación: la apariencia se compila una vez
+        (caché de stamps.py), se crea una vez por documento como XObject de
+        formulario y cada página solo recibe una anotación que la referencia
+        
+        Args:
+            page: Página de PyMuPDF
+            insertion: Datos de la inserción (cualquier tipo) con
+                "mode": "annotation" y opcionalmente stamp_id (nombre para
+                sustituirla o quitarla después)
+            position: Posición [x, y]: línea base del texto, esquina de
+                imágenes y QR
+        """
+        from stamps import add_stamp, compile_stamp, compile_text_stamp, get_stamp_cache, stamp_key, stamp_name
+        
+        insertion_type = insertion.get("type")
+        if insertion_type == "qr" and self.input_sha256 and insertion.get("content"):
+            # La apariencia depende del hash de esta entrada
+            insertion = {**insertion, "content": insertion["content"].replace("{sha256}", self.input_sha256)}
+        key = stamp_key(insertion)
+        
+        placed = self.stamp_forms.get(key)
+        if placed is None:
+            if insertion_type == "text":
+                color = insertion.get("color") or [0, 0, 0]
+                if any(c > 1 for c in color[:3]):
+                    color = [c / 255.0 for c in color[:3]]
+                compile = lambda: compile_text_stamp(insertion.get("content") or "",
+                                                     insertion.get("font_size") or 12, color[:3],
+                                                     insertion.get("font_name") or "helv")
+            else:
+                if insertion_type == "qr":
+                    width = height = insertion.get("width") or insertion.get("height") or 100
+                    draw = lambda scratch: self._insert_qr(scratch, insertion, [0, 0])
+                else:
+                    width, height = insertion.get("width"), insertion.get("height")
+                    if not (width and height):
+                        width = height = 100
+                    draw = lambda scratch: self._insert_image(scratch, insertion, [0, 0])
+                compile = lambda: compile_stamp(width, height, draw, "Stamp",
+                                                insertion.get("content") or insertion.get("source") or "")
+            stamp = get_stamp_cache().get(key, compile)
+            placed = self.stamp_forms[key] = (stamp.add_to(self.doc), stamp)
+        
+        form_xref, stamp = placed
+        x, y = position[0], position[1]
+        top = y - stamp.ascent
+        rect = fitz.Rect(x, top, x + stamp.width, top + stamp.height)
+        add_stamp(page, rect, form_xref, stamp, stamp_name(insertion, key))
+        print(f"🏷️ Sello insertado como anotación en: {rect}")
+
 
 def create_sample_assets():
     """
     Crea imágenes de ejemplo para testing
     """
+    from PIL import Image
+    
     assets_dir = "assets"
     if not os.path.exists(assets_dir):
         os.makedirs(assets_dir)
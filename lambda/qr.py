@@ -0,0 +1,174 @@
+"""
+QR Module
+Códigos QR vectoriales para las inserciones de tipo "qr"
+
+Cada código se codifica una vez (qrcode) y se compila en un PDF de una
+página cuyo contenido son rectángulos rellenos, un módulo por unidad: las
+filas se agrupan en tramos horizontales y los tramos iguales de filas
+consecutivas en un solo rectángulo. Los PDFs compilados se guardan en
+caché en el proceso por contenido y opciones; el procesador los coloca con
+show_pdf_page, que copia el contenido una vez por documento como XObject
+de formulario y lo reutiliza en cada página.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+import fitz  # PyMuPDF
+
+
+QR_CACHE_MAX_ENTRIES = int(os.environ.get("PDF_QR_CACHE_MAX_ENTRIES", 256))
+
+# Niveles de corrección de errores (porcentaje recuperable: 7, 15, 25 y 30)
+ERROR_CORRECTION_LEVELS = ("L", "M", "Q", "H")
+DEFAULT_ERROR_CORRECTION = "M"
+# Margen en módulos que exige la norma alrededor del código
+DEFAULT_QUIET_ZONE = 4
+
+
+def encode_matrix(payload: str, error_correction: str = DEFAULT_ERROR_CORRECTION,
+                  quiet_zone: int = DEFAULT_QUIET_ZONE) -> List[List[bool]]:
+    """
+    Codifica payload con la versión mínima que lo admite
+
+    Args:
+        payload: Texto a codificar (por ejemplo una URL)
+        error_correction: "L", "M", "Q" o "H"
+        quiet_zone: Módulos de margen incluidos en la matriz
+
+    Returns:
+        List[List[bool]]: Matriz cuadrada de módulos (True = oscuro)
+    """
+    import qrcode
+    from qrcode import constants
+
+    if error_correction not in ERROR_CORRECTION_LEVELS:
+        raise ValueError(f"Nivel de corrección de errores no válido: {error_correction}")
+    if quiet_zone < 0:
+        raise ValueError(f"Margen del QR no válido: {quiet_zone}")
+
+    code = qrcode.QRCode(
+        version=None,
+        error_correction=getattr(constants, f"ERROR_CORRECT_{error_correction}"),
+        border=quiet_zone
+    )
+    code.add_data(payload)
+    code.make(fit=True)
+    return code.get_matrix()
+
+
+def matrix_rectangles(matrix: List[List[bool]]) -> List[Tuple[int, int, int, int]]:
+    """
+    Rectángulos (x, y, ancho, alto) en módulos que cubren los módulos
+    oscuros, con el origen abajo a la izquierda como en PDF
+
+    Los tramos de cada fila que repiten inicio y longitud en la fila
+    siguiente se alargan en vertical en lugar de abrir otro rectángulo
+    """
+    size = len(matrix)
+    rectangles = []
+    # (inicio, longitud) -> [x, fila superior, ancho, alto] aún abierto
+    open_runs: Dict[Tuple[int, int], List[int]] = {}
+    for row_index, row in enumerate(matrix):
+        runs = []
+        column = 0
+        while column < size:
+            if row[column]:
+                start = column
+                while column < size and row[column]:
+                    column += 1
+                runs.append((start, column - start))
+            else:
+                column += 1
+
+        current = {}
+        for run in runs:
+            rectangle = open_runs.pop(run, None)
+            if rectangle is None:
+                rectangle = [run[0], row_index, run[1], 0]
+            rectangle[3] += 1
+            current[run] = rectangle
+        rectangles.extend(open_runs.values())
+        open_runs = current
+    rectangles.extend(open_runs.values())
+
+    # Fila superior -> y de la esquina inferior en coordenadas PDF
+    return [(x, size - top - height, width, height) for x, top, width, height in rectangles]
+
+
+def compile_qr(payload: str, error_correction: str = DEFAULT_ERROR_CORRECTION,
+               quiet_zone: int = DEFAULT_QUIET_ZONE,
+               color: Tuple[float, float, float] = (0, 0, 0)) -> fitz.Document:
+    """
+    PDF de una página (un punto por módulo) con el QR como trazados
+
+    Args:
+        payload: Texto a codificar
+        error_correction: "L", "M", "Q" o "H"
+        quiet_zone: Módulos de margen (se rellenan de blanco)
+        color: RGB 0-1 de los módulos oscuros
+
+    Returns:
+        fitz.Document: Documento para show_pdf_page
+    """
+    matrix = encode_matrix(payload, error_correction, quiet_zone)
+    size = len(matrix)
+    operators = [f"q 1 g 0 0 {size} {size} re f {color[0]:g} {color[1]:g} {color[2]:g} rg"]
+    operators.extend(f"{x} {y} {width} {height} re" for x, y, width, height in matrix_rectangles(matrix))
+    operators.append("f Q")
+
+    doc = fitz.open()
+    page = doc.new_page(width=size, height=size)
+    xref = doc.get_new_xref()
+    doc.update_object(xref, "<< >>")
+    doc.update_stream(xref, "\n".join(operators).encode("ascii"))
+    doc.xref_set_key(page.xref, "Contents", f"{xref} 0 R")
+    return doc
+
+
+class QRCache:
+    """QRs compilados por contenido y opciones (LRU)"""
+
+    def __init__(self, max_entries: int = QR_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Any, ...], fitz.Document]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, payload: str, error_correction: str = DEFAULT_ERROR_CORRECTION,
+            quiet_zone: int = DEFAULT_QUIET_ZONE,
+            color: Tuple[float, float, float] = (0, 0, 0)) -> fitz.Document:
+        """QR compilado de payload con estas opciones, compilándolo solo la primera vez"""
+        key = (payload, error_correction, quiet_zone, tuple(color))
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return compiled
+            self.stats["misses"] += 1
+
+        compiled = compile_qr(payload, error_correction, quiet_zone, color)
+        with self._lock:
+            self._entries[key] = compiled
+            # Los documentos expulsados no se cierran: pueden seguir en uso
+            # por un procesador que aún los está colocando
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        print(f"🔳 QR compilado ({compiled[0].rect.width:g} módulos, {len(payload)} caracteres)")
+        return compiled
+
+    def clear(self):
+        """Vacía la caché"""
+        with self._lock:
+            self._entries.clear()
+
+
+_qr_cache = QRCache()
+
+
+def get_qr_cache() -> QRCache:
+    """Caché de QRs compartida por todo el proceso"""
+    return _qr_cache
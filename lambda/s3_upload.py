@@ -0,0 +1,227 @@
+"""
+S3 Upload Module
+Sube archivos a S3 desde memoria con multipart concurrente, a medida que se
+escriben, calculando el SHA-256 durante la transferencia
+"""
+
+import base64
+import hashlib
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+import boto3
+from botocore.config import Config
+
+
+# S3 exige partes de al menos 5 MB (salvo la última)
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+S3_PART_SIZE = max(int(os.environ.get("S3_PART_SIZE", 8 * 1024 * 1024)), MIN_PART_SIZE)
+S3_MAX_CONCURRENCY = int(os.environ.get("S3_MAX_CONCURRENCY", 8))
+S3_MAX_POOL_CONNECTIONS = int(os.environ.get("S3_MAX_POOL_CONNECTIONS", 32))
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+
+def get_s3_client():
+    """
+    Devuelve el cliente S3 compartido del proceso
+
+    El cliente se crea una sola vez con un pool de conexiones amplio para
+    las subidas concurrentes. S3_ENDPOINT_URL permite apuntarlo a un S3
+    local (MinIO, moto) para pruebas.
+
+    Returns:
+        Cliente S3 de boto3
+    """
+    global _s3_client
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = boto3.client(
+                    "s3",
+                    endpoint_url=os.environ.get("S3_ENDPOINT_URL") or None,
+                    config=Config(
+                        max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+                        retries={"max_attempts": 5, "mode": "adaptive"}
+                    )
+                )
+    return _s3_client
+
+
+def _reset_s3_client():
+    # Un proceso hijo no debe reutilizar las conexiones del padre
+    global _s3_client
+    _s3_client = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_s3_client)
+
+
+class S3MultipartWriter:
+    """
+    Objeto tipo archivo que sube a S3 lo que se le escribe
+
+    Los datos se acumulan hasta completar una parte, que se sube en segundo
+    plano mientras el productor (por ejemplo doc.save) sigue escribiendo.
+    Si el total no llega a una parte, se sube con un único put_object.
+    Usar como context manager: al salir sin error completa la subida y, si
+    hubo una excepción, la aborta.
+    """
+
+    def __init__(self, bucket: str, key: str, client=None, part_size: int = None,
+                 max_concurrency: int = None, content_type: str = "application/pdf"):
+        self.bucket = bucket
+        self.key = key
+        self.client = client or get_s3_client()
+        self.part_size = max(part_size or S3_PART_SIZE, MIN_PART_SIZE)
+        self.max_concurrency = max_concurrency or S3_MAX_CONCURRENCY
+        self.content_type = content_type
+
+        self._buffer = bytearray()
+        self._position = 0
+        self._hash = hashlib.sha256()
+        self._upload_id = None
+        self._executor = None
+        self._futures = []
+        # Limita las partes en vuelo para acotar la memoria si la red va más
+        # lenta que la serialización
+        self._slots = threading.BoundedSemaphore(self.max_concurrency * 2)
+        self.closed = False
+
+    @property
+    def sha256(self) -> str:
+        """SHA-256 (hex) de todos los bytes escritos"""
+        return self._hash.hexdigest()
+
+    @property
+    def size(self) -> int:
+        """Número total de bytes escritos"""
+        return self._position
+
+    def write(self, data) -> int:
+        """Añade datos al buffer y envía las partes completas a S3"""
+        if self.closed:
+            raise ValueError("Escritura sobre un S3MultipartWriter cerrado")
+        self._hash.update(data)
+        self._buffer += data
+        self._position += len(data)
+
+        while len(self._buffer) >= self.part_size:
+            with memoryview(self._buffer) as view:
+                part = bytes(view[:self.part_size])
+            del self._buffer[:self.part_size]
+            self._submit_part(part)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def seekable(self) -> bool:
+        return False
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        # PyMuPDF exige que el objeto tenga seek(); la escritura es secuencial
+        raise io.UnsupportedOperation("S3MultipartWriter solo admite escritura secuencial")
+
+    def writable(self) -> bool:
+        return True
+
+    def flush(self):
+        pass
+
+    def _submit_part(self, data: bytes):
+        """Sube una parte en segundo plano, iniciando el multipart si hace falta"""
+        if self._upload_id is None:
+            response = self.client.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key, ContentType=self.content_type
+            )
+            self._upload_id = response["UploadId"]
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+
+        part_number = len(self._futures) + 1
+        self._slots.acquire()
+        future = self._executor.submit(self._upload_part, part_number, data)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+
+    def _upload_part(self, part_number: int, data: bytes) -> Dict[str, Any]:
+        """Sube una parte con su Content-MD5 para que S3 verifique la integridad"""
+        response = self.client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=data,
+            ContentMD5=base64.b64encode(hashlib.md5(data).digest()).decode("ascii")
+        )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+    def close(self):
+        """Sube lo pendiente y completa la subida"""
+        if self.closed:
+            return
+        self.closed = True
+
+        if self._upload_id is None:
+            # Todo cabe en una parte: una sola petición
+            data = bytes(self._buffer)
+            self._buffer = bytearray()
+            self.client.put_object(
+                Bucket=self.bucket,
+                Key=self.key,
+                Body=data,
+                ContentType=self.content_type,
+                ContentMD5=base64.b64encode(hashlib.md5(data).digest()).decode("ascii"),
+                Metadata={"sha256": self.sha256}
+            )
+            return
+
+        try:
+            if self._buffer:
+                self._submit_part(bytes(self._buffer))
+                self._buffer = bytearray()
+            parts: List[Dict[str, Any]] = [future.result() for future in self._futures]
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": parts}
+            )
+        except Exception:
+            self.abort()
+            raise
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def abort(self):
+        """Cancela la subida multipart y descarta las partes subidas"""
+        self.closed = True
+        self._buffer = bytearray()
+        if self._upload_id is None:
+            return
+        for future in self._futures:
+            future.cancel()
+        try:
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self._upload_id
+            )
+        except Exception as e:
+            print(f"⚠️ No se pudo abortar la subida multipart de {self.key}: {e}")
+        finally:
+            self._executor.shutdown(wait=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
@@ -0,0 +1,776 @@
+"""
+Signing Module
+Firma criptográfica de PDFs (PAdES básica, CMS separado) con una clave y un
+certificado configurados localmente
+
+La firma se añade como actualización incremental: se reserva un campo de
+firma con un diccionario /Sig cuyo /Contents es un hueco de ceros, se guarda
+con saveIncr() y después, sobre el propio archivo, se escribe el /ByteRange
+real, se calcula el SHA-256 de los dos rangos leyendo el archivo por bloques
+(una sola pasada, sin cargarlo en memoria) y se rellena el hueco con la
+firma CMS (SignedData separada) en hexadecimal.
+
+La clave se carga una vez por proceso (get_signer) y las partes fijas de la
+CMS (certificados, identificador, algoritmos y atributos estáticos) se
+codifican una vez por firmante. sign_files firma lotes en procesos
+paralelos. Con timestamp y ltv la firma se sella con una TSA y el
+documento recibe un /DSS con la revocación de la cadena (ver ltv.py). Para
+pruebas sin red se puede generar una identidad autofirmada con
+create_test_identity.
+"""
+
+import datetime
+import hashlib
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+import fitz  # PyMuPDF
+
+
+SIGNING_KEY = os.environ.get("PDF_SIGNING_KEY")  # Clave privada PEM
+SIGNING_CERT = os.environ.get("PDF_SIGNING_CERT")  # Certificado PEM
+SIGNING_CHAIN = os.environ.get("PDF_SIGNING_CHAIN")  # Intermedios PEM (opcional)
+SIGNING_P12 = os.environ.get("PDF_SIGNING_P12")  # Alternativa: clave y certificados en PKCS#12
+SIGNING_KEY_PASSWORD = os.environ.get("PDF_SIGNING_KEY_PASSWORD")
+
+# Bytes reservados para la firma CMS (en el PDF ocupan el doble, en hex)
+SIGNATURE_RESERVED_BYTES = int(os.environ.get("PDF_SIGNATURE_RESERVED_BYTES", 16384))
+SIGNING_CHUNK_SIZE = 1024 * 1024
+
+# MuPDF guarda los enteros como int32: el marcador de cada posición del
+# /ByteRange tiene 10 cifras y cabe en él; las posiciones reales se
+# escriben encima rellenando con espacios
+_BYTE_RANGE_PLACEHOLDER = "0 2000000000 2000000000 2000000000"
+_BYTE_RANGE_RE = re.compile(rb"/ByteRange\s*\[(" + _BYTE_RANGE_PLACEHOLDER.encode() + rb")\]")
+
+
+class SigningError(Exception):
+    """No se pudo firmar el documento (configuración, PDF o tamaño de la firma)"""
+    pass
+
+
+def _pdf_date(moment: datetime.datetime) -> str:
+    """Fecha en formato PDF (D:AAAAMMDDHHmmSS+00'00') en UTC"""
+    return moment.astimezone(datetime.timezone.utc).strftime("D:%Y%m%d%H%M%S+00'00'")
+
+
+class PDFSigner:
+    """
+    Firmante con una clave privada y su certificado
+
+    Crear una vez por proceso (ver get_signer): cargar la clave es lo más
+    caro de preparar la firma
+    """
+
+    def __init__(self, private_key, certificate, chain: List[Any] = None,
+                 reserved_bytes: int = SIGNATURE_RESERVED_BYTES, timestamp_provider=None,
+                 revocation_provider=None):
+        """
+        Args:
+            private_key: Clave privada RSA o EC de cryptography
+            certificate: cryptography.x509.Certificate del firmante
+            chain: Certificados intermedios a incluir en la firma
+            reserved_bytes: Tamaño máximo de la firma CMS (con su sello de tiempo)
+            timestamp_provider: ltv.TimestampProvider (por defecto, PDF_TSA_URL)
+            revocation_provider: ltv.RevocationProvider (por defecto, HTTP)
+        """
+        from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+        if not isinstance(private_key, (rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey)):
+            raise SigningError("Solo se admiten claves RSA o EC")
+        self.private_key = private_key
+        self.certificate = certificate
+        self.chain = list(chain or [])
+        self.reserved_bytes = reserved_bytes
+        self.timestamp_provider = timestamp_provider
+        self.revocation_provider = revocation_provider
+        # Partes fijas de la firma CMS, codificadas en la primera firma
+        self._cms = None
+
+    @classmethod
+    def from_files(cls, key_path: str, cert_path: str, chain_path: str = None,
+                   password: str = None) -> "PDFSigner":
+        """
+        Carga el firmante desde archivos PEM
+
+        Args:
+            key_path: Clave privada
+            cert_path: Certificado del firmante
+            chain_path: Certificados intermedios, si los hay
+            password: Contraseña de la clave, si está cifrada
+
+        Returns:
+            PDFSigner: Firmante listo para usar
+        """
+        from cryptography import x509
+        from cryptography.hazmat.primitives.serialization import load_pem_private_key
+
+        with open(key_path, "rb") as f:
+            private_key = load_pem_private_key(f.read(), password.encode() if password else None)
+        with open(cert_path, "rb") as f:
+            certificate = x509.load_pem_x509_certificate(f.read())
+        chain = []
+        if chain_path:
+            with open(chain_path, "rb") as f:
+                chain = x509.load_pem_x509_certificates(f.read())
+        return cls(private_key, certificate, chain)
+
+    @classmethod
+    def from_pkcs12(cls, p12_path: str, password: str = None) -> "PDFSigner":
+        """Carga el firmante desde un archivo PKCS#12 (.p12 / .pfx)"""
+        from cryptography.hazmat.primitives.serialization import pkcs12
+
+        with open(p12_path, "rb") as f:
+            private_key, certificate, chain = pkcs12.load_key_and_certificates(
+                f.read(), password.encode() if password else None
+            )
+        if private_key is None or certificate is None:
+            raise SigningError(f"{p12_path} no contiene clave y certificado")
+        return cls(private_key, certificate, chain)
+
+    def sign_file(self, path: str, field_name: str = None, reason: str = None,
+                  location: str = None, contact_info: str = None, timestamp: bool = False,
+                  ltv: bool = False, appearance: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Firma un PDF en su sitio añadiendo una actualización incremental
+
+        Args:
+            path: PDF a firmar (se modifica)
+            field_name: Nombre del campo de firma (por defecto SignatureN)
+            reason: Motivo de la firma
+            location: Lugar de la firma
+            contact_info: Contacto del firmante
+            timestamp: Sellar la firma con la TSA (PAdES B-T, ver ltv.py)
+            ltv: Añadir el /DSS con la revocación de la cadena (PAdES B-LT)
+            appearance: Firma visible: page, rect [x0, y0, x1, y1] y
+                opciones de appearance.compile_appearance (image, seal...);
+                sin ella la firma es invisible
+
+        Returns:
+            Dict[str, Any]: field_name, byte_range, digest (SHA-256 hex),
+            signed_at y, si se pidieron, timestamped_at y ltv
+        """
+        outcome = self._sign_paths([path], {
+            "field_name": field_name,
+            "reason": reason,
+            "location": location,
+            "contact_info": contact_info,
+            "timestamp": timestamp,
+            "ltv": ltv,
+            "appearance": appearance
+        })[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def _sign_paths(self, paths: List[str], options: Dict[str, Any]) -> List[Any]:
+        """
+        Firma varios PDFs por fases para que sus sellos de tiempo se pidan
+        juntos: reservar y firmar cada uno, sellar todas las firmas y
+        escribir cada CMS (y su /DSS)
+
+        Returns:
+            List[Any]: Por ruta, el resultado de sign_file o la excepción
+        """
+        options = dict(options)
+        timestamp = options.pop("timestamp", False)
+        ltv = options.pop("ltv", False)
+        try:
+            timestamper = self.get_timestamp_provider() if timestamp else None
+            # La revocación es la misma para todo el lote (y queda en caché)
+            revocation = self.revocation_info() if ltv else None
+        except Exception as e:
+            return [e] * len(paths)
+
+        outcomes: List[Any] = [None] * len(paths)
+        pending = []
+        for index, path in enumerate(paths):
+            try:
+                pending.append((index, path, *self._reserve_and_sign(path, **options)))
+            except Exception as e:
+                outcomes[index] = e
+
+        tokens = [None] * len(pending)
+        if timestamper is not None and pending:
+            try:
+                tokens = timestamper.timestamp([hashlib.sha256(item[4]).digest() for item in pending])
+            except Exception as e:
+                for item in pending:
+                    outcomes[item[0]] = e
+                pending = []
+
+        for (index, path, info, attributes, signature), token in zip(pending, tokens):
+            try:
+                unsigned_attributes, tsa_certificates = b"", []
+                if token is not None:
+                    from ltv import timestamp_info
+
+                    unsigned_attributes = _der(0x30, self._cms["timestamp_attr_type"] + _der(0x31, token))
+                    tsa = timestamp_info(token)
+                    info["timestamped_at"] = tsa["gen_time"].isoformat()
+                    tsa_certificates = tsa["certificates"]
+                contents = self._write_signature(path, info["byte_range"],
+                                                 self._assemble_cms(attributes, signature, unsigned_attributes))
+                if revocation is not None:
+                    from ltv import add_dss
+
+                    # Los certificados de la TSA también van al /DSS
+                    certs = revocation["certs"] + [cert for cert in tsa_certificates
+                                                   if cert not in revocation["certs"]]
+                    add_dss(path, contents, {**revocation, "certs": certs})
+                    info["ltv"] = True
+                outcomes[index] = info
+            except Exception as e:
+                outcomes[index] = e
+        return outcomes
+
+    def _reserve_and_sign(self, path: str, field_name: str = None, reason: str = None,
+                          location: str = None, contact_info: str = None,
+                          appearance: Dict[str, Any] = None):
+        """
+        Añade el campo de firma, fija el /ByteRange y firma su SHA-256
+
+        Returns:
+            Tuple: (resultado parcial de sign_file, atributos firmados, valor de la firma)
+        """
+        signed_at = datetime.datetime.now(datetime.timezone.utc)
+        original_size = os.path.getsize(path)
+
+        visible = None
+        if appearance:
+            compiled = self.appearance(appearance, reason)
+            document_hash = ""
+            if appearance.get("show_hash", True):
+                # Hash del documento antes de la firma, leído por bloques
+                with open(path, "rb") as f:
+                    document_hash = _digest_byte_range(f, [0, original_size, original_size, 0]).hex()
+            visible = {
+                "appearance": compiled,
+                "page": appearance.get("page") or 0,
+                "rect": appearance["rect"],
+                "date": signed_at.strftime("%Y-%m-%d %H:%M:%S UTC"),
+                "document_hash": document_hash
+            }
+
+        doc = fitz.open(path)
+        try:
+            if doc.is_encrypted or not doc.can_save_incrementally():
+                raise SigningError("El PDF no admite una actualización incremental para la firma")
+            field_name = _add_signature_field(doc, self.reserved_bytes, field_name, {
+                "M": _pdf_date(signed_at),
+                "Reason": reason,
+                "Location": location,
+                "ContactInfo": contact_info,
+            }, visible)
+            doc.saveIncr()
+        finally:
+            doc.close()
+
+        with open(path, "r+b") as f:
+            byte_range = _write_byte_range(f, original_size, self.reserved_bytes)
+            digest = _digest_byte_range(f, byte_range)
+        attributes, signature = self._sign_attributes(digest)
+        info = {
+            "field_name": field_name,
+            "byte_range": byte_range,
+            "digest": digest.hex(),
+            "signed_at": signed_at.isoformat()
+        }
+        return info, attributes, signature
+
+    def _write_signature(self, path: str, byte_range: List[int], signature: bytes) -> bytes:
+        """
+        Rellena el hueco de /Contents con la CMS en hexadecimal
+
+        Returns:
+            bytes: Contenido completo de /Contents (CMS y relleno de ceros)
+        """
+        if len(signature) > self.reserved_bytes:
+            raise SigningError(
+                f"La firma ocupa {len(signature)} bytes y solo hay {self.reserved_bytes} "
+                "reservados (PDF_SIGNATURE_RESERVED_BYTES)"
+            )
+        with open(path, "r+b") as f:
+            # El hueco empieza tras el '<' que abre /Contents
+            f.seek(byte_range[1] + 1)
+            f.write(signature.hex().upper().encode("ascii"))
+        return signature + b"\0" * (self.reserved_bytes - len(signature))
+
+    def appearance(self, options: Dict[str, Any], reason: str = None):
+        """
+        Apariencia visible compilada del firmante para options (y el motivo
+        de la firma, salvo show_reason False), desde la caché del proceso
+        """
+        from appearance import get_appearance_cache
+
+        if reason and options.get("show_reason", True):
+            options = {**options, "reason": reason}
+        return get_appearance_cache().get(self.certificate, options)
+
+    def get_timestamp_provider(self):
+        """TSA del firmante o, si no se indicó, la de PDF_TSA_URL"""
+        if self.timestamp_provider is None:
+            from ltv import get_timestamp_provider
+
+            return get_timestamp_provider()
+        return self.timestamp_provider
+
+    def revocation_info(self) -> Dict[str, List[bytes]]:
+        """
+        Certificados y respuestas OCSP/CRL de la cadena del firmante para el
+        /DSS, desde la caché de revocación mientras sigan vigentes
+        """
+        from ltv import collect_revocation_info
+
+        return collect_revocation_info([self.certificate] + self.chain, self.revocation_provider)
+
+    def sign_files(self, paths: List[str], workers: int = None, **options) -> Dict[str, Any]:
+        """
+        Firma muchos PDFs en su sitio repartiéndolos entre procesos hijos
+
+        Los hijos se crean con fork y heredan el firmante con la clave ya
+        cargada y las partes fijas de la CMS ya codificadas; cada documento
+        solo paga su actualización incremental, su hash y su firma. Se usan
+        Process y Pipe como en batch.py (Lambda no dispone de /dev/shm)
+
+        Args:
+            paths: PDFs a firmar (se modifican)
+            workers: Procesos simultáneos (por defecto, batch_worker_count)
+            **options: Argumentos de sign_file comunes a todos los documentos
+
+        Returns:
+            Dict[str, Any]: results (uno por ruta, en orden, con success y
+            el resultado de sign_file o el error), signed, failed, workers,
+            seconds, signatures_per_second y signatures_per_core_second
+            (firmas por segundo de CPU de los procesos que firman)
+        """
+        import multiprocessing
+        from multiprocessing.connection import wait
+
+        if workers is None:
+            from batch import batch_worker_count
+            workers = batch_worker_count(len(paths))
+        workers = max(1, min(workers, len(paths) or 1))
+        if self._cms is None:
+            self.prepare()
+        if options.get("ltv"):
+            # Los hijos heredan las respuestas de revocación ya en caché
+            self.revocation_info()
+        if options.get("appearance"):
+            # Y la apariencia visible ya compilada
+            self.appearance(options["appearance"], options.get("reason"))
+
+        start = time.perf_counter()
+        # Reparto intercalado para equilibrar la carga entre los hijos
+        items = list(enumerate(paths))
+        chunks = [items[index::workers] for index in range(workers)]
+        results, cpu_seconds = [None] * len(paths), 0.0
+        if workers == 1:
+            outcomes, cpu_seconds = _sign_chunk(self, chunks[0], options)
+            for index, outcome in outcomes:
+                results[index] = outcome
+        else:
+            mp_context = multiprocessing.get_context("fork")
+            running = {}
+            for chunk in chunks:
+                parent_conn, child_conn = mp_context.Pipe(duplex=False)
+                process = mp_context.Process(target=_sign_worker, args=(self, chunk, options, child_conn))
+                process.start()
+                child_conn.close()
+                running[parent_conn] = (process, chunk)
+
+            while running:
+                for connection in wait(list(running)):
+                    process, chunk = running.pop(connection)
+                    try:
+                        outcomes, chunk_cpu = connection.recv()
+                    except EOFError:
+                        error = f"el proceso terminó con código {process.exitcode}"
+                        outcomes, chunk_cpu = [(index, {"success": False, "error": error}) for index, _ in chunk], 0.0
+                    connection.close()
+                    process.join()
+                    cpu_seconds += chunk_cpu
+                    for index, outcome in outcomes:
+                        results[index] = outcome
+
+        elapsed = time.perf_counter() - start
+        signed = sum(1 for result in results if result["success"])
+        for path, result in zip(paths, results):
+            result["path"] = path
+            if not result["success"]:
+                print(f"❌ {path}: {result['error']}")
+        print(f"🔏 Lote de firma: {signed} de {len(paths)} en {elapsed:.2f}s con {workers} procesos "
+              f"({signed / elapsed if elapsed else 0:.1f} firmas/s)")
+        return {
+            "results": results,
+            "signed": signed,
+            "failed": len(paths) - signed,
+            "workers": workers,
+            "seconds": elapsed,
+            "signatures_per_second": signed / elapsed if elapsed else 0.0,
+            "signatures_per_core_second": signed / cpu_seconds if cpu_seconds else 0.0
+        }
+
+    def sign_digest(self, digest: bytes) -> bytes:
+        """
+        Firma CMS separada (DER) para el SHA-256 del documento
+
+        Los atributos firmados son los que exige PAdES básica: content-type,
+        message-digest y signing-certificate-v2 (la hora va en /M del PDF).
+        Solo message-digest y la firma cambian entre documentos: el resto
+        de la estructura se codifica una vez (ver prepare)
+
+        Args:
+            digest: SHA-256 de los rangos de /ByteRange
+
+        Returns:
+            bytes: ContentInfo con SignedData en DER
+        """
+        return self._assemble_cms(*self._sign_attributes(digest))
+
+    def _sign_attributes(self, digest: bytes) -> Tuple[bytes, bytes]:
+        """Atributos firmados (contenido del SET OF) y su firma"""
+        if self._cms is None:
+            self.prepare()
+        cms_parts = self._cms
+
+        # SET OF en DER: los atributos van ordenados por su codificación
+        attributes = b"".join(sorted(cms_parts["static_attrs"] + [cms_parts["digest_attr_prefix"] + digest]))
+        # Se firma la codificación del SET OF (etiqueta 0x31), no la
+        # etiqueta implícita [0] con la que va dentro de SignerInfo
+        return attributes, cms_parts["sign"](_der(0x31, attributes))
+
+    def _assemble_cms(self, attributes: bytes, signature: bytes, unsigned_attributes: bytes = b"") -> bytes:
+        """ContentInfo DER a partir de las partes fijas, los atributos y la firma"""
+        cms_parts = self._cms
+        signer_info = _der(0x30, (
+            cms_parts["signer_info_head"]
+            + _der(0xA0, attributes)
+            + cms_parts["signature_algorithm"]
+            + _der(0x04, signature)
+            # Atributos no firmados ([1] IMPLICIT SET OF): el sello de tiempo
+            + (_der(0xA1, unsigned_attributes) if unsigned_attributes else b"")
+        ))
+        signed_data = _der(0x30, cms_parts["signed_data_head"] + _der(0x31, signer_info))
+        return _der(0x30, cms_parts["content_type"] + _der(0xA0, signed_data))
+
+    def prepare(self):
+        """
+        Codifica en DER las partes fijas de la firma CMS del firmante:
+        certificados, identificador, algoritmos y atributos estáticos
+
+        Se llama sola en la primera firma; llamarla antes de crear procesos
+        con fork hace que los hijos la hereden ya hecha
+        """
+        from asn1crypto import algos, cms, core, x509 as asn1_x509
+        # Importar tsp registra el atributo signing_certificate_v2 en cms
+        from asn1crypto import tsp  # noqa: F401
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import ec, padding
+        from cryptography.hazmat.primitives.serialization import Encoding
+
+        certificate = asn1_x509.Certificate.load(self.certificate.public_bytes(Encoding.DER))
+        chain = [asn1_x509.Certificate.load(cert.public_bytes(Encoding.DER)) for cert in self.chain]
+
+        if isinstance(self.private_key, ec.EllipticCurvePrivateKey):
+            signature_algorithm = "sha256_ecdsa"
+            sign = lambda data: self.private_key.sign(data, ec.ECDSA(hashes.SHA256()))
+        else:
+            signature_algorithm = "rsassa_pkcs1v15"
+            sign = lambda data: self.private_key.sign(data, padding.PKCS1v15(), hashes.SHA256())
+
+        # El valor de message-digest es lo último del atributo: el prefijo
+        # sirve para cualquier SHA-256
+        digest_attr = cms.CMSAttribute({"type": "message_digest", "values": [b"\0" * 32]}).dump()
+        digest_algorithm = algos.DigestAlgorithm({"algorithm": "sha256"}).dump()
+        self._cms = {
+            "sign": sign,
+            "static_attrs": [
+                cms.CMSAttribute({"type": "content_type", "values": ["data"]}).dump(),
+                cms.CMSAttribute({"type": "signing_certificate_v2", "values": [{
+                    "certs": [{"cert_hash": hashlib.sha256(certificate.dump()).digest()}]
+                }]}).dump(),
+            ],
+            "digest_attr_prefix": digest_attr[:-32],
+            "signer_info_head": (
+                core.Integer(1).dump()
+                + cms.SignerIdentifier({
+                    "issuer_and_serial_number": {
+                        "issuer": certificate.issuer,
+                        "serial_number": certificate.serial_number
+                    }
+                }).dump()
+                + digest_algorithm
+            ),
+            "signature_algorithm": cms.SignedDigestAlgorithm({"algorithm": signature_algorithm}).dump(),
+            "signed_data_head": (
+                core.Integer(1).dump()
+                + _der(0x31, digest_algorithm)
+                # Sin contenido encapsulado: firma separada (ETSI.CAdES.detached)
+                + cms.EncapsulatedContentInfo({"content_type": "data"}).dump()
+                + _der(0xA0, b"".join(cert.dump() for cert in [certificate] + chain))
+            ),
+            "content_type": cms.ContentType("signed_data").dump(),
+            "timestamp_attr_type": cms.CMSAttributeType("signature_time_stamp_token").dump(),
+        }
+
+
+def _der(tag: int, content: bytes) -> bytes:
+    """Codifica un elemento DER con la etiqueta y el contenido dados"""
+    length = len(content)
+    if length < 0x80:
+        return bytes((tag, length)) + content
+    encoded = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes((tag, 0x80 | len(encoded))) + encoded + content
+
+
+def _sign_chunk(signer: PDFSigner, chunk: List[Tuple[int, str]], options: Dict[str, Any]):
+    """Firma en serie una parte del lote: devuelve (resultados, segundos de CPU)"""
+    cpu_start = time.process_time()
+    outcomes = []
+    # Por fases: los sellos de tiempo de toda la parte se piden juntos
+    for (index, _), outcome in zip(chunk, signer._sign_paths([path for _, path in chunk], options)):
+        if isinstance(outcome, Exception):
+            outcomes.append((index, {"success": False, "error": str(outcome)}))
+        else:
+            outcomes.append((index, {"success": True, **outcome}))
+    return outcomes, time.process_time() - cpu_start
+
+
+def _sign_worker(signer: PDFSigner, chunk: List[Tuple[int, str]], options: Dict[str, Any], connection):
+    """Punto de entrada del proceso hijo de sign_files"""
+    try:
+        connection.send(_sign_chunk(signer, chunk, options))
+    finally:
+        connection.close()
+
+
+def _add_signature_field(doc: fitz.Document, reserved_bytes: int, field_name: str = None,
+                         entries: Dict[str, str] = None, visible: Dict[str, Any] = None) -> str:
+    """
+    Añade a doc un campo de firma con un diccionario /Sig de marcadores
+    (/ByteRange y /Contents): invisible en la primera página o, con
+    visible, en su página y rectángulo con la apariencia compilada
+
+    Args:
+        doc: Documento abierto para guardado incremental
+        reserved_bytes: Bytes reservados para la firma CMS
+        field_name: Nombre del campo, o None para el primer SignatureN libre
+        entries: Claves de texto opcionales del diccionario /Sig (M, Reason...)
+        visible: appearance (CompiledAppearance), page, rect (coordenadas
+            de PyMuPDF, origen arriba a la izquierda), date y document_hash
+
+    Returns:
+        str: Nombre del campo creado
+    """
+    catalog = doc.pdf_catalog()
+    kind, fields = doc.xref_get_key(catalog, "AcroForm/Fields")
+    field_xrefs = [int(xref) for xref in re.findall(r"(\d+) 0 R", fields)] if kind in ("array", "xref") else []
+    if kind == "xref":
+        # /Fields como objeto indirecto: leer el array al que apunta
+        fields_xref = field_xrefs[0]
+        field_xrefs = [int(xref) for xref in re.findall(r"(\d+) 0 R", doc.xref_object(fields_xref))]
+
+    existing = set()
+    for xref in field_xrefs:
+        name_kind, name = doc.xref_get_key(xref, "T")
+        if name_kind == "string":
+            existing.add(name)
+    if field_name is None:
+        counter = 1
+        while f"Signature{counter}" in existing:
+            counter += 1
+        field_name = f"Signature{counter}"
+    elif field_name in existing:
+        raise SigningError(f"Ya existe un campo llamado {field_name}")
+
+    text_entries = "".join(
+        f"/{key} {fitz.get_pdf_str(value)}" for key, value in (entries or {}).items() if value
+    )
+    sig_xref = doc.get_new_xref()
+    doc.update_object(sig_xref, (
+        "<< /Type /Sig /Filter /Adobe.PPKLite /SubFilter /ETSI.CAdES.detached "
+        f"/ByteRange [{_BYTE_RANGE_PLACEHOLDER}] /Contents <{'00' * reserved_bytes}> {text_entries} >>"
+    ))
+
+    if visible is None:
+        page_xref = doc.page_xref(0)
+        # Sin superficie ni apariencia
+        widget_entries = "/Rect [0 0 0 0] /F 132"
+    else:
+        page_number = visible["page"]
+        if not 0 <= page_number < len(doc):
+            raise SigningError(f"La página {page_number} de la firma visible no existe")
+        page = doc[page_number]
+        page_xref = page.xref
+        rect = fitz.Rect(visible["rect"]) * ~page.transformation_matrix
+        form_xref = visible["appearance"].add_to(doc, visible["date"], visible["document_hash"])
+        # Imprimible y bloqueada
+        widget_entries = (f"/Rect [{rect.x0:g} {rect.y0:g} {rect.x1:g} {rect.y1:g}] /F 132 "
+                          f"/AP << /N {form_xref} 0 R >>")
+    widget_xref = doc.get_new_xref()
+    doc.update_object(widget_xref, (
+        f"<< /Type /Annot /Subtype /Widget /FT /Sig /T {fitz.get_pdf_str(field_name)} "
+        f"{widget_entries} /P {page_xref} 0 R /V {sig_xref} 0 R >>"
+    ))
+
+    _append_reference(doc, page_xref, "Annots", widget_xref)
+    kind, _ = doc.xref_get_key(catalog, "AcroForm")
+    if kind == "null":
+        doc.xref_set_key(catalog, "AcroForm", f"<< /Fields [{widget_xref} 0 R] /SigFlags 3 >>")
+    else:
+        _append_reference(doc, catalog, "AcroForm/Fields", widget_xref)
+        doc.xref_set_key(catalog, "AcroForm/SigFlags", "3")
+    return field_name
+
+
+def _append_reference(doc: fitz.Document, xref: int, key: str, target: int):
+    """Añade "target 0 R" al array de key, sea directo, indirecto o inexistente"""
+    kind, value = doc.xref_get_key(xref, key)
+    if kind == "array":
+        doc.xref_set_key(xref, key, f"{value[:-1].rstrip()} {target} 0 R]")
+    elif kind == "xref":
+        array_xref = int(value.split()[0])
+        array = doc.xref_object(array_xref, compressed=True).strip()
+        doc.update_object(array_xref, f"{array[:-1].rstrip()} {target} 0 R]")
+    else:
+        doc.xref_set_key(xref, key, f"[{target} 0 R]")
+
+
+def _write_byte_range(f, original_size: int, reserved_bytes: int) -> List[int]:
+    """
+    Localiza los marcadores en la actualización recién añadida y escribe el
+    /ByteRange real sobre el suyo
+
+    Args:
+        f: Archivo firmado abierto en "r+b"
+        original_size: Tamaño antes de la actualización (solo se busca detrás)
+        reserved_bytes: Bytes reservados para la firma CMS
+
+    Returns:
+        List[int]: [0, inicio del hueco, fin del hueco, resto] donde el
+        hueco es /Contents con sus delimitadores < >
+    """
+    f.seek(original_size)
+    tail = f.read()
+    file_size = original_size + len(tail)
+
+    byte_ranges = list(_BYTE_RANGE_RE.finditer(tail))
+    contents = list(re.finditer(rb"/Contents\s*<(0{%d})>" % (2 * reserved_bytes), tail))
+    if len(byte_ranges) != 1 or len(contents) != 1:
+        raise SigningError("No se encontró el diccionario de firma en la actualización incremental")
+
+    gap_start = original_size + contents[0].start(1) - 1
+    gap_end = original_size + contents[0].end(1) + 1
+    byte_range = [0, gap_start, gap_end, file_size - gap_end]
+
+    text = " ".join(str(value) for value in byte_range)
+    if len(text) > len(_BYTE_RANGE_PLACEHOLDER):
+        raise SigningError("El PDF es demasiado grande para el marcador de /ByteRange")
+    f.seek(original_size + byte_ranges[0].start(1))
+    f.write(text.ljust(len(_BYTE_RANGE_PLACEHOLDER)).encode("ascii"))
+    return byte_range
+
+
+def _digest_byte_range(f, byte_range: List[int], hash_name: str = "sha256") -> bytes:
+    """Hash (SHA-256 por defecto) de los dos rangos de /ByteRange leyendo el archivo por bloques"""
+    digest = hashlib.new(hash_name)
+    for offset, length in ((byte_range[0], byte_range[1]), (byte_range[2], byte_range[3])):
+        f.seek(offset)
+        while length > 0:
+            chunk = f.read(min(SIGNING_CHUNK_SIZE, length))
+            if not chunk:
+                raise SigningError("El archivo es más corto que su /ByteRange")
+            digest.update(chunk)
+            length -= len(chunk)
+    return digest.digest()
+
+
+# Firmante del proceso, creado en la primera firma
+_signer = None
+_signer_lock = threading.Lock()
+
+
+def get_signer() -> PDFSigner:
+    """
+    Devuelve el firmante configurado con PDF_SIGNING_KEY y PDF_SIGNING_CERT
+    (o PDF_SIGNING_P12), cargando la clave y codificando las partes fijas
+    de la CMS solo la primera vez
+    """
+    global _signer
+    if _signer is None:
+        with _signer_lock:
+            if _signer is None:
+                if SIGNING_P12:
+                    _signer = PDFSigner.from_pkcs12(SIGNING_P12, SIGNING_KEY_PASSWORD)
+                elif SIGNING_KEY and SIGNING_CERT:
+                    _signer = PDFSigner.from_files(SIGNING_KEY, SIGNING_CERT, SIGNING_CHAIN,
+                                                   SIGNING_KEY_PASSWORD)
+                else:
+                    raise SigningError(
+                        "La firma requiere PDF_SIGNING_KEY y PDF_SIGNING_CERT (o PDF_SIGNING_P12)"
+                    )
+                _signer.prepare()
+                print(f"🔑 Firmante cargado: {_signer.certificate.subject.rfc4514_string()}")
+    return _signer
+
+
+def create_test_identity(directory: str, common_name: str = "PDF Editor Test Signer",
+                         key_type: str = "rsa", days: int = 365) -> Dict[str, str]:
+    """
+    Genera una clave y un certificado autofirmado para pruebas sin red
+
+    Args:
+        directory: Directorio donde escribir key.pem y cert.pem
+        common_name: CN del certificado
+        key_type: "rsa" (2048 bits) o "ec" (P-256)
+        days: Validez del certificado
+
+    Returns:
+        Dict[str, str]: {"key": ruta, "cert": ruta}
+    """
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+    from cryptography.x509.oid import NameOID
+
+    if key_type == "ec":
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    elif key_type == "rsa":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    else:
+        raise ValueError(f"Tipo de clave no válido: {key_type}. Opciones: rsa, ec")
+
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(private_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=5))
+        .not_valid_after(now + datetime.timedelta(days=days))
+        .add_extension(x509.BasicConstraints(ca=False, path_length=None), critical=True)
+        .add_extension(x509.KeyUsage(
+            digital_signature=True, content_commitment=True, key_encipherment=False,
+            data_encipherment=False, key_agreement=False, key_cert_sign=False,
+            crl_sign=False, encipher_only=False, decipher_only=False
+        ), critical=True)
+        .sign(private_key, hashes.SHA256())
+    )
+
+    os.makedirs(directory, exist_ok=True)
+    paths = {"key": os.path.join(directory, "key.pem"), "cert": os.path.join(directory, "cert.pem")}
+    with open(paths["key"], "wb") as f:
+        f.write(private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        ))
+    with open(paths["cert"], "wb") as f:
+        f.write(certificate.public_bytes(serialization.Encoding.PEM))
+    return paths
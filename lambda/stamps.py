@@ -0,0 +1,277 @@
+"""
+Stamps Module
+Inserciones como anotaciones (modo "annotation") en lugar de editar el
+flujo de contenido de cada página
+
+Cada sello (texto, imagen, SVG/PDF o QR) se dibuja una vez en una página
+temporal de su tamaño y se compila como XObject de formulario, en caché en
+el proceso por su contenido. En cada documento el XObject se crea una sola
+vez y cada página recibe una anotación pequeña (/FreeText para el texto,
+/Stamp para el resto) cuya apariencia /AP /N lo referencia:
+    - el contenido y los recursos de las páginas no cambian, así que una
+      actualización incremental solo añade las anotaciones y el /Annots
+    - el mismo sello en muchas páginas ocupa un XObject y una anotación por
+      página
+    - cada anotación se identifica por /NM (STAMP_NAME_PREFIX + stamp_id):
+      volver a estampar el mismo stamp_id en una página sustituye el
+      anterior y remove_stamps los quita sin tocar el contenido
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import fitz  # PyMuPDF
+
+from appearance import add_form, compile_form
+
+
+STAMP_CACHE_MAX_ENTRIES = int(os.environ.get("PDF_STAMP_CACHE_MAX_ENTRIES", 128))
+STAMP_MODES = ("content", "annotation")
+STAMP_NAME_PREFIX = "pdfstamp:"
+
+# Opciones que solo colocan el sello y no cambian su apariencia
+_PLACEMENT_OPTIONS = ("position", "pages", "page", "mode", "stamp_id")
+
+
+class CompiledStamp:
+    """Apariencia de un sello lista para copiarse en cada documento"""
+
+    def __init__(self, width: float, height: float, form: Dict[str, Any], subtype: str,
+                 contents: str = "", ascent: float = 0):
+        """
+        Args:
+            width: Ancho del sello en puntos
+            height: Alto del sello en puntos
+            form: XObject de formulario (formato de appearance.compile_form)
+            subtype: "FreeText" o "Stamp"
+            contents: Texto de /Contents (lo que muestran los visores al
+                seleccionar la anotación)
+            ascent: Distancia de la línea base de la primera línea al borde
+                superior (solo texto)
+        """
+        self.width = width
+        self.height = height
+        self.form = form
+        self.subtype = subtype
+        self.contents = contents
+        self.ascent = ascent
+
+    def add_to(self, doc: fitz.Document) -> int:
+        """Crea en doc el XObject de la apariencia y devuelve su xref"""
+        return add_form(doc, self.form)
+
+
+def stamp_key(insertion: Dict[str, Any]) -> str:
+    """Clave de la apariencia de una inserción (sin las opciones de colocación)"""
+    content = {key: value for key, value in insertion.items()
+               if key not in _PLACEMENT_OPTIONS and value is not None}
+    return json.dumps(content, sort_keys=True, default=str)
+
+
+def stamp_name(insertion: Dict[str, Any], key: str = None) -> str:
+    """/NM de las anotaciones de una inserción: su stamp_id o un hash de su apariencia"""
+    stamp_id = insertion.get("stamp_id")
+    if not stamp_id:
+        stamp_id = hashlib.sha256((key or stamp_key(insertion)).encode("utf-8")).hexdigest()[:16]
+    return f"{STAMP_NAME_PREFIX}{stamp_id}"
+
+
+def compile_stamp(width: float, height: float, draw: Callable[[fitz.Page], None], subtype: str = "Stamp",
+                  contents: str = "", ascent: float = 0) -> CompiledStamp:
+    """
+    Dibuja un sello en una página temporal y lo compila como XObject
+
+    Args:
+        width: Ancho del sello en puntos
+        height: Alto del sello en puntos
+        draw: Función que dibuja el sello en la página temporal (origen
+            arriba a la izquierda, del tamaño del sello)
+        subtype: "FreeText" o "Stamp"
+        contents: Texto de /Contents
+        ascent: Ver CompiledStamp
+
+    Returns:
+        CompiledStamp: Sello listo para add_to
+    """
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Tamaño de sello no válido: {width}x{height}")
+    scratch = fitz.open()
+    draw(scratch.new_page(width=width, height=height))
+    # Guardar con deflate deja comprimidos el contenido y las imágenes
+    compressed = fitz.open("pdf", scratch.tobytes(deflate=True, garbage=1))
+    scratch.close()
+    try:
+        form, _ = compile_form(compressed)
+    finally:
+        compressed.close()
+    return CompiledStamp(width, height, form, subtype, contents, ascent)
+
+
+def compile_text_stamp(content: str, font_size: float = 12, color: List[float] = None,
+                       font_name: str = "helv") -> CompiledStamp:
+    """
+    Sello /FreeText con el texto en una o varias líneas, derecho (sin el
+    volteo del modo de contenido: la apariencia no hereda la matriz de la
+    página)
+
+    Args:
+        content: Texto (las líneas se separan con "\\n")
+        font_size: Tamaño de letra
+        color: RGB 0-1
+        font_name: Fuente de PyMuPDF ("helv", "tiro", "cour"...)
+
+    Returns:
+        CompiledStamp: Sello de texto
+    """
+    font = fitz.Font(font_name)
+    lines = content.split("\n") or [""]
+    line_height = font_size * (font.ascender - font.descender)
+    width = max(font.text_length(line, fontsize=font_size) for line in lines) or 1
+    ascent = font_size * font.ascender
+
+    def draw(page):
+        page.insert_text((0, ascent), content, fontsize=font_size, fontname=font_name,
+                         color=color or (0, 0, 0))
+
+    return compile_stamp(width, line_height * len(lines), draw, "FreeText", content, ascent)
+
+
+def add_stamp(page: fitz.Page, rect: fitz.Rect, form_xref: int, stamp: CompiledStamp, name: str) -> int:
+    """
+    Añade a page una anotación con la apariencia form_xref, sustituyendo la
+    que tuviera el mismo /NM
+
+    Args:
+        page: Página de destino
+        rect: Rectángulo en coordenadas de PyMuPDF (origen arriba a la izquierda)
+        form_xref: XObject de CompiledStamp.add_to en este documento
+        stamp: Sello compilado (subtipo y /Contents)
+        name: /NM de la anotación (ver stamp_name)
+
+    Returns:
+        int: xref de la anotación
+    """
+    doc = page.parent
+    pdf_rect = rect * ~page.transformation_matrix
+    entries = ""
+    if stamp.subtype == "FreeText":
+        # /DA es obligatorio en /FreeText; la apariencia ya está en /AP
+        entries = "/DA (/Helv 12 Tf 0 g) "
+    annot_xref = doc.get_new_xref()
+    # Imprimible y bloqueada
+    doc.update_object(annot_xref, (
+        f"<< /Type /Annot /Subtype /{stamp.subtype} "
+        f"/Rect [{pdf_rect.x0:g} {pdf_rect.y0:g} {pdf_rect.x1:g} {pdf_rect.y1:g}] "
+        f"/AP << /N {form_xref} 0 R >> /F 132 /NM {fitz.get_pdf_str(name)} "
+        f"/Contents {fitz.get_pdf_str(stamp.contents)} {entries}/P {page.xref} 0 R >>"
+    ))
+
+    annots = [xref for xref in _annot_xrefs(doc, page.xref) if _annot_name(doc, xref) != name]
+    annots.append(annot_xref)
+    _set_annots(doc, page.xref, annots)
+    return annot_xref
+
+
+def remove_stamps(doc: fitz.Document, stamp_ids: Iterable[str]) -> int:
+    """
+    Quita las anotaciones de sello con esos stamp_id ("*" = todas las de
+    este servicio); solo se reescribe el /Annots de las páginas afectadas
+
+    Args:
+        doc: Documento abierto
+        stamp_ids: stamp_id a quitar
+
+    Returns:
+        int: Anotaciones quitadas
+    """
+    names = {f"{STAMP_NAME_PREFIX}{stamp_id}" for stamp_id in stamp_ids}
+    remove_all = f"{STAMP_NAME_PREFIX}*" in names
+    removed = 0
+    for page_num in range(len(doc)):
+        page_xref = doc.page_xref(page_num)
+        annots = _annot_xrefs(doc, page_xref)
+        kept = []
+        for xref in annots:
+            name = _annot_name(doc, xref)
+            if name in names or (remove_all and name.startswith(STAMP_NAME_PREFIX)):
+                continue
+            kept.append(xref)
+        if len(kept) != len(annots):
+            removed += len(annots) - len(kept)
+            _set_annots(doc, page_xref, kept)
+    print(f"🧽 Sellos quitados: {removed}")
+    return removed
+
+
+def _annot_xrefs(doc: fitz.Document, page_xref: int) -> List[int]:
+    """xrefs del /Annots de una página, sea directo, indirecto o inexistente"""
+    kind, value = doc.xref_get_key(page_xref, "Annots")
+    if kind == "xref":
+        value = doc.xref_object(int(value.split()[0]), compressed=True)
+    elif kind != "array":
+        return []
+    return [int(xref) for xref in re.findall(r"(\d+) \d+ R", value)]
+
+
+def _set_annots(doc: fitz.Document, page_xref: int, annots: List[int]):
+    """Escribe el /Annots de una página (en su objeto si era indirecto)"""
+    array = "[" + " ".join(f"{xref} 0 R" for xref in annots) + "]"
+    kind, value = doc.xref_get_key(page_xref, "Annots")
+    if kind == "xref":
+        doc.update_object(int(value.split()[0]), array)
+    elif annots:
+        doc.xref_set_key(page_xref, "Annots", array)
+    elif kind != "null":
+        doc.xref_set_key(page_xref, "Annots", "null")
+
+
+def _annot_name(doc: fitz.Document, xref: int) -> str:
+    """/NM de una anotación ("" si no tiene)"""
+    kind, value = doc.xref_get_key(xref, "NM")
+    return value if kind == "string" else ""
+
+
+class StampCache:
+    """Sellos compilados por apariencia (LRU)"""
+
+    def __init__(self, max_entries: int = STAMP_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CompiledStamp]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, key: str, compile: Callable[[], CompiledStamp]) -> CompiledStamp:
+        """Sello de key, compilándolo con compile() solo la primera vez"""
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return compiled
+            self.stats["misses"] += 1
+
+        compiled = compile()
+        with self._lock:
+            self._entries[key] = compiled
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        print(f"🏷️ Sello compilado ({compiled.subtype}, {compiled.width:g}x{compiled.height:g} pt)")
+        return compiled
+
+    def clear(self):
+        """Vacía la caché"""
+        with self._lock:
+            self._entries.clear()
+
+
+_stamp_cache = StampCache()
+
+
+def get_stamp_cache() -> StampCache:
+    """Caché de sellos compartida por todo el proceso"""
+    return _stamp_cache
@@ -0,0 +1,440 @@
+"""
+Storage Module
+Abstracción de almacenamiento para los PDFs procesados, con una
+implementación sobre el sistema de archivos local y otra sobre S3
+
+Ambas exponen la misma interfaz (lectura y escritura en streaming,
+existencia, listado y URLs prefirmadas), de modo que la misma ruta de
+código funciona en el servidor local y en Lambda. LocalStorage sirve
+además como sustituto de S3 en pruebas y benchmarks sin AWS.
+"""
+
+import hashlib
+import hmac
+import io
+import os
+import secrets
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Dict, Iterator, List, Tuple
+from urllib.parse import quote, urlencode, urlparse
+
+
+STORAGE_CHUNK_SIZE = 1024 * 1024
+
+# Objetos S3 mayores que este umbral se leen con GETs por rangos en paralelo
+S3_RANGED_GET_THRESHOLD = int(os.environ.get("S3_RANGED_GET_THRESHOLD", 16 * 1024 * 1024))
+S3_RANGE_SIZE = int(os.environ.get("S3_RANGE_SIZE", 8 * 1024 * 1024))
+S3_RANGE_CONCURRENCY = int(os.environ.get("S3_RANGE_CONCURRENCY", 8))
+
+# Secreto de las URLs locales cuando no se define PDF_STORAGE_SECRET
+_PROCESS_SECRET = secrets.token_bytes(32)
+
+
+def parse_s3_uri(uri: str) -> Tuple[str, str]:
+    """
+    Separa una URI s3://bucket/key en bucket y key
+
+    Args:
+        uri: URI con esquema s3://
+
+    Returns:
+        Tuple[str, str]: (bucket, key)
+    """
+    parsed = urlparse(uri)
+    key = parsed.path.lstrip("/")
+    if parsed.scheme != "s3" or not parsed.netloc or not key:
+        raise ValueError(f"URI de S3 no válida: {uri}")
+    return parsed.netloc, key
+
+
+class Storage:
+    """Interfaz común de los backends de almacenamiento"""
+
+    def open_read(self, key: str) -> BinaryIO:
+        """Abre un objeto para lectura en streaming (objeto con read())"""
+        raise NotImplementedError
+
+    def open_write(self, key: str, content_type: str = "application/pdf"):
+        """
+        Abre un objeto para escritura en streaming
+
+        Devuelve un objeto tipo archivo con write(), size y sha256. Usado como
+        context manager, confirma el objeto al salir sin error y lo descarta
+        si hubo una excepción.
+        """
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def list(self, prefix: str = "") -> List[str]:
+        raise NotImplementedError
+
+    def size(self, key: str) -> int:
+        """Tamaño del objeto en bytes"""
+        raise NotImplementedError
+
+    def url(self, key: str, expires_in: int = 3600) -> str:
+        """URL prefirmada para descargar el objeto durante expires_in segundos"""
+        raise NotImplementedError
+
+    def presigned_post(self, key: str, expires_in: int = 3600, max_bytes: int = None,
+                       content_type: str = "application/pdf") -> Dict[str, Any]:
+        """
+        Formulario prefirmado para que el cliente suba el objeto directamente
+        al almacenamiento, sin pasar por la API
+
+        Args:
+            key: Clave del objeto a subir
+            expires_in: Segundos de validez del formulario
+            max_bytes: Tamaño máximo aceptado (None sin límite)
+            content_type: Content-Type que debe enviar el cliente
+
+        Returns:
+            Dict[str, Any]: {"url": ..., "fields": {...}}; el cliente envía un
+            POST multipart a url con fields y el archivo en el campo "file"
+        """
+        raise NotImplementedError
+
+    def read_bytes(self, key: str) -> bytes:
+        """Lee un objeto pequeño completo (por ejemplo, un JSON)"""
+        return b"".join(self.iter_chunks(key))
+
+    def write_bytes(self, key: str, data: bytes, content_type: str = "application/octet-stream"):
+        """Escribe un objeto pequeño completo"""
+        with self.open_write(key, content_type=content_type) as writer:
+            writer.write(data)
+
+    def iter_chunks(self, key: str, chunk_size: int = STORAGE_CHUNK_SIZE) -> Iterator[bytes]:
+        """Itera el contenido del objeto en bloques"""
+        stream = self.open_read(key)
+        try:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            stream.close()
+
+
+class _LocalFileWriter:
+    """
+    Escritor de LocalStorage: escribe en un temporal junto al destino y lo
+    renombra al cerrar, para que los lectores nunca vean archivos a medias
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, self._temp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+        self._file = os.fdopen(fd, "wb")
+        self._hash = hashlib.sha256()
+        self._position = 0
+        self.closed = False
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    @property
+    def size(self) -> int:
+        return self._position
+
+    def write(self, data) -> int:
+        self._hash.update(data)
+        self._file.write(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def seekable(self) -> bool:
+        return False
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        # PyMuPDF exige que el objeto tenga seek(); la escritura es secuencial
+        raise io.UnsupportedOperation("La escritura en el almacenamiento es secuencial")
+
+    def writable(self) -> bool:
+        return True
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self._file.close()
+        os.replace(self._temp_path, self.path)
+
+    def abort(self):
+        self.closed = True
+        self._file.close()
+        if os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class LocalStorage(Storage):
+    """
+    Almacenamiento en un directorio local
+
+    Las URLs se firman con HMAC para imitar las URLs prefirmadas de S3 y se
+    validan con verify_url().
+    """
+
+    def __init__(self, root: str = "output", base_url: str = "", secret: str = None):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip("/")
+        secret = secret or os.environ.get("PDF_STORAGE_SECRET")
+        if secret:
+            self.secret = secret.encode()
+        else:
+            # Sin secreto configurado las URLs solo valen en este proceso:
+            # una constante en el código permitiría falsificarlas
+            self.secret = _PROCESS_SECRET
+            print("⚠️ PDF_STORAGE_SECRET no está definido: las URLs firmadas usan un secreto "
+                  "aleatorio de este proceso")
+
+    def path(self, key: str) -> str:
+        """Ruta local de un objeto, sin permitir salir del directorio raíz"""
+        path = os.path.abspath(os.path.join(self.root, key))
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise ValueError(f"Clave de almacenamiento no válida: {key}")
+        return path
+
+    def open_read(self, key: str) -> BinaryIO:
+        try:
+            return open(self.path(key), "rb")
+        except FileNotFoundError:
+            raise FileNotFoundError(f"El objeto no existe: {key}")
+
+    def open_write(self, key: str, content_type: str = "application/pdf") -> _LocalFileWriter:
+        return _LocalFileWriter(self.path(key))
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self.path(key))
+
+    def delete(self, key: str):
+        if self.exists(key):
+            os.remove(self.path(key))
+
+    def size(self, key: str) -> int:
+        try:
+            return os.path.getsize(self.path(key))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"El objeto no existe: {key}")
+
+    def list(self, prefix: str = "") -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        keys = []
+        for directory, _, files in os.walk(self.root):
+            for filename in files:
+                if filename.startswith(".") or filename.endswith(".part"):
+                    continue
+                key = os.path.relpath(os.path.join(directory, filename), self.root).replace(os.sep, "/")
+                if key.startswith(prefix):
+                    keys.append(key)
+        return sorted(keys)
+
+    def _signature(self, key: str, expires: int, action: str = "get", max_bytes: int = None) -> str:
+        # Las firmas de subida llevan prefijo para que una URL de descarga no
+        # sirva para sobrescribir el objeto, y el tamaño máximo para que no
+        # se pueda ampliar
+        message = f"{key}:{expires}" if action == "get" else f"{action}:{key}:{expires}"
+        if max_bytes is not None:
+            message += f":{max_bytes}"
+        return hmac.new(self.secret, message.encode(), hashlib.sha256).hexdigest()
+
+    def url(self, key: str, expires_in: int = 3600) -> str:
+        expires = int(time.time()) + expires_in
+        query = urlencode({"expires": expires, "signature": self._signature(key, expires)})
+        return f"{self.base_url}/download/{quote(key)}?{query}"
+
+    def presigned_post(self, key: str, expires_in: int = 3600, max_bytes: int = None,
+                       content_type: str = "application/pdf") -> Dict[str, Any]:
+        self.path(key)
+        expires = int(time.time()) + expires_in
+        fields = {
+            "key": key,
+            "expires": str(expires),
+            "signature": self._signature(key, expires, action="put", max_bytes=max_bytes)
+        }
+        if max_bytes is not None:
+            fields["max_bytes"] = str(max_bytes)
+        return {"url": f"{self.base_url}/upload", "fields": fields}
+
+    def verify_url(self, key: str, expires: int, signature: str, action: str = "get",
+                   max_bytes: int = None) -> bool:
+        """
+        Comprueba la firma y la caducidad de una URL generada por url() o
+        de un formulario de presigned_post() (action="put", con el
+        max_bytes del formulario si lo tenía)
+        """
+        if int(expires) < time.time():
+            return False
+        return hmac.compare_digest(self._signature(key, int(expires), action, max_bytes), signature)
+
+
+class S3Storage(Storage):
+    """Almacenamiento en un bucket S3, con el cliente compartido del proceso"""
+
+    def __init__(self, bucket: str, client=None):
+        self.bucket = bucket
+        self._client = client
+
+    @property
+    def client(self):
+        # Sin cliente explícito se usa el compartido en cada llamada, que se
+        # recrea en los procesos hijos (ver s3_upload)
+        if self._client is not None:
+            return self._client
+        from s3_upload import get_s3_client
+        return get_s3_client()
+
+    def open_read(self, key: str) -> BinaryIO:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+        except self.client.exceptions.NoSuchKey:
+            raise FileNotFoundError(f"El objeto no existe: s3://{self.bucket}/{key}")
+
+    def open_write(self, key: str, content_type: str = "application/pdf"):
+        from s3_upload import S3MultipartWriter
+        return S3MultipartWriter(self.bucket, key, client=self.client, content_type=content_type)
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def list(self, prefix: str = "") -> List[str]:
+        keys = []
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            keys.extend(item["Key"] for item in page.get("Contents", []))
+        return keys
+
+    def size(self, key: str) -> int:
+        from botocore.exceptions import ClientError
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                raise FileNotFoundError(f"El objeto no existe: s3://{self.bucket}/{key}")
+            raise
+
+    def iter_chunks(self, key: str, chunk_size: int = STORAGE_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Itera el contenido del objeto en orden; los objetos grandes se
+        descargan con varios GETs por rangos en paralelo
+        """
+        size = self.size(key)
+        if size <= S3_RANGED_GET_THRESHOLD:
+            yield from super().iter_chunks(key, chunk_size)
+            return
+        yield from self._iter_ranges(key, size)
+
+    def _get_range(self, key: str, start: int, end: int) -> bytes:
+        response = self.client.get_object(Bucket=self.bucket, Key=key, Range=f"bytes={start}-{end}")
+        return response["Body"].read()
+
+    def _iter_ranges(self, key: str, size: int) -> Iterator[bytes]:
+        """
+        Descarga rangos en paralelo con una ventana acotada de peticiones en
+        vuelo, devolviéndolos en orden
+        """
+        ranges = deque(
+            (start, min(start + S3_RANGE_SIZE, size) - 1)
+            for start in range(0, size, S3_RANGE_SIZE)
+        )
+        with ThreadPoolExecutor(max_workers=S3_RANGE_CONCURRENCY) as executor:
+            pending = deque()
+            while ranges or pending:
+                while ranges and len(pending) < S3_RANGE_CONCURRENCY:
+                    start, end = ranges.popleft()
+                    pending.append(executor.submit(self._get_range, key, start, end))
+                yield pending.popleft().result()
+
+    def presigned_post(self, key: str, expires_in: int = 3600, max_bytes: int = None,
+                       content_type: str = "application/pdf") -> Dict[str, Any]:
+        conditions = [{"Content-Type": content_type}]
+        if max_bytes:
+            conditions.append(["content-length-range", 1, max_bytes])
+        return self.client.generate_presigned_post(
+            Bucket=self.bucket,
+            Key=key,
+            Fields={"Content-Type": content_type},
+            Conditions=conditions,
+            ExpiresIn=expires_in
+        )
+
+    def url(self, key: str, expires_in: int = 3600) -> str:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=expires_in
+        )
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage(default_backend: str = "local") -> Storage:
+    """
+    Devuelve el almacenamiento configurado para el proceso
+
+    PDF_STORAGE_BACKEND ("local" o "s3") tiene prioridad sobre
+    default_backend. LocalStorage usa PDF_STORAGE_ROOT (por defecto
+    "output") y PDF_STORAGE_BASE_URL; S3Storage usa PDF_BUCKET_NAME.
+
+    Args:
+        default_backend: Backend a usar si no se configuró ninguno
+
+    Returns:
+        Storage: Instancia compartida del backend
+    """
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                backend = os.environ.get("PDF_STORAGE_BACKEND", default_backend)
+                if backend == "s3":
+                    _storage = S3Storage(os.environ.get("PDF_BUCKET_NAME", "your-default-bucket-name"))
+                elif backend == "local":
+                    _storage = LocalStorage(
+                        os.environ.get("PDF_STORAGE_ROOT", "output"),
+                        base_url=os.environ.get("PDF_STORAGE_BASE_URL", "")
+                    )
+                else:
+                    raise ValueError(f"Backend de almacenamiento no válido: {backend}")
+    return _storage
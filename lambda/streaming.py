@@ -0,0 +1,187 @@
+"""
+Streaming Module
+Devuelve el PDF procesado en la respuesta HTTP a medida que se serializa
+
+doc.save() escribe en un objeto tipo archivo desde un hilo productor y la
+respuesta consume los bloques de una cola acotada, de modo que el primer
+byte sale antes de terminar el guardado y la memoria no depende del tamaño
+del PDF. En Lambda esto requiere el modo RESPONSE_STREAM, que para Python
+se obtiene con Lambda Web Adapter (ver Dockerfile.streaming); detrás de
+Mangum la respuesta se acumula y solo sirve para salidas pequeñas.
+"""
+
+import hashlib
+import io
+import os
+import queue
+import threading
+from typing import Any, Dict, Iterator, List
+
+
+STREAM_CHUNK_SIZE = int(os.environ.get("PDF_STREAM_CHUNK_SIZE", 256 * 1024))
+# Bloques en vuelo entre el productor y la respuesta (memoria acotada)
+STREAM_QUEUE_CHUNKS = int(os.environ.get("PDF_STREAM_QUEUE_CHUNKS", 16))
+# Si el cliente deja de leer durante este tiempo se cancela el guardado
+STREAM_STALL_SECONDS = int(os.environ.get("PDF_STREAM_STALL_SECONDS", 30))
+
+# Con Lambda Web Adapter en modo streaming el límite es de 20 MB; a través de
+# Mangum la respuesta va en base64 dentro del límite de 6 MB
+if os.environ.get("AWS_LWA_INVOKE_MODE", "").lower() == "response_stream":
+    _DEFAULT_STREAM_MAX_BYTES = 20 * 1024 * 1024
+else:
+    _DEFAULT_STREAM_MAX_BYTES = 4 * 1024 * 1024
+STREAM_MAX_BYTES = int(os.environ.get("PDF_STREAM_MAX_BYTES", _DEFAULT_STREAM_MAX_BYTES))
+
+# Estimación del tamaño de salida: entrada * factor + margen por inserción
+STREAM_SIZE_FACTOR = float(os.environ.get("PDF_STREAM_SIZE_FACTOR", 1.1))
+STREAM_BYTES_PER_INSERTION = int(os.environ.get("PDF_STREAM_BYTES_PER_INSERTION", 256 * 1024))
+
+_DONE = object()
+
+
+class StreamCancelled(Exception):
+    """El cliente dejó de leer la respuesta"""
+    pass
+
+
+def estimate_output_bytes(pdf_source: Dict[str, Any], insertions: List[Dict[str, Any]]) -> int:
+    """
+    Estima el tamaño del PDF de salida a partir de la entrada
+
+    Args:
+        pdf_source: {"pdf_stream": bytes} o {"pdf_path": ruta local}
+        insertions: Inserciones a aplicar
+
+    Returns:
+        int: Tamaño estimado en bytes
+    """
+    if pdf_source.get("pdf_stream") is not None:
+        input_bytes = len(pdf_source["pdf_stream"])
+    else:
+        input_bytes = os.path.getsize(pdf_source["pdf_path"])
+    return int(input_bytes * STREAM_SIZE_FACTOR) + STREAM_BYTES_PER_INSERTION * len(insertions)
+
+
+def should_stream(pdf_source: Dict[str, Any], insertions: List[Dict[str, Any]]) -> bool:
+    """True si la salida estimada cabe en una respuesta en streaming"""
+    return estimate_output_bytes(pdf_source, insertions) <= STREAM_MAX_BYTES
+
+
+class QueueWriter:
+    """
+    Objeto tipo archivo que agrupa lo escrito en bloques y los pasa a una
+    cola acotada; write() se bloquea si la respuesta va más lenta
+    """
+
+    def __init__(self, chunks: queue.Queue, chunk_size: int = STREAM_CHUNK_SIZE):
+        self._chunks = chunks
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._hash = hashlib.sha256()
+        self._position = 0
+        self.cancelled = threading.Event()
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    @property
+    def size(self) -> int:
+        return self._position
+
+    def _put(self, item):
+        try:
+            self._chunks.put(item, timeout=STREAM_STALL_SECONDS)
+        except queue.Full:
+            self.cancelled.set()
+        if self.cancelled.is_set():
+            raise StreamCancelled("El cliente dejó de leer la respuesta")
+
+    def write(self, data) -> int:
+        if self.cancelled.is_set():
+            raise StreamCancelled("El cliente dejó de leer la respuesta")
+        self._hash.update(data)
+        self._buffer += data
+        self._position += len(data)
+        while len(self._buffer) >= self._chunk_size:
+            chunk = bytes(self._buffer[:self._chunk_size])
+            del self._buffer[:self._chunk_size]
+            self._put(chunk)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def seekable(self) -> bool:
+        return False
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        # PyMuPDF exige que el objeto tenga seek(); la escritura es secuencial
+        raise io.UnsupportedOperation("La respuesta en streaming es secuencial")
+
+    def writable(self) -> bool:
+        return True
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self._buffer:
+            self._put(bytes(self._buffer))
+            self._buffer = bytearray()
+
+
+def stream_pdf(processor, pdf_data: Dict[str, Any]) -> Iterator[bytes]:
+    """
+    Procesa el PDF en un hilo y devuelve sus bytes a medida que se guardan
+
+    Espera al primer bloque antes de volver, así que los errores de apertura
+    o de inserción se lanzan aquí (y se pueden responder con un código HTTP)
+    en lugar de cortar una respuesta ya empezada. Llamar desde un hilo, no
+    desde el bucle de eventos.
+
+    Args:
+        processor: PDFProcessor dedicado a esta petición (no compartido)
+        pdf_data: Datos para process_pdf, sin salida
+
+    Returns:
+        Iterator[bytes]: Bloques del PDF en orden
+    """
+    chunks = queue.Queue(maxsize=STREAM_QUEUE_CHUNKS)
+    writer = QueueWriter(chunks)
+
+    def produce():
+        try:
+            processor.process_pdf({**pdf_data, "output_stream": writer})
+            writer.close()
+            outcome = _DONE
+        except StreamCancelled:
+            return
+        except BaseException as e:
+            outcome = e
+        try:
+            chunks.put(outcome, timeout=STREAM_STALL_SECONDS)
+        except queue.Full:
+            pass
+
+    threading.Thread(target=produce, name="pdf-stream", daemon=True).start()
+
+    first = chunks.get()
+    if isinstance(first, BaseException):
+        raise first
+
+    def iterate():
+        item = first
+        try:
+            while item is not _DONE:
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+                item = chunks.get()
+        finally:
+            # Desbloquear al productor si la respuesta se abandona
+            writer.cancelled.set()
+            while not chunks.empty():
+                chunks.get_nowait()
+
+    return iterate()
@@ -0,0 +1,105 @@
+"""
+Vector Module
+Orígenes vectoriales (SVG y PDF de una página) para las inserciones de
+imagen y la apariencia de las firmas
+
+Cada origen se convierte una vez en un PDF de una página (los SVG con el
+intérprete de MuPDF, sin rasterizar) y se guarda en caché en el proceso
+por el SHA-256 de su contenido: el mismo sello servido desde dos URLs o
+rutas distintas se convierte una sola vez. El procesador lo coloca con
+show_pdf_page, que copia la página una vez por documento como XObject de
+formulario y la reutiliza en cada inserción.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict
+from urllib.parse import urlparse
+
+import fitz  # PyMuPDF
+
+
+VECTOR_CACHE_MAX_ENTRIES = int(os.environ.get("PDF_VECTOR_CACHE_MAX_ENTRIES", 64))
+VECTOR_EXTENSIONS = (".svg", ".pdf")
+
+
+def is_vector_source(source: str) -> bool:
+    """True si source (ruta, URL o URI s3://) es un SVG o un PDF por su extensión"""
+    path = urlparse(source).path if "://" in source else source
+    return os.path.splitext(path.lower())[1] in VECTOR_EXTENSIONS
+
+
+def convert_vector(data: bytes) -> fitz.Document:
+    """
+    PDF de una página con el contenido de un SVG o de un PDF de una página
+
+    Args:
+        data: Bytes del SVG o del PDF
+
+    Returns:
+        fitz.Document: Documento para show_pdf_page
+    """
+    if b"%PDF-" in data[:1024]:
+        doc = fitz.open("pdf", data)
+        if doc.page_count != 1:
+            page_count = doc.page_count
+            doc.close()
+            raise ValueError(f"El PDF de origen debe tener una página (tiene {page_count})")
+        return doc
+
+    try:
+        svg = fitz.open("svg", data)
+    except Exception as e:
+        raise ValueError(f"El origen vectorial no es un SVG ni un PDF válido: {e}")
+    try:
+        pdf = svg.convert_to_pdf()
+    finally:
+        svg.close()
+    return fitz.open("pdf", pdf)
+
+
+class VectorCache:
+    """Orígenes vectoriales convertidos por SHA-256 de su contenido (LRU)"""
+
+    def __init__(self, max_entries: int = VECTOR_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, fitz.Document]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    def get(self, data: bytes) -> fitz.Document:
+        """Documento convertido de data, convirtiéndolo solo la primera vez"""
+        key = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            converted = self._entries.get(key)
+            if converted is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return converted
+            self.stats["misses"] += 1
+
+        converted = convert_vector(data)
+        with self._lock:
+            self._entries[key] = converted
+            # Los documentos expulsados no se cierran: pueden seguir en uso
+            # por un procesador que aún los está colocando
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        rect = converted[0].rect
+        print(f"📐 Origen vectorial convertido ({rect.width:g}x{rect.height:g} pt, {key[:12]}…)")
+        return converted
+
+    def clear(self):
+        """Vacía la caché"""
+        with self._lock:
+            self._entries.clear()
+
+
+_vector_cache = VectorCache()
+
+
+def get_vector_cache() -> VectorCache:
+    """Caché de orígenes vectoriales compartida por todo el proceso"""
+    return _vector_cache
@@ -0,0 +1,474 @@
+"""
+Verification Module
+Verificación de las firmas de un PDF (ver signing.py)
+
+Para cada campo de firma se comprueba:
+    - integridad: el hash de los rangos de /ByteRange, calculado leyendo el
+      archivo por bloques, coincide con el message-digest de la CMS y la
+      firma de los atributos es válida para el certificado del firmante
+    - confianza: el certificado encadena hasta un certificado del almacén
+      local (PDF_TRUST_STORE, archivo PEM o directorio de .pem/.crt/.cer)
+
+Si la firma lleva sello de tiempo (ver ltv.py) se comprueba que sella el
+valor de la firma y que la firma de la TSA es válida, y se indica si el
+/DSS del documento tiene una entrada /VRI para ella. Los PDFs firmados en
+lote con un manifiesto de Merkle se verifican con manifest.verify_document.
+
+Solo se leen el catálogo, /AcroForm y los diccionarios de firma: el
+contenido de las páginas no se analiza. La validación de cadenas se guarda
+en caché por huella de los certificados durante PDF_CHAIN_CACHE_TTL_SECONDS.
+"""
+
+import datetime
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+import fitz  # PyMuPDF
+
+from ltv import vri_key
+from manifest import PROOF_ATTACHMENT, verify_document
+from signing import SigningError, _digest_byte_range
+
+
+TRUST_STORE = os.environ.get("PDF_TRUST_STORE")
+CHAIN_CACHE_TTL_SECONDS = int(os.environ.get("PDF_CHAIN_CACHE_TTL_SECONDS", 3600))
+CHAIN_CACHE_MAX_ENTRIES = int(os.environ.get("PDF_CHAIN_CACHE_MAX_ENTRIES", 1024))
+# Longitud máxima de una cadena (evita bucles con certificados cruzados)
+MAX_CHAIN_LENGTH = 10
+
+_TRUST_STORE_EXTENSIONS = (".pem", ".crt", ".cer")
+
+
+def load_trust_store(path: str) -> List[Any]:
+    """
+    Carga los certificados de confianza
+
+    Args:
+        path: Archivo PEM (uno o varios certificados) o directorio con
+            archivos .pem, .crt o .cer (PEM o DER)
+
+    Returns:
+        List[x509.Certificate]: Certificados de confianza
+    """
+    from cryptography import x509
+
+    if os.path.isdir(path):
+        files = [os.path.join(path, name) for name in sorted(os.listdir(path))
+                 if name.lower().endswith(_TRUST_STORE_EXTENSIONS)]
+    else:
+        files = [path]
+
+    certificates = []
+    for file_path in files:
+        with open(file_path, "rb") as f:
+            data = f.read()
+        if b"-----BEGIN CERTIFICATE-----" in data:
+            certificates.extend(x509.load_pem_x509_certificates(data))
+        else:
+            certificates.append(x509.load_der_x509_certificate(data))
+    return certificates
+
+
+def _fingerprint(certificate) -> str:
+    from cryptography.hazmat.primitives import hashes
+
+    return certificate.fingerprint(hashes.SHA256()).hex()
+
+
+class ChainValidator:
+    """
+    Valida cadenas de certificados contra un almacén de confianza y guarda
+    los resultados por huella durante ttl_seconds
+    """
+
+    def __init__(self, trust_anchors: List[Any], ttl_seconds: int = CHAIN_CACHE_TTL_SECONDS,
+                 max_entries: int = CHAIN_CACHE_MAX_ENTRIES):
+        self.trust_anchors = {_fingerprint(cert): cert for cert in trust_anchors}
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def validate(self, certificate, intermediates: List[Any] = None) -> Dict[str, Any]:
+        """
+        Busca una cadena desde certificate hasta un certificado de confianza
+
+        Args:
+            certificate: Certificado del firmante (cryptography)
+            intermediates: Otros certificados incluidos en la firma
+
+        Returns:
+            Dict[str, Any]: trusted, chain (sujetos desde el firmante hasta
+            el de confianza), error y cached
+        """
+        intermediates = intermediates or []
+        # La clave incluye los intermedios: otro documento del mismo
+        # firmante puede traer (o no) el intermedio que falta
+        key = _fingerprint(certificate) + ":" + ",".join(sorted(_fingerprint(cert) for cert in intermediates))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > now:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+                return {**entry[1], "cached": True}
+            self.stats["misses"] += 1
+
+        result = self._build_chain(certificate, intermediates)
+        with self._lock:
+            self._cache[key] = (now + self.ttl_seconds, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return {**result, "cached": False}
+
+    def _build_chain(self, certificate, intermediates: List[Any]) -> Dict[str, Any]:
+        """Construye y comprueba la cadena (firmas y fechas de validez)"""
+        now = datetime.datetime.now(datetime.timezone.utc)
+        candidates = list(self.trust_anchors.values()) + intermediates
+        chain = [certificate]
+        current = certificate
+
+        while len(chain) <= MAX_CHAIN_LENGTH:
+            if not current.not_valid_before_utc <= now <= current.not_valid_after_utc:
+                return self._result(chain, f"Certificado fuera de su periodo de validez: {current.subject.rfc4514_string()}")
+            if _fingerprint(current) in self.trust_anchors:
+                return self._result(chain)
+
+            issuer = None
+            for candidate in candidates:
+                if candidate.subject != current.issuer or candidate in chain:
+                    continue
+                try:
+                    current.verify_directly_issued_by(candidate)
+                except Exception:
+                    continue
+                issuer = candidate
+                # Preferir el certificado de confianza si hay varios
+                if _fingerprint(candidate) in self.trust_anchors:
+                    break
+            if issuer is None:
+                return self._result(chain, f"No se encontró un emisor de confianza para {current.subject.rfc4514_string()}")
+            chain.append(issuer)
+            current = issuer
+
+        return self._result(chain, "Cadena de certificados demasiado larga")
+
+    @staticmethod
+    def _result(chain: List[Any], error: str = None) -> Dict[str, Any]:
+        return {
+            "trusted": error is None,
+            "chain": [cert.subject.rfc4514_string() for cert in chain],
+            "error": error
+        }
+
+
+# Validador del proceso, con el almacén cargado la primera vez
+_validator = None
+_validator_lock = threading.Lock()
+
+
+def get_chain_validator() -> ChainValidator:
+    """Devuelve el validador de cadenas con el almacén de PDF_TRUST_STORE"""
+    global _validator
+    if _validator is None:
+        with _validator_lock:
+            if _validator is None:
+                anchors = load_trust_store(TRUST_STORE) if TRUST_STORE else []
+                _validator = ChainValidator(anchors)
+                print(f"🛡️ Almacén de confianza: {len(anchors)} certificados")
+    return _validator
+
+
+def signature_fields(doc: fitz.Document) -> List[Tuple[str, int]]:
+    """
+    Campos de firma con valor del formulario del documento
+
+    Args:
+        doc: Documento abierto
+
+    Returns:
+        List[Tuple[str, int]]: (nombre completo del campo, xref de su
+        diccionario /Sig), en el orden del formulario
+    """
+    catalog = doc.pdf_catalog()
+    kind, value = doc.xref_get_key(catalog, "AcroForm/Fields")
+    if kind == "xref":
+        value = doc.xref_object(int(value.split()[0]), compressed=True)
+    elif kind != "array":
+        return []
+
+    fields = []
+    pending = [(int(xref), "") for xref in reversed(re.findall(r"(\d+) 0 R", value))]
+    visited = set()
+    while pending:
+        xref, parent_name = pending.pop()
+        if xref in visited:
+            continue
+        visited.add(xref)
+        name_kind, name = doc.xref_get_key(xref, "T")
+        full_name = ".".join(part for part in (parent_name, name if name_kind == "string" else "") if part)
+
+        kids_kind, kids = doc.xref_get_key(xref, "Kids")
+        if kids_kind == "xref":
+            kids = doc.xref_object(int(kids.split()[0]), compressed=True)
+        if kids_kind in ("array", "xref"):
+            pending.extend((int(kid), full_name) for kid in reversed(re.findall(r"(\d+) 0 R", kids)))
+            continue
+
+        # /FT se hereda del padre, así que basta con que /V sea un /Sig
+        value_kind, value_ref = doc.xref_get_key(xref, "V")
+        if value_kind == "xref":
+            sig_xref = int(value_ref.split()[0])
+            if doc.xref_get_key(sig_xref, "ByteRange")[0] == "array":
+                fields.append((full_name, sig_xref))
+    return fields
+
+
+def verify_pdf(path: str, validator: ChainValidator = None) -> Dict[str, Any]:
+    """
+    Verifica todas las firmas de un PDF
+
+    Args:
+        path: PDF local
+        validator: Validador de cadenas (por defecto, el del proceso)
+
+    Returns:
+        Dict[str, Any]: signatures (una por campo), signature_count,
+        manifest (verificación de la prueba de un lote firmado con
+        manifest.sign_manifest, o None) y valid (True si hay firmas y todas
+        son íntegras y de confianza, o si sin firmas la prueba es válida)
+    """
+    validator = validator or get_chain_validator()
+    file_size = os.path.getsize(path)
+
+    doc = fitz.open(path)
+    try:
+        fields = []
+        for field_name, sig_xref in signature_fields(doc):
+            entries = {}
+            for key in ("ByteRange", "SubFilter", "M", "Reason", "Location", "ContactInfo"):
+                kind, value = doc.xref_get_key(sig_xref, key)
+                if kind != "null":
+                    entries[key] = value
+            fields.append((field_name, entries))
+        vri_keys = _vri_keys(doc)
+        has_manifest_proof = PROOF_ATTACHMENT in doc.embfile_names()
+    finally:
+        doc.close()
+
+    signatures = []
+    with open(path, "rb") as f:
+        for field_name, entries in fields:
+            result = {
+                "field_name": field_name,
+                "sub_filter": entries.get("SubFilter", "").lstrip("/") or None,
+                "signed_at": entries.get("M"),
+                "reason": entries.get("Reason"),
+                "location": entries.get("Location"),
+                "integrity": False,
+                "trusted": False,
+                "errors": []
+            }
+            try:
+                byte_range = [int(value) for value in entries["ByteRange"].strip("[]").split()]
+                result["byte_range"] = byte_range
+                result.update(_verify_signature(f, byte_range, file_size, validator, vri_keys))
+            except Exception as e:
+                result["errors"].append(str(e))
+            signatures.append(result)
+
+    bulk = None
+    if has_manifest_proof:
+        try:
+            bulk = verify_document(path, validator=validator)
+        except Exception as e:
+            bulk = {"valid": False, "errors": [str(e)]}
+
+    signatures_valid = bool(signatures) and all(sig["integrity"] and sig["trusted"] for sig in signatures)
+    return {
+        "signatures": signatures,
+        "signature_count": len(signatures),
+        "manifest": bulk,
+        "valid": signatures_valid or (not signatures and bool(bulk) and bulk["valid"])
+    }
+
+
+def _vri_keys(doc: fitz.Document) -> set:
+    """Claves de /DSS/VRI del documento (firmas con información LTV)"""
+    catalog = doc.pdf_catalog()
+    kind, value = doc.xref_get_key(catalog, "DSS/VRI")
+    if kind == "xref":
+        value = doc.xref_object(int(value.split()[0]), compressed=True)
+    elif kind != "dict":
+        return set()
+    return set(re.findall(r"/([0-9A-Fa-f]{40})\b", value))
+
+
+def _verify_signature(f, byte_range: List[int], file_size: int, validator: ChainValidator,
+                      vri_keys: set = frozenset()) -> Dict[str, Any]:
+    """
+    Comprueba una firma a partir de su /ByteRange
+
+    Returns:
+        Dict[str, Any]: Campos de verify_pdf para esta firma
+    """
+    from asn1crypto import cms
+    from cryptography import x509
+    from cryptography.hazmat.primitives.serialization import Encoding
+
+    if len(byte_range) != 4 or byte_range[0] != 0 or byte_range[1] >= byte_range[2]:
+        raise SigningError(f"/ByteRange no válido: {byte_range}")
+    if byte_range[2] + byte_range[3] > file_size:
+        raise SigningError("El archivo es más corto que su /ByteRange")
+
+    # /Contents es el hueco entre los dos rangos: <hex>
+    f.seek(byte_range[1])
+    gap = f.read(byte_range[2] - byte_range[1])
+    if not (gap.startswith(b"<") and gap.endswith(b">")):
+        raise SigningError("/ByteRange no delimita el /Contents de la firma")
+    contents = bytes.fromhex(gap[1:-1].decode("ascii"))
+    content_info = cms.ContentInfo.load(contents, strict=False)
+    if content_info["content_type"].native != "signed_data":
+        raise SigningError("La firma no es una CMS SignedData")
+    signed_data = content_info["content"]
+    signer_info = signed_data["signer_infos"][0]
+
+    certificates = [
+        x509.load_der_x509_certificate(choice.chosen.dump())
+        for choice in signed_data["certificates"] or []
+        if choice.name == "certificate"
+    ]
+    signer_cert = _find_signer_certificate(signer_info["sid"], certificates)
+    hash_name = signer_info["digest_algorithm"]["algorithm"].native
+
+    errors = []
+    digest = _digest_byte_range(f, byte_range, hash_name)
+    message_digest = None
+    for attribute in signer_info["signed_attrs"]:
+        if attribute["type"].native == "message_digest":
+            message_digest = attribute["values"][0].native
+    if message_digest != digest:
+        errors.append("El hash del documento no coincide con el de la firma")
+    else:
+        try:
+            _check_signature(signer_cert, signer_info, hash_name)
+        except Exception as e:
+            errors.append(f"Firma criptográfica no válida: {e or type(e).__name__}")
+    integrity = not errors
+
+    chain = validator.validate(signer_cert, [cert for cert in certificates if cert != signer_cert])
+    if chain["error"]:
+        errors.append(chain["error"])
+
+    timestamped_at = None
+    for attribute in signer_info["unsigned_attrs"] or []:
+        if attribute["type"].native == "signature_time_stamp_token":
+            try:
+                timestamped_at = _check_timestamp(attribute["values"][0], signer_info["signature"].native)
+            except Exception as e:
+                errors.append(f"Sello de tiempo no válido: {e or type(e).__name__}")
+
+    return {
+        "signer": signer_cert.subject.rfc4514_string(),
+        "certificate_sha256": _fingerprint(signer_cert),
+        "digest_algorithm": hash_name,
+        # Las firmas anteriores a la última actualización no cubren todo el archivo
+        "covers_document": byte_range[2] + byte_range[3] == file_size,
+        "integrity": integrity,
+        "trusted": chain["trusted"],
+        "chain": chain["chain"],
+        "chain_cached": chain["cached"],
+        "timestamped_at": timestamped_at,
+        "ltv": vri_key(contents) in vri_keys,
+        "errors": errors
+    }
+
+
+def _check_timestamp(token, signature: bytes) -> str:
+    """
+    Comprueba un TimeStampToken sobre el valor de una firma
+
+    Returns:
+        str: genTime del sello en ISO 8601
+    """
+    from cryptography import x509
+
+    signed_data = token["content"]
+    tst_info = signed_data["encap_content_info"]["content"].parsed
+    imprint = tst_info["message_imprint"]
+    hash_name = imprint["hash_algorithm"]["algorithm"].native
+    if imprint["hashed_message"].native != hashlib.new(hash_name, signature).digest():
+        raise SigningError("no sella el valor de esta firma")
+
+    tsa_info = signed_data["signer_infos"][0]
+    tsa_hash = tsa_info["digest_algorithm"]["algorithm"].native
+    message_digest = None
+    for attribute in tsa_info["signed_attrs"]:
+        if attribute["type"].native == "message_digest":
+            message_digest = attribute["values"][0].native
+    tst_info_der = signed_data["encap_content_info"]["content"].contents
+    if message_digest != hashlib.new(tsa_hash, tst_info_der).digest():
+        raise SigningError("el TSTInfo no coincide con la firma de la TSA")
+    certificates = [
+        x509.load_der_x509_certificate(choice.chosen.dump())
+        for choice in signed_data["certificates"] or []
+        if choice.name == "certificate"
+    ]
+    _check_signature(_find_signer_certificate(tsa_info["sid"], certificates), tsa_info, tsa_hash)
+    return tst_info["gen_time"].native.isoformat()
+
+
+def _find_signer_certificate(sid, certificates: List[Any]):
+    """Certificado que identifica el SignerIdentifier de la firma"""
+    from cryptography import x509
+
+    for certificate in certificates:
+        if sid.name == "issuer_and_serial_number":
+            if (certificate.serial_number == sid.chosen["serial_number"].native
+                    and certificate.issuer.public_bytes() == sid.chosen["issuer"].dump()):
+                return certificate
+        else:
+            try:
+                key_id = certificate.extensions.get_extension_for_class(x509.SubjectKeyIdentifier).value.digest
+            except x509.ExtensionNotFound:
+                continue
+            if key_id == sid.chosen.native:
+                return certificate
+    raise SigningError("La firma no incluye el certificado del firmante")
+
+
+def _check_signature(certificate, signer_info, hash_name: str):
+    """Verifica la firma de los atributos firmados; lanza excepción si no es válida"""
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import ec, padding, rsa
+
+    # Se firmó la codificación del SET OF (0x31), no la etiqueta implícita [0]
+    signed_attrs = b"\x31" + signer_info["signed_attrs"].dump()[1:]
+    signature = signer_info["signature"].native
+    algorithm = signer_info["signature_algorithm"]
+    hash_algorithm = getattr(hashes, hash_name.upper())()
+    public_key = certificate.public_key()
+
+    signature_algo = algorithm.signature_algo
+    expected_key = ec.EllipticCurvePublicKey if signature_algo == "ecdsa" else rsa.RSAPublicKey
+    if not isinstance(public_key, expected_key):
+        raise SigningError("la clave del certificado no corresponde al algoritmo de firma")
+    if signature_algo == "ecdsa":
+        public_key.verify(signature, signed_attrs, ec.ECDSA(hash_algorithm))
+    elif signature_algo == "rsassa_pss":
+        params = algorithm["parameters"]
+        mgf_hash = getattr(hashes, params["mask_gen_algorithm"]["parameters"]["algorithm"].native.upper())()
+        public_key.verify(signature, signed_attrs, padding.PSS(
+            mgf=padding.MGF1(mgf_hash), salt_length=params["salt_length"].native
+        ), hash_algorithm)
+    elif signature_algo == "rsassa_pkcs1v15":
+        public_key.verify(signature, signed_attrs, padding.PKCS1v15(), hash_algorithm)
+    else:
+        raise SigningError(f"Algoritmo de firma no soportado: {signature_algo}")
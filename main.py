@@ -3,17 +3,19 @@ FastAPI Application para procesamiento de PDFs
 API que recibe JSON con instrucciones y devuelve PDFs modificados
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Dict, Any, Union, Optional
 import os
 import tempfile
 import shutil
+import time
 from datetime import datetime
 
-from processor import PDFProcessor, create_sample_assets
+from processor import PDFProcessor, DeadlineExceeded, MemoryLimitExceeded, create_sample_assets, spool_pdf, SPOOL_CHUNK_SIZE
+from storage import get_storage
 
 # Crear aplicación FastAPI
 app = FastAPI(
@@ -33,7 +35,7 @@ app.add_middleware(
 
 # Modelos Pydantic
 class Insertion(BaseModel):
-    type: str  # "text" o "image"
+    type: str  # "text", "image" o "qr"
     source: Optional[str] = None  # Para imágenes: URL o ruta del archivo
     content: Optional[str] = None  # Para texto: contenido a insertar
     position: List[int]  # [x, y] posición donde insertar
@@ -47,21 +49,99 @@ class Insertion(BaseModel):
     correct_orientation: Optional[bool] = True # Para controlar la corrección EXIF
     flip_type: Optional[str] = "horizontal"  # "horizontal", "vertical", "rotate_180", "transpose", "transverse"
     pages: Union[str, int, List[int]] = "all"
+    error_correction: Optional[str] = None  # QR: "L", "M" (por defecto), "Q" o "H"
+    quiet_zone: Optional[int] = None  # QR: módulos de margen (por defecto 4)
+    mode: Optional[str] = None  # "content" (por defecto, en el contenido de la página) o "annotation"
+    stamp_id: Optional[str] = None  # Modo annotation: nombre para sustituir o quitar el sello después
+
+class SignatureAppearance(BaseModel):
+    rect: List[float]  # [x0, y0, x1, y1] con origen arriba a la izquierda
+    page: Optional[int] = 0
+    image: Optional[str] = None  # Rúbrica (ruta local, http(s):// o s3://)
+    seal: Optional[str] = None  # Sello, a la derecha del bloque
+    name: Optional[str] = None  # Por defecto el CN del certificado
+    font_size: Optional[float] = None
+    show_reason: Optional[bool] = True
+    show_hash: Optional[bool] = True  # SHA-256 del documento antes de la firma
+
+class SignOptions(BaseModel):
+    field_name: Optional[str] = None  # Por defecto SignatureN
+    reason: Optional[str] = None
+    location: Optional[str] = None
+    contact_info: Optional[str] = None
+    timestamp: Optional[bool] = False  # Sello de tiempo RFC 3161 de PDF_TSA_URL (PAdES B-T)
+    ltv: Optional[bool] = False  # /DSS con OCSP/CRL de la cadena (PAdES B-LT)
+    appearance: Optional[SignatureAppearance] = None  # Firma visible; sin ella, invisible
 
 class PDFRequest(BaseModel):
     pdf_path: str
     output_path: str
     insertions: List[Insertion]
+    incremental: Optional[bool] = False  # Añadir cambios sin reescribir el PDF (preserva firmas previas)
+    save_profile: Optional[str] = None  # "fast", "compact" o "web"; None usa el del servidor
+    large_document: Optional[bool] = False  # Procesar con memoria acotada (documentos muy grandes)
+    parallel_workers: Optional[int] = 0  # Procesar por rangos de páginas en paralelo (0 = en serie)
+    time_budget_seconds: Optional[float] = None  # Plazo de procesamiento; None usa PDF_TIME_BUDGET_SECONDS
+    resume_from: Optional[int] = 0  # Páginas ya procesadas en pdf_path (checkpoint de un 504 anterior)
+    input_sha256: Optional[str] = None  # Al reanudar: huella del PDF original (del 504), para los QR con {sha256}
+    input_size: Optional[int] = None
+    sign: Optional[SignOptions] = None  # Firmar el resultado (PAdES) con PDF_SIGNING_KEY / PDF_SIGNING_CERT
+    remove_stamps: Optional[List[str]] = None  # stamp_id de sellos (anotaciones) a quitar antes; "*" = todos
+
+class SignBatchRequest(BaseModel):
+    pdf_paths: List[str]  # PDFs locales a firmar (no se modifican)
+    output_dir: str  # Directorio de las copias firmadas
+    sign: Optional[SignOptions] = None
+    workers: Optional[int] = None  # Procesos simultáneos; None según CPUs y memoria
+
+class SignManifestRequest(BaseModel):
+    pdf_paths: List[str]  # PDFs locales a firmar (no se modifican)
+    output_dir: str  # Directorio de las copias firmadas y de manifest.json
+    stamp: Optional[bool] = True  # Sello visible de verificación en la primera página
+
+class FingerprintRequest(BaseModel):
+    path: str  # Ruta local, URL http(s):// o URI s3://
 
 class ProcessResponse(BaseModel):
     success: bool
     message: str
     output_path: Optional[str] = None
     processed_at: str
+    input_sha256: Optional[str] = None
+    input_size: Optional[int] = None
+    output_sha256: Optional[str] = None
+    output_size: Optional[int] = None
 
 # Instancia del procesador
 processor = PDFProcessor()
 
+# Almacenamiento de los PDFs procesados (directorio output/ por defecto)
+storage = get_storage()
+
+# Prefijo de los PDFs procesados (processed_*.pdf y processed/...): lo único
+# que /download sirve sin URL firmada en backends sin verify_url
+DOWNLOAD_PREFIX = "processed"
+
+# Plazo por defecto de /process-pdf en segundos (0 = sin plazo)
+TIME_BUDGET_SECONDS = float(os.environ.get("PDF_TIME_BUDGET_SECONDS", 0))
+
+
+def storage_response(key: str, headers: Dict[str, str] = None) -> StreamingResponse:
+    """Respuesta que descarga un objeto del almacenamiento en streaming"""
+    return StreamingResponse(
+        storage.iter_chunks(key),
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="{os.path.basename(key)}"', **(headers or {})}
+    )
+
+
+def fingerprint_headers(fingerprints: Dict[str, Any]) -> Dict[str, str]:
+    """Cabeceras con el SHA-256 de la entrada y de la salida de process_pdf"""
+    return {
+        "X-Input-SHA256": fingerprints["input_sha256"],
+        "X-Output-SHA256": fingerprints["output_sha256"]
+    }
+
 @app.on_event("startup")
 async def startup_event():
     """Evento de inicio - crear assets de ejemplo"""
@@ -108,26 +188,60 @@ async def process_pdf(request: PDFRequest):
     Returns:
         ProcessResponse: Respuesta con el resultado del procesamiento
     """
+    # Si se agota el plazo, el PDF parcial queda junto a la salida y la
+    # respuesta indica cómo reanudarlo
+    budget = request.time_budget_seconds
+    if budget is None:
+        budget = TIME_BUDGET_SECONDS
+    checkpoint_path = f"{os.path.splitext(request.output_path)[0]}.checkpoint.pdf"
+    
     try:
         # Convertir el request a diccionario
         pdf_data = {
             "pdf_path": request.pdf_path,
             "output_path": request.output_path,
-            "insertions": [insertion.dict() for insertion in request.insertions]
+            "insertions": [insertion.dict() for insertion in request.insertions],
+            "incremental": request.incremental,
+            "save_profile": request.save_profile,
+            "large_document": request.large_document,
+            "parallel_workers": request.parallel_workers,
+            "deadline": time.monotonic() + budget if budget else None,
+            "resume_from": request.resume_from,
+            "checkpoint_path": checkpoint_path if budget else None,
+            "sign": request.sign.dict() if request.sign else None,
+            "remove_stamps": request.remove_stamps
         }
+        if request.resume_from and request.input_sha256:
+            # pdf_path es el checkpoint: la huella es la del PDF original
+            pdf_data.update(input_sha256=request.input_sha256, input_size=request.input_size)
         
         # Procesar el PDF
         output_path = processor.process_pdf(pdf_data)
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
         
         return ProcessResponse(
             success=True,
             message="PDF procesado exitosamente",
             output_path=output_path,
-            processed_at=datetime.now().isoformat()
+            processed_at=datetime.now().isoformat(),
+            **processor.fingerprints
         )
         
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except MemoryLimitExceeded as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except DeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail={
+            "message": (f"{e}. Reenvíe la petición con pdf_path=checkpoint_path, resume_from=pages_done "
+                        "e input_sha256/input_size para continuar."),
+            "pages_done": e.pages_done,
+            "total_pages": e.total_pages,
+            "checkpoint_path": e.checkpoint_path,
+            "input_sha256": e.input_sha256,
+            "input_size": e.input_size
+        })
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -136,7 +250,15 @@ async def process_pdf(request: PDFRequest):
 @app.post("/upload-pdf")
 async def upload_and_process_pdf(
     file: UploadFile = File(...),
-    insertions: str = None  # JSON string de las inserciones
+    insertions: str = None,  # JSON string de las inserciones
+    incremental: bool = False,
+    save_profile: str = None,
+    large_document: bool = False,
+    parallel_workers: int = 0,
+    sign: bool = False,
+    sign_reason: str = None,
+    sign_location: str = None,
+    sign_ltv: bool = False
 ):
     """
     Subir un PDF y procesarlo con instrucciones
@@ -144,9 +266,19 @@ async def upload_and_process_pdf(
     Args:
         file: Archivo PDF subido
         insertions: JSON string con las instrucciones de inserción
+        incremental: Guardar como actualización incremental del PDF subido
+        save_profile: Perfil de guardado ("fast", "compact" o "web")
+        large_document: Procesar con memoria acotada
+        parallel_workers: Procesar por rangos de páginas en paralelo (0 = en serie)
+        sign: Firmar el resultado con el firmante configurado
+        sign_reason: Motivo de la firma
+        sign_location: Lugar de la firma
+        sign_ltv: Sellar la firma con la TSA y añadir el /DSS (PAdES B-LT)
         
     Returns:
-        FileResponse: PDF procesado para descarga
+        StreamingResponse: PDF procesado para descarga, con el SHA-256 de
+        la entrada y de la salida en X-Input-SHA256 y X-Output-SHA256 y la
+        URL firmada para volver a descargarlo en X-Download-URL
     """
     try:
         import json
@@ -157,16 +289,8 @@ async def upload_and_process_pdf(
         
         # Crear nombres de archivo temporales
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        input_filename = f"uploaded_{timestamp}.pdf"
         output_filename = f"processed_{timestamp}.pdf"
         
-        input_path = os.path.join("input", input_filename)
-        output_path = os.path.join("output", output_filename)
-        
-        # Guardar archivo subido
-        with open(input_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
         # Parsear instrucciones
         if insertions:
             try:
@@ -176,47 +300,243 @@ async def upload_and_process_pdf(
         else:
             insertions_data = []
         
+        # Mantener el archivo subido en memoria (solo se vuelca a disco si es muy grande)
+        pdf_source = spool_pdf(iter(lambda: file.file.read(SPOOL_CHUNK_SIZE), b""))
+        
         # Preparar datos para procesamiento
         pdf_data = {
-            "pdf_path": input_path,
-            "output_path": output_path,
-            "insertions": insertions_data
+            **pdf_source,
+            "insertions": insertions_data,
+            "incremental": incremental,
+            "save_profile": save_profile,
+            "large_document": large_document,
+            "parallel_workers": parallel_workers,
+            "sign": {"reason": sign_reason, "location": sign_location,
+                     "timestamp": sign_ltv, "ltv": sign_ltv} if sign else None
         }
         
-        # Procesar PDF
-        processor.process_pdf(pdf_data)
+        # Procesar PDF escribiendo el resultado directamente en el almacenamiento
+        try:
+            with storage.open_write(output_filename) as writer:
+                processor.process_pdf({**pdf_data, "output_stream": writer})
+        finally:
+            spilled_path = pdf_source.get("pdf_path")
+            if spilled_path and os.path.exists(spilled_path):
+                os.remove(spilled_path)
         
         # Devolver archivo procesado
-        return FileResponse(
-            path=output_path,
-            filename=output_filename,
-            media_type="application/pdf"
-        )
+        return storage_response(output_filename, {
+            **fingerprint_headers(processor.fingerprints),
+            "X-Download-URL": storage.url(output_filename, expires_in=3600)
+        })
         
+    except MemoryLimitExceeded as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error procesando archivo: {str(e)}")
 
-@app.get("/download/{filename}")
-async def download_file(filename: str):
+def _copy_for_signing(pdf_paths: List[str], output_dir: str) -> List[str]:
+    """Copia cada PDF en output_dir como {nombre}_signed.pdf (404 si falta alguno)"""
+    missing = [path for path in pdf_paths if not os.path.exists(path)]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Archivos no encontrados: {', '.join(missing)}")
+    
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        output_paths = []
+        for index, path in enumerate(pdf_paths):
+            name = os.path.splitext(os.path.basename(path))[0]
+            output_path = os.path.join(output_dir, f"{name}_signed.pdf")
+            if output_path in output_paths:
+                output_path = os.path.join(output_dir, f"{name}_{index}_signed.pdf")
+            shutil.copyfile(path, output_path)
+            output_paths.append(output_path)
+        return output_paths
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
+
+@app.post("/sign-batch")
+async def sign_batch(request: SignBatchRequest):
     """
-    Descargar un archivo del directorio output
+    Firmar muchos PDFs con el firmante configurado
+    
+    Cada PDF se copia en output_dir como {nombre}_signed.pdf y se firma la
+    copia. La clave y las partes fijas de la firma se preparan una sola vez
+    y los documentos se reparten entre procesos
     
     Args:
-        filename: Nombre del archivo a descargar
+        request: Objeto SignBatchRequest con los PDFs y las opciones de firma
+        
+    Returns:
+        dict: Resultado por documento, firmas por segundo y firmas por
+        segundo de CPU (por núcleo)
+    """
+    from signing import get_signer
+    
+    output_paths = _copy_for_signing(request.pdf_paths, request.output_dir)
+    try:
+        options = request.sign.dict() if request.sign else {}
+        summary = get_signer().sign_files(output_paths, workers=request.workers, **options)
+        return {"success": summary["failed"] == 0, **summary}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
+
+@app.post("/sign-manifest")
+async def sign_manifest_batch(request: SignManifestRequest):
+    """
+    Firmar muchos PDFs con una sola firma sobre un manifiesto de Merkle
+    
+    Cada PDF se copia en output_dir como {nombre}_signed.pdf y recibe su
+    prueba de inclusión adjunta; el manifiesto completo se guarda en
+    output_dir/manifest.json. Cada copia se verifica por sí sola con /verify
+    
+    Args:
+        request: Objeto SignManifestRequest con los PDFs
         
     Returns:
-        FileResponse: Archivo para descarga
+        dict: manifest_id, raíz, resultado por documento y documentos por segundo
     """
-    file_path = os.path.join("output", filename)
+    from manifest import sign_manifest
     
-    if not os.path.exists(file_path):
+    output_paths = _copy_for_signing(request.pdf_paths, request.output_dir)
+    try:
+        summary = sign_manifest(output_paths, manifest_path=os.path.join(request.output_dir, "manifest.json"),
+                                stamp=request.stamp)
+        return {"success": summary["failed"] == 0, **summary}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
+
+@app.post("/verify")
+async def verify_signatures(file: UploadFile = File(None), key: str = None):
+    """
+    Verifica las firmas de un PDF subido o de un PDF del almacenamiento
+    
+    Args:
+        file: PDF a verificar
+        key: Clave de un PDF ya guardado (alternativa a file)
+        
+    Returns:
+        dict: Por cada campo de firma, integridad (hash del /ByteRange y
+        firma CMS), confianza de la cadena de certificados y errores
+    """
+    from verification import verify_pdf
+    
+    if (file is None) == (key is None):
+        raise HTTPException(status_code=400, detail="Indique file o key")
+    if key is not None and not storage.exists(key):
         raise HTTPException(status_code=404, detail="Archivo no encontrado")
     
-    return FileResponse(
-        path=file_path,
-        filename=filename,
-        media_type="application/pdf"
-    )
+    # La verificación lee el archivo por rangos: copiarlo a un temporal
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as f:
+        if file is not None:
+            for chunk in iter(lambda: file.file.read(SPOOL_CHUNK_SIZE), b""):
+                f.write(chunk)
+        else:
+            for chunk in storage.iter_chunks(key):
+                f.write(chunk)
+        f.flush()
+        try:
+            return verify_pdf(f.name)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"No se pudo verificar el PDF: {str(e)}")
+
+@app.post("/fingerprint")
+async def fingerprint(request: FingerprintRequest):
+    """
+    SHA-256 de un archivo local (mapeado en memoria) o remoto (en
+    streaming), sin cargarlo entero en memoria
+    
+    Args:
+        request: Ruta local, URL http(s):// o URI s3://
+        
+    Returns:
+        dict: source, sha256 y size
+    """
+    try:
+        return {"success": True, **processor.fingerprint(request.path)}
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error calculando la huella: {str(e)}")
+
+@app.get("/download/{filename:path}")
+async def download_file(filename: str, expires: int = None, signature: str = None):
+    """
+    Descargar un archivo del almacenamiento de salida
+    
+    Args:
+        filename: Nombre del archivo a descargar
+        expires: Caducidad de la URL firmada
+        signature: Firma de la URL generada por storage.url() (obligatoria
+            en el backend local; la devuelve /upload-pdf en X-Download-URL)
+        
+    Returns:
+        StreamingResponse: Archivo para descarga
+    """
+    if hasattr(storage, "verify_url"):
+        # Las subidas (uploads/) y los trabajos (jobs/) comparten raíz con las
+        # salidas: sin firma no se sirve nada
+        if expires is None or signature is None or not storage.verify_url(filename, expires, signature):
+            raise HTTPException(status_code=403, detail="URL de descarga inválida o caducada")
+    elif not filename.startswith(DOWNLOAD_PREFIX):
+        raise HTTPException(status_code=403, detail="Solo se pueden descargar PDFs procesados")
+    
+    try:
+        if not storage.exists(filename):
+            raise HTTPException(status_code=404, detail="Archivo no encontrado")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Nombre de archivo no válido")
+    
+    return storage_response(filename)
+
+@app.post("/upload")
+async def upload_presigned(
+    key: str = Form(...),
+    expires: int = Form(...),
+    signature: str = Form(...),
+    max_bytes: Optional[int] = Form(None),
+    file: UploadFile = File(...)
+):
+    """
+    Recibe una subida directa con un formulario de storage.presigned_post(),
+    el equivalente local al POST prefirmado de S3. Solo admite las claves
+    de subida de trabajos (uploads/{job_id}.pdf)
+    
+    Args:
+        key: Clave del objeto a escribir
+        expires: Caducidad del formulario
+        signature: Firma del formulario
+        max_bytes: Tamaño máximo firmado en el formulario
+        file: Archivo a guardar
+        
+    Returns:
+        dict: Clave, tamaño y SHA-256 del objeto guardado
+    """
+    from jobs import MAX_UPLOAD_BYTES, job_id_from_upload_key
+    
+    if not hasattr(storage, "verify_url"):
+        raise HTTPException(status_code=404, detail="Subida directa no disponible")
+    try:
+        job_id_from_upload_key(key)
+        storage.path(key)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Clave no válida")
+    if not storage.verify_url(key, expires, signature, action="put", max_bytes=max_bytes):
+        raise HTTPException(status_code=403, detail="Formulario de subida inválido o caducado")
+    
+    # El límite se comprueba mientras llega el cuerpo, no solo en la firma
+    limit = min(max_bytes, MAX_UPLOAD_BYTES) if max_bytes is not None else MAX_UPLOAD_BYTES
+    with storage.open_write(key, content_type=file.content_type or "application/octet-stream") as writer:
+        while True:
+            chunk = await file.read(SPOOL_CHUNK_SIZE)
+            if not chunk:
+                break
+            if writer.size + len(chunk) > limit:
+                # Salir del with con la excepción descarta el objeto parcial
+                raise HTTPException(status_code=413, detail=f"El archivo supera el máximo de {limit} bytes")
+            writer.write(chunk)
+    
+    return {"key": key, "size": writer.size, "sha256": writer.sha256}
 
 @app.get("/list-files")
 async def list_files():
@@ -228,19 +548,24 @@ async def list_files():
     
     return {
         "input": list_dir_contents("input"),
-        "output": list_dir_contents("output"),
+        "output": storage.list(),
         "assets": list_dir_contents("assets")
     }
 
+# Adaptador de Mangum, creado en la primera invocación y reutilizado
+_mangum_handler = None
+
 # Función para preparar para AWS Lambda
 def lambda_handler(event, context):
     """
     Handler para AWS Lambda usando Mangum
     Esta función se usará cuando se migre a Lambda
     """
-    from mangum import Mangum
-    handler = Mangum(app)
-    return handler(event, context)
+    global _mangum_handler
+    if _mangum_handler is None:
+        from mangum import Mangum
+        _mangum_handler = Mangum(app)
+    return _mangum_handler(event, context)
 
 if __name__ == "__main__":
     import uvicorn